@@ -0,0 +1,17 @@
+import os
+
+# batch jobs always run headless, never open a plot window
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from batch.methods import discover, resolve  # noqa: E402
+from batch.problems import load_problems  # noqa: E402
+from batch.runner import run_batch, run_problem, to_columns  # noqa: E402
+
+__all__ = [
+    "discover",
+    "resolve",
+    "load_problems",
+    "run_batch",
+    "run_problem",
+    "to_columns",
+]
@@ -0,0 +1,77 @@
+"""
+Runs problem sets headless across a process pool
+
+    python -m batch problems.json                  JSON lines to stdout
+    python -m batch a.json b.csv -o results.jsonl  several problem sets
+    python -m batch big.csv -j 8 -o results.json   column-oriented JSON
+    python -m batch points.csv -m root_finding.bisection
+    python -m batch big.csv --cache ~/.cache/cm    reuse factors across runs
+    python -m batch --list                         runnable methods
+
+The exit status is 1 when any problem failed and --fail-on-error is
+given.
+"""
+
+import argparse
+import os
+import sys
+
+from batch.methods import discover
+from batch.problems import load_problems
+from batch.runner import run_batch, write_columns, write_jsonl
+from utils.cache import ENV_DIRECTORY, configure
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch")
+    parser.add_argument("files", nargs="*", help="problem sets, .json/.jsonl/.csv")
+    parser.add_argument("-m", "--method", help="method for problems naming none")
+    parser.add_argument("-o", "--output", help=".jsonl (default) or .json (columns)")
+    parser.add_argument("-j", "--workers", type=int, help="processes, default all CPUs")
+    parser.add_argument("--chunk-size", type=int, help="problems per pool task")
+    parser.add_argument("--memory", action="store_true", help="record peak memory")
+    parser.add_argument("--cache", help="directory of the on-disk factor cache")
+    parser.add_argument("--fail-on-error", action="store_true")
+    parser.add_argument("--list", action="store_true", help="list methods and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(discover()))
+        return 0
+    if not args.files:
+        parser.error("no problem files given")
+
+    if args.cache:
+        # through the environment so every pool process shares the cache
+        os.environ[ENV_DIRECTORY] = args.cache
+        configure(args.cache)
+
+    problems = []
+    for path in args.files:
+        problems += load_problems(path, args.method)
+
+    failed = 0
+
+    def tally(records):
+        nonlocal failed
+        for record in records:
+            if record["status"] != "ok":
+                failed += 1
+                print(f"{record['id']}: {record['error']}", file=sys.stderr)
+            yield record
+
+    records = tally(run_batch(problems, args.workers, args.memory, args.chunk_size))
+    if args.output and args.output.endswith(".json"):
+        write_columns(records, args.output)
+    elif args.output:
+        with open(args.output, "w") as f:
+            write_jsonl(records, f)
+    else:
+        write_jsonl(records, sys.stdout)
+
+    print(f"{len(problems)} problems, {failed} failed", file=sys.stderr)
+    return 1 if failed and args.fail_on_error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import importlib
+import inspect
+from functools import lru_cache
+
+# packages whose functions can be named in a problem set
+PACKAGES = [
+    "root_finding",
+    "differentiation",
+    "integration",
+    "differential_eqns",
+    "interpolation",
+    "fourier",
+    "linear_algebra",
+]
+
+# functions that only draw or print, they have nothing to return
+HIDDEN_PREFIXES = ("plot_", "compute_and_plot", "tabulate_", "write_")
+
+
+def _public(name, value):
+    return inspect.isfunction(value) and not name.startswith(HIDDEN_PREFIXES)
+
+
+def discover():
+    """
+    Every runnable method as "package.function", e.g. "fourier.rfft"
+
+    Package-level exports are listed, plus the submodules named after
+    their main function (root_finding.bisection, fourier.batched_fft).
+    """
+    methods = []
+    for package_name in PACKAGES:
+        package = importlib.import_module(package_name)
+        names = list(getattr(package, "EXPORTS", {}))
+        names += [
+            name
+            for name in package.SUBMODULES
+            if hasattr(importlib.import_module(f"{package_name}.{name}"), name)
+        ]
+
+        for name in sorted(set(names)):
+            if _public(name, resolve(f"{package_name}.{name}")):
+                methods.append(f"{package_name}.{name}")
+
+    return methods
+
+
+@lru_cache(maxsize=None)
+def resolve(method):
+    """
+    The function behind a method name, "package.function" or the full
+    "package.module.function"
+    """
+    package_name, _, rest = method.partition(".")
+    if package_name not in PACKAGES or not rest:
+        raise ValueError(f"Unknown method {method!r}")
+
+    target = importlib.import_module(package_name)
+    for part in rest.split("."):
+        if not hasattr(target, part):
+            raise ValueError(f"Unknown method {method!r}")
+        target = getattr(target, part)
+
+    # root_finding.bisection is the submodule, the function shares its name
+    if inspect.ismodule(target):
+        target = getattr(target, rest.split(".")[-1], None)
+
+    if not callable(target):
+        raise ValueError(f"{method!r} is not a function")
+    return target
@@ -0,0 +1,88 @@
+import csv
+import json
+import os
+
+# keys of a problem record that aren't arguments of the method
+RESERVED = ("id", "method", "args")
+
+
+def _cell(text):
+    # numbers, lists, true/false/null are JSON, anything else (formulas) a string
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _read(path):
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        with open(path, newline="") as f:
+            return [
+                {key: _cell(value) for key, value in row.items() if value != ""}
+                for row in csv.DictReader(f)
+            ], {}
+
+    if extension == ".jsonl":
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()], {}
+
+    if extension == ".json":
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return data, {}
+        defaults = {key: value for key, value in data.items() if key != "problems"}
+        return data["problems"], defaults
+
+    raise ValueError(f"Unsupported problem file {path!r}, use .json, .jsonl or .csv")
+
+
+def load_problems(path, method=None):
+    """
+    Reads a problem set
+
+    Every problem names a method and its arguments, keyword arguments
+    are the remaining keys (or CSV columns), e.g.
+
+        {"method": "root_finding.bisection",
+         "f": "x^3 - 2*x - 5", "a": 2, "b": 3, "epsilon": 1e-6}
+
+        method,f,a,b,epsilon
+        root_finding.bisection,x^3 - 2*x - 5,2,3,1e-6
+
+    Formats:
+    - .json: a list of problems, or {"problems": [...], ...} where the
+      other keys are defaults shared by every problem
+    - .jsonl: one problem per line
+    - .csv: one problem per row, cells are parsed as JSON when they can
+      be and empty cells are left out
+
+    Parameters:
+    - path: problem file
+    - method: default method for problems that don't name one
+
+    Returns:
+    - list of {"id", "method", "args", "kwargs"}
+    """
+    rows, defaults = _read(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    problems = []
+    for index, row in enumerate(rows):
+        row = {**defaults, **row}
+        name = row.get("method", method)
+        if name is None:
+            raise ValueError(f"Problem {index} of {path!r} names no method")
+
+        problems.append(
+            {
+                "id": str(row.get("id", f"{stem}:{index}")),
+                "method": name,
+                "args": list(row.get("args", [])),
+                "kwargs": {k: v for k, v in row.items() if k not in RESERVED},
+            }
+        )
+
+    return problems
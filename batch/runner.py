@@ -0,0 +1,156 @@
+import contextlib
+import inspect
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch.methods import resolve
+from utils.instrumentation import instrument
+
+
+def to_jsonable(value):
+    """
+    Converts a method's result to plain JSON types: arrays become
+    (nested) lists, complex numbers {"real": ..., "imag": ...} and
+    result objects (factorizations, sparse matrices) a dict of their
+    public attributes
+    """
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, (complex, np.complexfloating)):
+        return {"real": float(value.real), "imag": float(value.imag)}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        if np.iscomplexobj(value):
+            return {"real": value.real.tolist(), "imag": value.imag.tolist()}
+        return value.tolist()
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) or inspect.isgenerator(value):
+        return [to_jsonable(item) for item in value]
+    if hasattr(value, "__dict__"):
+        return {
+            key: to_jsonable(item)
+            for key, item in vars(value).items()
+            if not key.startswith("_")
+        }
+    return repr(value)
+
+
+def run_problem(problem, memory=False):
+    """
+    Runs one problem and returns its result record, errors are recorded
+    rather than raised so one bad problem doesn't stop a batch
+
+    Record:
+    - id, method: from the problem
+    - status: "ok" or "error"
+    - result: JSON-converted return value (None on error)
+    - error: "ExceptionType: message" (None when ok)
+    - wall_time: seconds spent in the call
+    - counters: evaluations, iterations, ... reported by the method
+    - peak_bytes: peak allocation, only with memory=True
+    """
+    record = {"id": problem["id"], "method": problem["method"]}
+    result, error = None, None
+
+    # methods that print tables are silenced, only the record is output
+    with instrument(memory=memory) as session, contextlib.redirect_stdout(
+        io.StringIO()
+    ):
+        started = time.perf_counter()
+        try:
+            function = resolve(problem["method"])
+            result = to_jsonable(function(*problem["args"], **problem["kwargs"]))
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        wall_time = time.perf_counter() - started
+
+    top = [r for r in session.records if r["depth"] == 0]
+    record["status"] = "ok" if error is None else "error"
+    record["result"] = result
+    record["error"] = error
+    record["wall_time"] = wall_time
+    record["counters"] = top[0]["counters"] if top else {}
+    if memory:
+        record["peak_bytes"] = top[0]["peak_bytes"] if top else None
+
+    return record
+
+
+def _run_chunk(problems, memory):
+    return [run_problem(problem, memory) for problem in problems]
+
+
+def run_batch(problems, workers=None, memory=False, chunk_size=None):
+    """
+    Runs problems across a process pool, yielding result records in the
+    order of the problems as they complete
+
+    Problems are sent to the workers in chunks so thousands of small
+    problems don't each pay a round trip between processes.
+
+    Parameters:
+    - problems: list from load_problems
+    - workers: number of processes, defaults to the CPU count, 1 runs
+      everything in this process
+    - memory: also record peak allocation (slower)
+    - chunk_size: problems per task, defaults to about four tasks per worker
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Number of workers must be positive")
+
+    if workers == 1 or len(problems) <= 1:
+        for problem in problems:
+            yield run_problem(problem, memory)
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(problems) // (4 * workers)))
+    chunks = [
+        problems[i : i + chunk_size] for i in range(0, len(problems), chunk_size)
+    ]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        for records in pool.map(_run_chunk, chunks, [memory] * len(chunks)):
+            yield from records
+
+
+def write_jsonl(records, f):
+    """
+    Writes records to an open file as they arrive, one JSON object per
+    line, and returns how many were written
+    """
+    written = 0
+    for record in records:
+        f.write(json.dumps(record) + "\n")
+        written += 1
+    return written
+
+
+def to_columns(records):
+    """
+    Column-oriented layout {column: [value per record]}, counters are
+    flattened into "counters.<name>" columns (None where a method didn't
+    report that counter)
+    """
+    records = list(records)
+    counters = sorted({name for r in records for name in r["counters"]})
+    names = [key for key in records[0] if key != "counters"] if records else []
+
+    columns = {name: [r.get(name) for r in records] for name in names}
+    for name in counters:
+        columns[f"counters.{name}"] = [r["counters"].get(name) for r in records]
+    return columns
+
+
+def write_columns(records, path):
+    with open(path, "w") as f:
+        json.dump(to_columns(records), f)
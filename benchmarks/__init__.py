@@ -0,0 +1,8 @@
+import os
+
+# benchmarks always run headless, never open a plot window
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from benchmarks.runner import BENCHMARKS, benchmark, compare, run_benchmarks  # noqa: E402
+
+__all__ = ["BENCHMARKS", "benchmark", "compare", "run_benchmarks"]
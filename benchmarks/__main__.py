@@ -0,0 +1,73 @@
+"""
+Runs the benchmark suite
+
+    python -m benchmarks                          full run, JSON to stdout
+    python -m benchmarks --quick -o results.json  small sizes only
+    python -m benchmarks -k fourier               only matching benchmarks
+    python -m benchmarks -b baseline.json         compare with a saved run
+
+The exit status is 1 when --fail-on-regression is given and any point
+is slower than the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks import suite  # noqa: F401, registers the cases
+from benchmarks.runner import BENCHMARKS, compare, load, run_benchmarks, save
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", "--filter", help="only run benchmarks containing this")
+    parser.add_argument("-q", "--quick", action="store_true", help="small sizes only")
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("-b", "--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            key = f"{bench['group']}.{bench['name']}"
+            print(f"{key:<40} {bench['unit']:<9} {bench['sizes']}")
+        return 0
+
+    # progress goes to stderr so stdout stays valid JSON
+    report = run_benchmarks(
+        args.filter,
+        args.quick,
+        args.min_time,
+        args.repeat,
+        report=lambda line: print(line, file=sys.stderr),
+    )
+
+    regressions = []
+    if args.baseline:
+        changes = compare(report, load(args.baseline), args.threshold)
+        report["comparison"] = {"baseline": args.baseline, "changes": changes}
+        regressions = [c for c in changes if c["status"] == "regression"]
+
+        for change in changes:
+            if change["status"] != "unchanged":
+                print(
+                    f"{change['status']:<12} {change['benchmark']:<40}"
+                    f" n = {change['size']:<9} x{change['ratio']}",
+                    file=sys.stderr,
+                )
+
+    if args.output:
+        save(report, args.output)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
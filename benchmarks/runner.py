@@ -0,0 +1,216 @@
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+# every registered benchmark, in registration order
+BENCHMARKS = []
+
+
+def benchmark(group, unit, sizes, quick_sizes=None):
+    """
+    Registers a benchmark case
+
+    The decorated function takes a problem size and does all of its
+    setup, then returns (run, work): a zero-argument callable that is
+    timed, and how many units of work (solves, points, steps, ...) one
+    call of it performs. Throughput is reported as work per second.
+
+    Parameters:
+    - group: method family, e.g. "fourier"
+    - unit: what the work counts, e.g. "points"
+    - sizes: problem sizes of the full run
+    - quick_sizes: smaller sizes for --quick, defaults to the first two
+    """
+
+    def register(case):
+        BENCHMARKS.append(
+            {
+                "name": case.__name__,
+                "group": group,
+                "unit": unit,
+                "sizes": list(sizes),
+                "quick_sizes": list(quick_sizes or sizes[:2]),
+                "case": case,
+            }
+        )
+        return case
+
+    return register
+
+
+def time_call(run, min_time=0.1, repeat=3):
+    """
+    Best time of one call, in seconds
+
+    Calls are looped until a measurement lasts at least min_time so
+    fast functions aren't dominated by timer resolution, and the best of
+    repeat measurements is kept since noise only ever adds time.
+    """
+    run()  # warm-up, fills caches (twiddle factors, compiled formulas, ...)
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    return best, loops
+
+
+def peak_memory(run):
+    """
+    Peak bytes allocated during one call, NumPy buffers included
+    """
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def scaling_exponent(sizes, seconds):
+    """
+    Slope p of the log-log fit time ~ size^p, e.g. ~1 for linear
+    methods, ~3 for dense factorizations
+    """
+    if len(sizes) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return round(float(slope), 3)
+
+
+def run_benchmarks(pattern=None, quick=False, min_time=0.1, repeat=3, report=print):
+    """
+    Runs every registered benchmark whose "group.name" contains pattern
+
+    Returns:
+    - a JSON-serializable dict with the environment and one record per
+      benchmark holding time, throughput and peak memory per size
+    """
+    results = []
+    for bench in BENCHMARKS:
+        key = f"{bench['group']}.{bench['name']}"
+        if pattern and pattern not in key:
+            continue
+
+        points = []
+        for size in bench["quick_sizes"] if quick else bench["sizes"]:
+            run, work = bench["case"](size)
+            seconds, loops = time_call(run, min_time, repeat)
+            points.append(
+                {
+                    "size": size,
+                    "seconds": seconds,
+                    "throughput": work / seconds if seconds > 0 else None,
+                    "peak_bytes": peak_memory(run),
+                    "loops": loops,
+                }
+            )
+            if report:
+                report(
+                    f"{key:<40} n = {size:<9} {seconds * 1e3:>10.3f} ms"
+                    f" {points[-1]['throughput']:>14.4g} {bench['unit']}/s"
+                    f" {points[-1]['peak_bytes'] / 1024:>10.1f} KiB"
+                )
+
+        sizes = [point["size"] for point in points]
+        seconds = [point["seconds"] for point in points]
+        results.append(
+            {
+                "name": bench["name"],
+                "group": bench["group"],
+                "unit": bench["unit"],
+                "points": points,
+                "scaling_exponent": scaling_exponent(sizes, seconds),
+            }
+        )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=1.25):
+    """
+    Compares two benchmark reports size by size
+
+    A point is a regression when it got slower by more than threshold
+    (as a ratio of times) and an improvement when it got faster by more
+    than threshold. Points missing from the baseline are skipped.
+
+    Returns:
+    - list of {"benchmark", "size", "baseline", "current", "ratio", "status"}
+    """
+    previous = {
+        (f"{r['group']}.{r['name']}", p["size"]): p["seconds"]
+        for r in baseline["results"]
+        for p in r["points"]
+    }
+
+    changes = []
+    for result in current["results"]:
+        key = f"{result['group']}.{result['name']}"
+        for point in result["points"]:
+            before = previous.get((key, point["size"]))
+            if before is None:
+                continue
+
+            ratio = point["seconds"] / before
+            if ratio > threshold:
+                status = "regression"
+            elif ratio < 1 / threshold:
+                status = "improvement"
+            else:
+                status = "unchanged"
+
+            changes.append(
+                {
+                    "benchmark": key,
+                    "size": point["size"],
+                    "baseline": before,
+                    "current": point["seconds"],
+                    "ratio": round(ratio, 4),
+                    "status": status,
+                }
+            )
+
+    return changes
+
+
+def save(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
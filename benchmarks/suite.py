@@ -0,0 +1,393 @@
+"""
+Benchmark cases, one per method and grouped like the packages
+
+Each case builds its inputs for a problem size n outside the timed
+region and returns (run, work), see benchmarks.runner.benchmark.
+"""
+
+import numpy as np
+
+from benchmarks.runner import benchmark
+from utils import compile_expression
+
+RNG_SEED = 225
+
+
+def _cubics(n):
+    # x^3 - 2x - c has exactly one root in [1, 4] for every c in [1, 10]
+    return [(lambda x, c=c: x**3 - 2 * x - c) for c in np.linspace(1, 10, n)]
+
+
+# ---------------------------------------------------------------------------
+# I. Root finding
+# ---------------------------------------------------------------------------
+
+
+@benchmark("root_finding", "solves", sizes=[10, 100, 1000])
+def bisection(n):
+    from root_finding.bisection import bisection
+
+    functions = _cubics(n)
+
+    def run():
+        for f in functions:
+            bisection(f, 1.0, 4.0, 1e-10)
+
+    return run, n
+
+
+@benchmark("root_finding", "roots", sizes=[10, 100, 1000])
+def find_roots(n):
+    from root_finding.root_scanner import find_roots
+
+    # sin(x) has a root every pi, n of them in [0.5, n * pi]
+    f = compile_expression("sin(x)")
+
+    def run():
+        find_roots(f, 0.5, n * np.pi, samples=10 * n)
+
+    return run, n
+
+
+@benchmark("root_finding", "solves", sizes=[10, 100, 1000])
+def newton_raphson(n):
+    from root_finding.newton_raphson import newton_raphson
+
+    functions = _cubics(n)
+    fx_prime = compile_expression("3*x^2 - 2")
+
+    def run():
+        for f in functions:
+            newton_raphson(f, fx_prime, 2.0, 1e-10)
+
+    return run, n
+
+
+@benchmark("root_finding", "solves", sizes=[10, 100, 1000])
+def newton_raphson_automatic(n):
+    from root_finding.newton_raphson import newton_raphson
+
+    functions = _cubics(n)
+
+    def run():
+        for f in functions:
+            newton_raphson(f, None, 2.0, 1e-10)
+
+    return run, n
+
+
+@benchmark("root_finding", "solves", sizes=[10, 100, 1000])
+def secant_method(n):
+    from root_finding.secant_method import secant_method
+
+    functions = _cubics(n)
+
+    def run():
+        for f in functions:
+            secant_method(2.0, 3.0, f, 1e-10)
+
+    return run, n
+
+
+# ---------------------------------------------------------------------------
+# II. Differentiation
+# ---------------------------------------------------------------------------
+
+
+@benchmark("differentiation", "points", sizes=[1000, 100_000, 1_000_000])
+def center_difference(n):
+    from differentiation.center_difference import center_difference
+
+    f = compile_expression("sin(x) * e^(-x/2)")
+    x = np.linspace(0, 10, n)
+    return (lambda: center_difference(x, f, 1e-4)), n
+
+
+@benchmark("differentiation", "points", sizes=[1000, 100_000, 1_000_000])
+def automatic_difference(n):
+    from differentiation.automatic_differentiation import automatic_difference
+
+    f = compile_expression("sin(x) * e^(-x/2)")
+    x = np.linspace(0, 10, n)
+    return (lambda: automatic_difference(x, f)), n
+
+
+# ---------------------------------------------------------------------------
+# III. Integration
+# ---------------------------------------------------------------------------
+
+
+@benchmark("integration", "points", sizes=[1000, 100_000, 1_000_000])
+def trapezoidal_rule_compiled(n):
+    from integration.trapezoid_rule import trapezoidal_rule
+
+    f = compile_expression("x^3 - 2*x + sin(x)")
+    return (lambda: trapezoidal_rule(f, 0.0, 3.0, n)), n + 1
+
+
+@benchmark("integration", "points", sizes=[1000, 10_000, 100_000])
+def trapezoidal_rule_callable(n):
+    import math
+
+    from integration.trapezoid_rule import trapezoidal_rule
+
+    def f(x):
+        return x**3 - 2 * x + math.sin(x)
+
+    return (lambda: trapezoidal_rule(f, 0.0, 3.0, n)), n + 1
+
+
+@benchmark("integration", "integrals", sizes=[10, 1000, 100_000])
+def gauss_legendre_batched(n):
+    # n integrals of the same integrand over different intervals, one call
+    from integration.gaussian_quadrature import gauss_legendre
+
+    f = compile_expression("x^3 - 2*x + sin(x)")
+    b = np.linspace(0.5, 3.0, n)
+    return (lambda: gauss_legendre(f, 0.0, b, 10)), n
+
+
+@benchmark("integration", "points", sizes=[17, 129, 1025])
+def clenshaw_curtis(n):
+    from integration.gaussian_quadrature import clenshaw_curtis
+
+    f = compile_expression("x^3 - 2*x + sin(x)")
+    return (lambda: clenshaw_curtis(f, 0.0, 3.0, n - 1)), n
+
+
+# ---------------------------------------------------------------------------
+# IV. Differential equations
+# ---------------------------------------------------------------------------
+
+
+def _steps(step, n, f):
+    h = 1.0 / n
+
+    def run():
+        x, y = 0.0, 1.0
+        for _ in range(n):
+            y = step(x, y, h, f)
+            x += h
+
+    return run, n
+
+
+@benchmark("differential_eqns", "steps", sizes=[100, 1000, 10_000])
+def euler(n):
+    from differential_eqns.eulers_method import euler
+
+    return _steps(euler, n, lambda x, y: x + y)
+
+
+@benchmark("differential_eqns", "steps", sizes=[100, 1000, 10_000])
+def improved_euler(n):
+    from differential_eqns.improved_eulers_method import improved_euler
+
+    return _steps(improved_euler, n, lambda x, y: x + y)
+
+
+@benchmark("differential_eqns", "steps", sizes=[10, 100, 1000])
+def backward_euler(n):
+    from differential_eqns.backward_eulers_method import backward_euler
+
+    f = compile_expression("-15*y + sin(x)", ("x", "y"))
+    return _steps(lambda x, y, h, f: backward_euler(x, y, h, f)[0], n, f)
+
+
+@benchmark("differential_eqns", "steps", sizes=[100, 1000, 10_000])
+def adams_bashforth_moulton(n):
+    from differential_eqns.adams_bashforth_moulton import adams_bashforth_moulton
+
+    def f(x, y):
+        return x + y
+
+    def run():
+        adams_bashforth_moulton(f, 0.0, 1.0, 1.0 / n, n)
+
+    return run, n
+
+
+# ---------------------------------------------------------------------------
+# V. Interpolation, n knots and 10n queries
+# ---------------------------------------------------------------------------
+
+
+def _spline_data(n):
+    x = np.linspace(0.0, 2.8, n)
+    y = 10 + 8 * x - 6 * x**2 + x**3
+    X = np.linspace(0.0, 2.8, 10 * n)
+    return x.tolist(), y.tolist(), X.tolist()
+
+
+@benchmark("interpolation", "queries", sizes=[10, 100, 300])
+def lerp(n):
+    from interpolation.linear_splines import lerp
+
+    x, y, X = _spline_data(n)
+    return (lambda: lerp(x, y, X)), len(X)
+
+
+@benchmark("interpolation", "queries", sizes=[10, 100, 300])
+def qerp(n):
+    from interpolation.quadratic_splines import qerp
+
+    x, y, X = _spline_data(n)
+    return (lambda: qerp(x, y, X)), len(X)
+
+
+@benchmark("interpolation", "queries", sizes=[10, 100, 1000])
+def cerp(n):
+    from interpolation.cubic_splines import cerp
+
+    x, y, X = _spline_data(n)
+    return (lambda: cerp(x, y, X)), len(X)
+
+
+@benchmark("interpolation", "queries", sizes=[1000, 100_000, 1_000_000])
+def chebyshev_proxy(n):
+    from interpolation.chebyshev import chebyshev_proxy
+
+    p = chebyshev_proxy("sin(3*x) * e^(-x/4) + x/10", 0.0, 10.0)
+    X = np.linspace(0.0, 10.0, n)
+    return (lambda: p(X)), n
+
+
+@benchmark("interpolation", "roots", sizes=[10, 40, 160], quick_sizes=[10, 40])
+def chebyshev_roots(n):
+    # cos(n x) has about 3n roots on [0, 10]
+    from interpolation.chebyshev import chebyshev_proxy
+
+    p = chebyshev_proxy(f"cos({n}*x)", 0.0, 10.0)
+    return p.roots, len(p.roots())
+
+
+# ---------------------------------------------------------------------------
+# VI. Fourier transforms, signal lengths
+# ---------------------------------------------------------------------------
+
+
+def _signal(n):
+    t = np.arange(n) / n
+    return np.sin(2 * np.pi * 5 * t) + 0.5 * np.cos(2 * np.pi * 12 * t)
+
+
+@benchmark("fourier", "samples", sizes=[64, 256, 512], quick_sizes=[64, 128])
+def dft(n):
+    from fourier.discrete_fourier_transform import dft
+
+    signal = _signal(n).tolist()
+    return (lambda: dft(signal)), n
+
+
+@benchmark("fourier", "samples", sizes=[256, 4096, 65536], quick_sizes=[256, 1024])
+def fft_recursive(n):
+    from fourier.fast_fourier_transform import FFT
+
+    signal = _signal(n)
+    return (lambda: FFT(signal)), n
+
+
+@benchmark("fourier", "samples", sizes=[1 << 10, 1 << 14, 1 << 18, 1 << 20])
+def batched_fft(n):
+    from fourier.batched_fft import batched_fft
+
+    signal = _signal(n)
+    return (lambda: batched_fft(signal)), n
+
+
+@benchmark("fourier", "samples", sizes=[1 << 10, 1 << 14, 1 << 18, 1 << 20])
+def rfft(n):
+    from fourier.real_fft import rfft
+
+    signal = _signal(n)
+    return (lambda: rfft(signal)), n
+
+
+@benchmark("fourier", "samples", sizes=[1 << 10, 1 << 14, 1 << 18])
+def fft_convolve(n):
+    from fourier.convolution import fft_convolve
+
+    signal = _signal(n)
+    kernel = np.hanning(257)
+    return (lambda: fft_convolve(signal, kernel)), n
+
+
+# ---------------------------------------------------------------------------
+# VII. Linear algebra, N x N systems, work counted in flops
+# ---------------------------------------------------------------------------
+
+
+def _system(n, spd=False):
+    rng = np.random.default_rng(RNG_SEED)
+    A = rng.standard_normal((n, n))
+    if spd:
+        A = A @ A.T + n * np.eye(n)
+    return A, rng.standard_normal(n)
+
+
+@benchmark("linear_algebra", "flops", sizes=[50, 100, 200], quick_sizes=[50, 100])
+def doolittle_lu(n):
+    from linear_algebra.lu_decomposition import LU
+
+    A, _ = _system(n)
+    return (lambda: LU(A)), 2 * n**3 / 3
+
+
+@benchmark("linear_algebra", "flops", sizes=[100, 200, 400, 800])
+def lu_factor(n):
+    from linear_algebra.lu_decomposition import lu_factor
+
+    A, _ = _system(n)
+    return (lambda: lu_factor(A)), 2 * n**3 / 3
+
+
+@benchmark("linear_algebra", "flops", sizes=[100, 200, 400, 800])
+def blocked_lu(n):
+    from linear_algebra.blocked_lu import blocked_lu
+
+    A, _ = _system(n)
+    return (lambda: blocked_lu(A)), 2 * n**3 / 3
+
+
+@benchmark("linear_algebra", "flops", sizes=[100, 200, 400, 800])
+def lu_solve(n):
+    from linear_algebra.lu_decomposition import solve
+
+    A, b = _system(n)
+    return (lambda: solve(A, b)), 2 * n**3 / 3 + 2 * n**2
+
+
+@benchmark("linear_algebra", "flops", sizes=[100, 200, 400, 800])
+def cholesky(n):
+    from linear_algebra.cholesky_decomposition import cholesky
+
+    A, _ = _system(n, spd=True)
+    return (lambda: cholesky(A)), n**3 / 3
+
+
+@benchmark("linear_algebra", "flops", sizes=[100, 200, 400, 800])
+def householder_qr(n):
+    from linear_algebra.qr_decomposition import householder_qr
+
+    A, _ = _system(n)
+    return (lambda: householder_qr(A)), 4 * n**3 / 3
+
+
+@benchmark("linear_algebra", "unknowns", sizes=[20, 50, 100], quick_sizes=[20, 50])
+def conjugate_gradient(n):
+    # n is the grid side, the 2-D Poisson system has n^2 unknowns
+    from linear_algebra.iterative_methods import conjugate_gradient
+    from linear_algebra.sparse import poisson_matrix
+
+    A = poisson_matrix(n)
+    b = np.ones(A.shape[0])
+    return (lambda: conjugate_gradient(A, b, preconditioner="jacobi")), n * n
+
+
+@benchmark("linear_algebra", "unknowns", sizes=[20, 50, 100], quick_sizes=[20, 50])
+def spsolve(n):
+    from linear_algebra.sparse import poisson_matrix, spsolve
+
+    A = poisson_matrix(n)
+    b = np.ones(A.shape[0])
+    return (lambda: spsolve(A, b)), n * n
@@ -0,0 +1,28 @@
+"""
+Initial value problems for ODEs, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "backward_eulers_method",
+    "ensemble",
+    "eulers_method",
+    "improved_eulers_method",
+]
+
+EXPORTS = {
+    "euler": "eulers_method",
+    "tabulate_euler": "eulers_method",
+    "improved_euler": "improved_eulers_method",
+    "tabulate_improved_euler": "improved_eulers_method",
+    "backward_euler": "backward_eulers_method",
+    "tabulate_backward_euler": "backward_eulers_method",
+    "adams_bashforth_moulton": "adams_bashforth_moulton",
+    "adams_bashforth_moulton_adaptive": "adams_bashforth_moulton",
+    "tabulate_adams_bashforth_moulton": "adams_bashforth_moulton",
+    "integrate_ensemble": "ensemble",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
@@ -0,0 +1,364 @@
+# ======================================================
+# https://en.wikipedia.org/wiki/Linear_multistep_method
+# ======================================================
+
+import numpy as np
+
+from utils import as_function, compile_expression
+from utils.instrumentation import count, counted, instrumented
+
+# Adams-Bashforth (explicit) weights of f_n, f_{n-1}, ... per order
+BASHFORTH = {
+    1: np.array([1.0]),
+    2: np.array([3.0, -1.0]) / 2,
+    3: np.array([23.0, -16.0, 5.0]) / 12,
+    4: np.array([55.0, -59.0, 37.0, -9.0]) / 24,
+    5: np.array([1901.0, -2774.0, 2616.0, -1274.0, 251.0]) / 720,
+}
+
+# Adams-Moulton (implicit) weights of f_{n+1}, f_n, ... per order
+MOULTON = {
+    1: np.array([1.0]),
+    2: np.array([1.0, 1.0]) / 2,
+    3: np.array([5.0, 8.0, -1.0]) / 12,
+    4: np.array([9.0, 19.0, -5.0, 1.0]) / 24,
+    5: np.array([251.0, 646.0, -264.0, 106.0, -19.0]) / 720,
+}
+
+# Milne's estimate: the corrector's local error is about
+# MILNE[order] * |y_corr - y_pred|, from the two methods' error constants
+MILNE = {
+    1: 1 / 2,
+    2: 1 / 6,
+    3: 1 / 10,
+    4: 19 / 270,
+    5: 27 / 502,
+}
+
+
+class DerivativeHistory:
+    """
+    Ring buffer of the last few values of f and the points x they were
+    taken at, a new value overwrites the oldest in place instead of
+    shifting the others along
+    """
+
+    def __init__(self, size, x, first):
+        self.values = np.zeros((size,) + np.shape(first))
+        self.points = np.zeros(size)
+        self.size = size
+        self.head = -1
+        self.push(x, first)
+
+    def push(self, x, value):
+        self.head = (self.head + 1) % self.size
+        self.points[self.head] = x
+        self.values[self.head] = value
+
+    def latest(self, k):
+        # newest first: f_n, f_{n-1}, ..., f_{n-k+1}
+        return self.values[(self.head - np.arange(k)) % self.size]
+
+    def resample(self, h):
+        """
+        Re-spaces a full buffer to step h back from the newest point,
+        the values at the new points come from the polynomial through
+        the stored ones (the same polynomial the Adams formulas
+        integrate), so no evaluations of f are needed
+        """
+        order = (self.head - np.arange(self.size)) % self.size
+        nodes, values = self.points[order], self.values[order]
+        targets = nodes[0] - h * np.arange(self.size)
+
+        # Lagrange basis polynomial of every node at every target
+        weights = np.ones((self.size, self.size))
+        for m in range(self.size):
+            for j in range(self.size):
+                if j != m:
+                    weights[:, j] *= (targets - nodes[m]) / (nodes[j] - nodes[m])
+
+        self.values[:] = np.tensordot(weights, values, 1)[::-1]
+        self.points[:] = targets[::-1]
+        self.head = self.size - 1
+
+
+def _rk4_step(f, x, y, h, fx):
+    # classical Runge-Kutta, fx = f(x, y) is passed in by the caller
+    k2 = f(x + h / 2, y + (h / 2) * fx)
+    k3 = f(x + h / 2, y + (h / 2) * k2)
+    k4 = f(x + h, y + h * k3)
+    return y + (h / 6) * (fx + 2 * k2 + 2 * k3 + k4)
+
+
+def _rk4_start(f, x, y, fx, h, steps):
+    """
+    steps classical Runge-Kutta steps of size h, yields (x, y, f(x, y))
+    at the end of every step, four evaluations each
+
+    Its local error is O(h^5), so the order - 1 start-up steps stay
+    within the h^order global error of every order up to 5 without any
+    substeps.
+    """
+    for _ in range(steps):
+        y = _rk4_step(f, x, y, h, fx)
+        x = x + h
+        fx = f(x, y)
+        yield x, y, fx
+
+
+def _abm_step(f, x, y, h, history, order, mode):
+    """
+    One predictor-corrector step from the stored derivatives:
+
+    - P: y_pred = y_n + h * Σ b_j f_{n-j}          (Adams-Bashforth)
+    - E: f_pred = f(x_{n+1}, y_pred)
+    - C: y_corr = y_n + h * (a_0 f_pred + Σ a_j f_{n-j+1})   (Adams-Moulton)
+    - E: f_{n+1} = f(x_{n+1}, y_corr), only in PECE mode, PEC reuses f_pred
+    """
+    past = history.latest(order)
+    y_pred = y + h * np.tensordot(BASHFORTH[order], past, 1)
+    f_pred = f(x + h, y_pred)
+
+    moulton = MOULTON[order]
+    slope = moulton[0] * f_pred + np.tensordot(moulton[1:], past[: order - 1], 1)
+    y_corr = y + h * slope
+    f_next = f(x + h, y_corr) if mode == "PECE" else f_pred
+    return y_pred, y_corr, f_next
+
+
+def _check(order, mode):
+    if order not in BASHFORTH:
+        raise ValueError(f"Order must be one of {sorted(BASHFORTH)}")
+    if mode not in ("PEC", "PECE"):
+        raise ValueError("Mode must be PEC or PECE")
+
+
+def _abm_steps(f, x0, y0, h, n, order, mode):
+    """
+    Yields (x, y, y_pred) for steps 1..n, y_pred is None for the steps
+    bootstrapped with the Runge-Kutta starter
+    """
+    x, y = x0, np.asarray(y0, dtype=float)
+    fx = f(x, y)
+    history = DerivativeHistory(order, x, fx)
+
+    start = min(order - 1, n)
+    for x, y, fx in _rk4_start(f, x, y, fx, h, start):
+        history.push(x, fx)
+        yield x, y, None
+
+    for _ in range(n - start):
+        y_pred, y, fx = _abm_step(f, x, y, h, history, order, mode)
+        x = x + h
+        history.push(x, fx)
+        yield x, y, y_pred
+
+
+@instrumented("differential_eqns.adams_bashforth_moulton")
+def adams_bashforth_moulton(f, x0, y0, h, n, order=4, mode="PECE"):
+    """
+    Adams-Bashforth-Moulton predictor-corrector method
+
+    A multistep method: the slope of each step is a polynomial fitted
+    through the last order values of f, which are kept in a ring
+    buffer, so a step needs only one (PEC) or two (PECE) fresh
+    evaluations of f whatever the order. The classical Runge-Kutta
+    method takes the first order - 1 steps that build up the buffer, at
+    four evaluations each.
+
+    Formula (order 4):
+    - y_pred = y_n + h/24 * (55 f_n - 59 f_{n-1} + 37 f_{n-2} - 9 f_{n-3})
+    - y_{n+1} = y_n + h/24 * (9 f(x_{n+1}, y_pred) + 19 f_n - 5 f_{n-1} + f_{n-2})
+
+    Parameters:
+    - f: function of (x, y) or formula string, y may be an array
+    - x0, y0: initial condition
+    - h: step size
+    - n: number of steps
+    - order: 1 to 5
+    - mode: "PECE" (two evaluations per step) or "PEC" (one)
+
+    Returns:
+    - arrays of the n + 1 points x and the solution y at them
+    """
+    _check(order, mode)
+    f = counted(as_function(f, ("x", "y")))
+    count("steps", n)
+
+    xs, ys = [x0], [np.asarray(y0, dtype=float)]
+    for x, y, _ in _abm_steps(f, x0, y0, h, n, order, mode):
+        xs.append(x)
+        ys.append(y)
+
+    return np.array(xs), np.array(ys)
+
+
+def _start_step(f, x, y, fx, h, tol):
+    """
+    Largest step (from h down) on which the Runge-Kutta starter keeps
+    its local error per unit step within tol, estimated by comparing one
+    step with two half steps
+    """
+    while True:
+        y_full = _rk4_step(f, x, y, h, fx)
+        y_mid = _rk4_step(f, x, y, h / 2, fx)
+        y_half = _rk4_step(f, x + h / 2, y_mid, h / 2, f(x + h / 2, y_mid))
+        sigma = np.max(np.abs(y_half - y_full)) / 15 / h
+        if sigma <= tol:
+            return h
+        h *= max(0.25, 0.9 * (tol / sigma) ** (1 / 4))
+
+
+@instrumented("differential_eqns.adams_bashforth_moulton_adaptive")
+def adams_bashforth_moulton_adaptive(
+    f, x0, y0, x_end, tol=1e-6, h=0.1, h_min=1e-10, h_max=None, order=4, mode="PECE"
+):
+    """
+    Adams-Bashforth-Moulton with variable step size
+
+    The gap between predictor and corrector estimates the local error
+    (Milne's device) at no extra cost. A step whose error per unit step
+    exceeds tol is rejected and retried with a smaller h, when the error
+    is well below tol h grows (at most 2x, every order steps). On a
+    change of h the stored derivatives are moved onto the new spacing
+    by interpolation, so the method never restarts. The Runge-Kutta
+    starter takes the first order - 1 steps, on a step small enough for
+    tol, from where h grows to what the multistep method allows.
+
+    Parameters:
+    - f: function of (x, y) or formula string, y may be an array
+    - x0, y0: initial condition
+    - x_end: end of the integration interval
+    - tol: allowed local error per unit step
+    - h: initial step size
+    - h_min, h_max: step size bounds
+    - order: 1 to 5
+    - mode: "PECE" or "PEC"
+
+    Returns:
+    - arrays of the accepted points x and the solution y at them
+    """
+    _check(order, mode)
+    if x_end <= x0:
+        raise ValueError("Interval must satisfy x0 < x_end")
+    f = counted(as_function(f, ("x", "y")))
+    h_max = h_max or x_end - x0
+
+    x, y = x0, np.asarray(y0, dtype=float)
+    fx = f(x, y)
+    history = DerivativeHistory(order, x, fx)
+    xs, ys = [x], [y]
+
+    h = _start_step(f, x, y, fx, min(h, h_max, (x_end - x0) / order), tol)
+    for x, y, fx in _rk4_start(f, x, y, fx, h, order - 1):
+        history.push(x, fx)
+        xs.append(x)
+        ys.append(y)
+    count("steps", order - 1)
+
+    accepted = 0
+    while x_end - x > 1e-12 * max(1.0, abs(x_end)):
+        if x + h > x_end:
+            h = x_end - x
+            history.resample(h)
+
+        y_pred, y_corr, f_next = _abm_step(f, x, y, h, history, order, mode)
+        sigma = MILNE[order] * np.max(np.abs(y_corr - y_pred)) / h
+
+        if sigma <= tol:
+            x, y = x + h, y_corr
+            history.push(x, f_next)
+            xs.append(x)
+            ys.append(y)
+            count("steps")
+            accepted += 1
+
+            if sigma < tol / 10 and accepted >= order and h < h_max:
+                q = 2 if sigma == 0 else (tol / (2 * sigma)) ** (1 / order)
+                h = min(2 * h, q * h, h_max)
+                history.resample(h)
+                accepted = 0
+        else:
+            count("rejected")
+            h = max((tol / (2 * sigma)) ** (1 / order) * h, h / 4)
+            if h < h_min:
+                raise Exception("Step size fell below h_min")
+            history.resample(h)
+            accepted = 0
+
+    return np.array(xs), np.array(ys)
+
+
+@instrumented("differential_eqns.tabulate_adams_bashforth_moulton")
+def tabulate_adams_bashforth_moulton(f, x0=0, y0=1, n=20, h=0.1, order=4, exact=None):
+    f = counted(as_function(f, ("x", "y")))
+    count("steps", n)
+
+    print("-" * 64)
+    print(
+        f"{'n':<3} | {'xn+1':<8} | {'method':<6} | {'y_pred':<8} | {'yn+1':<8} | {'exact':<8}"
+    )
+    print("-" * 64)
+
+    steps = _abm_steps(f, x0, y0, h, n, order, "PECE")
+    for i, (x, y, y_pred) in enumerate(steps):
+        method = "rk4" if y_pred is None else "abm"
+        predicted = "" if y_pred is None else f"{y_pred:<8.4f}"
+        reference = "" if exact is None else f"{exact(x):<8.4f}"
+
+        print(
+            f"{i:<3} | {x:<8.4f} | {method:<6} | {predicted:<8} | {y:<8.4f} | {reference}"
+        )
+
+
+def evaluate():
+    tests = [
+        {"f": "y", "x0": 0, "y0": 1, "exact": np.exp},
+        {"f": "x + y", "x0": 0, "y0": 1, "exact": lambda x: 2 * np.exp(x) - x - 1},
+    ]
+
+    print(
+        "ADAMS-BASHFORTH-MOULTON PREDICTOR-CORRECTOR APPROXIMATION OF SOLUTIONS TO ODEs\n"
+    )
+
+    for test in tests:
+        f = compile_expression(test["f"], ("x", "y"))
+        print(f"Problem: dy/dx = {f.text}")
+        print(f"Initial condition: y({test['x0']}) = {test['y0']}")
+        tabulate_adams_bashforth_moulton(
+            f, test["x0"], test["y0"], n=10, exact=test["exact"]
+        )
+        print("\n")
+
+    # evaluations of f needed for y' = y on [0, 2] against Heun's method
+    from differential_eqns.improved_eulers_method import improved_euler
+
+    calls = 0
+
+    def f(x, y):
+        nonlocal calls
+        calls += 1
+        return y
+
+    print(f"{'method':<22} | {'steps':<6} | {'f calls':<8} | {'error at x = 2':<14}")
+    print("-" * 60)
+    for n in [20, 80, 320]:
+        h, y, calls = 2 / n, 1.0, 0
+        for i in range(n):
+            y = improved_euler(i * h, y, h, f)
+        print(f"{'heun':<22} | {n:<6} | {calls:<8} | {abs(y - np.exp(2)):<14.2e}")
+
+        for order, mode in [(4, "PECE"), (4, "PEC"), (5, "PECE")]:
+            calls = 0
+            _, ys = adams_bashforth_moulton(f, 0, 1.0, h, n, order, mode)
+            name, error = f"abm order {order} {mode}", abs(ys[-1] - np.exp(2))
+            print(f"{name:<22} | {n:<6} | {calls:<8} | {error:<14.2e}")
+
+    calls = 0
+    xs, ys = adams_bashforth_moulton_adaptive(f, 0, 1.0, 2, tol=1e-8)
+    name, error = "abm adaptive 1e-8", abs(ys[-1] - np.exp(2))
+    print(f"{name:<22} | {len(xs) - 1:<6} | {calls:<8} | {error:<14.2e}")
+
+
+if __name__ == "__main__":
+    evaluate()
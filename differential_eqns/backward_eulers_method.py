@@ -0,0 +1,116 @@
+# ====================================================
+# https://en.wikipedia.org/wiki/Backward_Euler_method
+# ====================================================
+
+import numpy as np
+
+from differentiation.automatic_differentiation import (
+    value_and_derivative,
+    value_and_jacobian,
+)
+from linear_algebra.lu_decomposition import lu_factor
+from utils import as_function, compile_expression
+from utils.instrumentation import count, counted, instrumented
+
+
+@instrumented("differential_eqns.backward_euler")
+def backward_euler(xn, yn, h, f, tol=1e-12, max_iter=50):
+    """
+    Backward (Implicit) Euler's Method
+
+    The slope is taken at the end of the step, so y_{n+1} appears on
+    both sides and is found with Newton's method. The derivative (or
+    Jacobian, for systems) Newton needs comes from automatic
+    differentiation of f, so no hand-written derivative is required,
+    but f must use NumPy functions (math.* raise a TypeError on the
+    dual numbers it is evaluated with) or be a formula string.
+    Unlike the explicit method it stays stable on stiff equations for
+    any step size.
+
+    Formula:
+    - y_{n+1} = y_n + h * f(x_{n+1}, y_{n+1})
+    - Newton on g(y) = y - y_n - h * f(x_{n+1}, y)
+
+    Returns:
+    - y_{n+1} and the number of Newton iterations
+    """
+    f = counted(as_function(f, ("x", "y")))
+    x_next = xn + h
+    system = np.ndim(yn) > 0
+    yn = np.asarray(yn, dtype=float)
+
+    def g(y):
+        return y - yn - h * f(x_next, y)
+
+    # explicit Euler predictor as the starting guess
+    y = yn + h * np.asarray(f(xn, yn), dtype=float)
+    for iteration in range(1, max_iter + 1):
+        if system:
+            residual, J = value_and_jacobian(g, y)
+            step = lu_factor(J).solve(residual)
+        else:
+            residual, slope = value_and_derivative(g, y)
+            if slope == 0:
+                raise Exception("Cannot divide by zero")
+            step = residual / slope
+
+        y = y - step
+        if np.max(np.abs(step)) <= tol * (1 + np.max(np.abs(y))):
+            count("iterations", iteration)
+            return y, iteration
+
+    raise Exception("Newton's method did not converge")
+
+
+@instrumented("differential_eqns.tabulate_backward_euler")
+def tabulate_backward_euler(f, x0=0, y0=1, n=20, h=0.1, exact=None):
+    f = counted(as_function(f, ("x", "y")))
+    count("steps", n)
+
+    print("-" * 56)
+    print(f"{'n':<3} | {'xn':<8} | {'yn':<8} | {'newton':<8} | {'yn+1':<8} | {'exact':<8}")
+    print("-" * 56)
+
+    x, y = x0, y0
+    for i in range(n):
+        y_next, iterations = backward_euler(x, y, h, f)
+        reference = "" if exact is None else f"{exact(x + h):<8.4f}"
+
+        print(
+            f"{i:<3} | {x:<8.4f} | {y:<8.4f} | {iterations:<8} | {y_next:<8.4f} | {reference}"
+        )
+
+        x += h
+        y = y_next
+
+
+def evaluate():
+    tests = [
+        # stiff: explicit Euler needs h < 2/15 to stay stable
+        {"f": "-15*y", "x0": 0, "y0": 1, "exact": lambda x: np.exp(-15 * x)},
+        {"f": "sin(x) - y^3", "x0": 0, "y0": 1, "exact": None},
+    ]
+
+    print("BACKWARD EULER'S METHOD (IMPLICIT) APPROXIMATION OF SOLUTIONS TO ODEs\n")
+
+    for test in tests:
+        f = compile_expression(test["f"], ("x", "y"))
+        print(f"Problem: dy/dx = {f.text}")
+        print(f"Initial condition: y({test['x0']}) = {test['y0']}")
+        tabulate_backward_euler(f, test["x0"], test["y0"], n=10, exact=test["exact"])
+        print("\n")
+
+    # a system: the Jacobian of the right-hand side comes from dual numbers
+    def oscillator(x, y):
+        return np.array([y[1], -y[0]])
+
+    y, h = np.array([1.0, 0.0]), 0.1
+    for i in range(10):
+        y, _ = backward_euler(i * h, y, h, oscillator)
+
+    print("Problem: y'' = -y as a system, y(0) = 1, y'(0) = 0")
+    print(f"y(1) ~ {y[0]:.4f} (exact {np.cos(1):.4f}, implicit Euler damps)")
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from differential_eqns.improved_eulers_method import improved_euler
+from utils import as_function
+from utils.instrumentation import count, instrumented
+
+# set in every worker by _attach
+_worker = {}
+
+
+def _integrate(step, f, x0, y0, h, n, out):
+    """
+    n steps of a one-step method, out[k] = y(x0 + k h) written in place
+    """
+    y = y0
+    out[0] = y
+    for k in range(n):
+        y = step(x0 + k * h, y, h, f)
+        out[k + 1] = y
+
+
+def _attach(name, shape, f, step):
+    # runs once per worker, the function and method are sent only once
+    memory = SharedMemory(name=name)
+    _worker["memory"] = memory
+    _worker["trajectories"] = np.ndarray(shape, dtype=float, buffer=memory.buf)
+    _worker["f"] = as_function(f, ("x", "y"))
+    _worker["step"] = step
+
+
+def _run_members(members, x0, y0, h, n):
+    trajectories, f, step = _worker["trajectories"], _worker["f"], _worker["step"]
+    for i, member in enumerate(members):
+        _integrate(step, f, x0[i], y0[i], h[i], n[i], trajectories[member])
+    return len(members)
+
+
+@instrumented("differential_eqns.integrate_ensemble")
+def integrate_ensemble(
+    f, x0, y0, h, n, step=improved_euler, workers=None, chunk_size=None
+):
+    """
+    Integrates an ensemble of initial value problems sharing the same
+    right-hand side, one member per initial condition, across a pool of
+    worker processes
+
+    Meant for right-hand sides that can't be vectorized over the
+    ensemble, where a single process has to step every member one by
+    one. The trajectories live in one multiprocessing.shared_memory
+    array that every worker writes its members into, so results are
+    never pickled back. Members are handed out in small chunks, longest
+    first, to whichever worker is free, so members with very different
+    step counts still keep every worker busy.
+
+    Parameters:
+    - f: function of (x, y) or formula string, it has to be picklable
+      (module-level) to reach the workers
+    - x0: start of every member, scalar or one per member
+    - y0: initial values, (members,) or (members, dimension)
+    - h: step size, scalar or one per member
+    - n: number of steps, scalar or one per member
+    - step: one-step method step(xn, yn, h, f), e.g. euler or
+      improved_euler (module-level as well)
+    - workers: number of processes, defaults to the CPU count, 1 runs
+      everything in this process
+    - chunk_size: members per task, defaults to about eight tasks per worker
+
+    Returns:
+    - trajectories (members, max(n) + 1[, dimension]), member i at
+      x0 + k h for k = 0..n[i] and NaN after its last step
+    """
+    y0 = np.asarray(y0, dtype=float)
+    members = len(y0)
+    x0, h, n = (np.broadcast_to(v, (members,)) for v in (x0, h, n))
+    n = n.astype(int)
+    if np.any(n < 0):
+        raise ValueError("Number of steps cannot be negative")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Number of workers must be positive")
+
+    count("members", members)
+    count("steps", int(n.sum()))
+    shape = (members, int(n.max(initial=0)) + 1) + y0.shape[1:]
+
+    if workers == 1 or members <= 1:
+        trajectories = np.full(shape, np.nan)
+        f = as_function(f, ("x", "y"))
+        for i in range(members):
+            _integrate(step, f, x0[i], y0[i], h[i], n[i], trajectories[i])
+        return trajectories
+
+    # longest members first, so the last tasks handed out are the short ones
+    order = np.argsort(-n, kind="stable")
+    if chunk_size is None:
+        chunk_size = max(1, -(-members // (8 * workers)))
+    chunks = [order[i : i + chunk_size] for i in range(0, members, chunk_size)]
+
+    memory = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    try:
+        trajectories = np.ndarray(shape, dtype=float, buffer=memory.buf)
+        trajectories.fill(np.nan)
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_attach,
+            initargs=(memory.name, shape, f, step),
+        ) as pool:
+            tasks = [
+                pool.submit(
+                    _run_members, chunk, x0[chunk], y0[chunk], h[chunk], n[chunk]
+                )
+                for chunk in chunks
+            ]
+            for task in as_completed(tasks):
+                task.result()
+
+        result = trajectories.copy()
+    finally:
+        # the buffer can only be released once no array points into it
+        trajectories = None
+        memory.close()
+        memory.unlink()
+
+    return result
+
+
+def _legacy_rhs(x, y):
+    # a damped pendulum with dry friction, scalar code that branches on
+    # the state and sums a series term by term, as old code often does
+    angle, velocity = y
+    sine, term = 0.0, angle
+    for k in range(1, 40):
+        sine += term
+        term *= -angle * angle / ((2 * k) * (2 * k + 1))
+
+    friction = 0.2 if velocity > 0 else -0.2 if velocity < 0 else 0.0
+    return np.array([velocity, -sine - 0.1 * velocity - friction])
+
+
+def evaluate():
+    import time
+
+    header = "ENSEMBLE INTEGRATION ACROSS PROCESSES (SHARED MEMORY)"
+    print(header)
+    print("-" * len(header))
+
+    rng = np.random.default_rng(225)
+    members = 64
+    y0 = np.column_stack([rng.uniform(-2, 2, members), rng.uniform(-1, 1, members)])
+    # members run for very different lengths
+    n = rng.integers(200, 2000, members)
+
+    reference = None
+    cpus = os.cpu_count() or 1
+    for workers in sorted({1, 2, cpus}):
+        started = time.perf_counter()
+        trajectories = integrate_ensemble(
+            _legacy_rhs, 0.0, y0, 0.01, n, workers=workers
+        )
+        elapsed = time.perf_counter() - started
+
+        if reference is None:
+            reference, baseline = trajectories, elapsed
+        same = np.array_equal(trajectories, reference, equal_nan=True)
+        print(
+            f"workers {workers:<3} {n.sum() / elapsed:>10.0f} steps/s,"
+            f" speedup {baseline / elapsed:.2f}x, identical: {same}"
+        )
+
+    print(f"(this machine has {cpus} CPUs)")
+    final = reference[np.arange(members), n]
+    print("final angles of the first members:", np.round(final[:4, 0], 4).tolist())
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -2,14 +2,23 @@
 # https://en.wikipedia.org/wiki/Euler_method
 # ===========================================
 
-import math
+from utils import as_function, compile_expression
+from utils.instrumentation import count, counted, instrumented
 
 
+@instrumented("differential_eqns.euler")
 def euler(xn, yn, h, f):
+    """Euler's Method, one explicit step y_{n+1} = y_n + h * f(x_n, y_n)"""
+    f = counted(as_function(f, ("x", "y")))
+    count("steps")
     return yn + h * f(xn, yn)
 
 
+@instrumented("differential_eqns.tabulate_euler")
 def tabulate_euler(f, x0=0, y0=1, n=20, h=0.1):
+    f = counted(as_function(f, ("x", "y")))
+    count("steps", n)
+
     print("-" * 56)
     print(f"{'n':<3} | {'xn':<8} | {'yn':<8} | {'dy/dx':<8} | {'h':<8} | {'yn+1':<8}")
     print("-" * 56)
@@ -30,17 +39,18 @@ def tabulate_euler(f, x0=0, y0=1, n=20, h=0.1):
 
 def evaluate():
     tests = [
-        {"f": lambda x, y: y, "desc": "dy/dx = y", "x0": 0, "y0": 1},
-        {"f": lambda x, y: x, "desc": "dy/dx = x", "x0": 0, "y0": 0},
-        {"f": lambda x, y: math.sin(x), "desc": "dy/dx = sin(x)", "x0": 0, "y0": 1},
+        {"f": "y", "x0": 0, "y0": 1},
+        {"f": "x", "x0": 0, "y0": 0},
+        {"f": "sin(x)", "x0": 0, "y0": 1},
     ]
 
     print("EULER'S METHOD APPROXIMATION OF SOLUTIONS TO ODEs\n")
 
     for test in tests:
-        print(f"Problem: {test['desc']}")
+        f = compile_expression(test["f"], ("x", "y"))
+        print(f"Problem: dy/dx = {f.text}")
         print(f"Initial condition: y({test['x0']}) = {test['y0']}")
-        tabulate_euler(test["f"], test["x0"], test["y0"])
+        tabulate_euler(f, test["x0"], test["y0"])
         print("\n")
 
 
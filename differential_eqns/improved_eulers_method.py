@@ -2,19 +2,38 @@
 # https://en.wikipedia.org/wiki/Heun%27s_method
 # =============================================
 
-import math
+from utils import as_function, compile_expression
+from utils.instrumentation import count, counted, instrumented
 
 
+@instrumented("differential_eqns.improved_euler")
 def improved_euler(xn, yn, h, f):
     """Improved Euler's Method (Heun's Method)"""
-    k1 = f(xn, yn)
+    count("steps")
+    return heun_step(xn, yn, h, counted(as_function(f, ("x", "y"))))[-1]
+
+
+def heun_step(xn, yn, h, f, k1=None):
+    """
+    One Heun step with its intermediate values, (k1, y_pred, k2, y_next)
+
+    k1 = f(xn, yn) can be passed in when the caller already has it, the
+    step then costs a single evaluation of f
+    """
+    f = as_function(f, ("x", "y"))
+    if k1 is None:
+        k1 = f(xn, yn)
     y_pred = yn + h * k1
     k2 = f(xn + h, y_pred)
     # corrector step, take average
-    return yn + (0.5 * h) * (k1 + k2)
+    return k1, y_pred, k2, yn + (0.5 * h) * (k1 + k2)
 
 
+@instrumented("differential_eqns.tabulate_improved_euler")
 def tabulate_improved_euler(f, x0=0, y0=1, n=20, h=0.1):
+    f = counted(as_function(f, ("x", "y")))
+    count("steps", n)
+
     print("-" * 72)
     print(
         f"{'n':<3} | {'xn':<8} | {'yn':<8} | {'k1':<8} | {'y_pred':<8} | {'k2':<8} | {'yn+1':<8}"
@@ -23,10 +42,7 @@ def tabulate_improved_euler(f, x0=0, y0=1, n=20, h=0.1):
 
     x, y = x0, y0
     for i in range(n):
-        k1 = f(x, y)
-        y_pred = y + h * k1
-        k2 = f(x + h, y_pred)
-        y_next = improved_euler(x, y, h, f)
+        k1, y_pred, k2, y_next = heun_step(x, y, h, f)
 
         print(
             f"{i:<3} | {x:<8.4f} | {y:<8.4f} | {k1:<8.4f} | {y_pred:<8.4f} | {k2:<8.4f} | {y_next:<8.4f}"
@@ -38,10 +54,10 @@ def tabulate_improved_euler(f, x0=0, y0=1, n=20, h=0.1):
 
 def evaluate():
     tests = [
-        {"f": lambda x, y: y, "desc": "dy/dx = y", "x0": 0, "y0": 1},
-        {"f": lambda x, y: x, "desc": "dy/dx = x", "x0": 0, "y0": 0},
-        {"f": lambda x, y: math.sin(x), "desc": "dy/dx = sin(x)", "x0": 0, "y0": 1},
-        {"f": lambda x, y: x + y, "desc": "dy/dx = x + y", "x0": 0, "y0": 1},
+        {"f": "y", "x0": 0, "y0": 1},
+        {"f": "x", "x0": 0, "y0": 0},
+        {"f": "sin(x)", "x0": 0, "y0": 1},
+        {"f": "x + y", "x0": 0, "y0": 1},
     ]
 
     print(
@@ -49,9 +65,10 @@ def evaluate():
     )
 
     for test in tests:
-        print(f"Problem: {test['desc']}")
+        f = compile_expression(test["f"], ("x", "y"))
+        print(f"Problem: dy/dx = {f.text}")
         print(f"Initial condition: y({test['x0']}) = {test['y0']}")
-        tabulate_improved_euler(test["f"], test["x0"], test["y0"])
+        tabulate_improved_euler(f, test["x0"], test["y0"])
         print("\n")
 
 
@@ -0,0 +1,24 @@
+"""
+Numerical and automatic differentiation, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "automatic_differentiation",
+]
+
+EXPORTS = {
+    "backward_difference": "backward_difference",
+    "center_difference": "center_difference",
+    "forward_difference": "forward_difference",
+    "Dual": "automatic_differentiation",
+    "derivative": "automatic_differentiation",
+    "value_and_derivative": "automatic_differentiation",
+    "jacobian": "automatic_differentiation",
+    "value_and_jacobian": "automatic_differentiation",
+    "automatic_difference": "automatic_differentiation",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
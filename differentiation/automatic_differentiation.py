@@ -0,0 +1,378 @@
+import numpy as np
+
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import counted, instrumented
+
+# ufunc -> local derivative, given the input value v and the result r
+UNARY = {
+    np.negative: lambda v, r: -np.ones_like(v),
+    np.positive: lambda v, r: np.ones_like(v),
+    np.sin: lambda v, r: np.cos(v),
+    np.cos: lambda v, r: -np.sin(v),
+    np.tan: lambda v, r: 1 + r**2,
+    np.arcsin: lambda v, r: 1 / np.sqrt(1 - v**2),
+    np.arccos: lambda v, r: -1 / np.sqrt(1 - v**2),
+    np.arctan: lambda v, r: 1 / (1 + v**2),
+    np.sinh: lambda v, r: np.cosh(v),
+    np.cosh: lambda v, r: np.sinh(v),
+    np.tanh: lambda v, r: 1 - r**2,
+    np.exp: lambda v, r: r,
+    np.log: lambda v, r: 1 / v,
+    np.log10: lambda v, r: 1 / (v * np.log(10)),
+    np.sqrt: lambda v, r: 0.5 / r,
+    np.absolute: lambda v, r: np.sign(v),
+    np.square: lambda v, r: 2 * v,
+    np.reciprocal: lambda v, r: -(r**2),
+}
+
+
+def _power_partials(a, b, r):
+    da = b * a ** (b - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # d/db a^b = a^b ln(a), only needed (and defined) for a > 0
+        db = np.where(a > 0, r * np.log(np.where(a > 0, a, 1)), 0.0)
+    return da, db
+
+
+# ufunc -> partial derivatives with respect to both inputs
+BINARY = {
+    np.add: lambda a, b, r: (1.0, 1.0),
+    np.subtract: lambda a, b, r: (1.0, -1.0),
+    np.multiply: lambda a, b, r: (b, a),
+    np.true_divide: lambda a, b, r: (1 / b, -r / b),
+    np.power: _power_partials,
+}
+
+
+def _chain(derivative, partial):
+    # the seed directions live on the last axis of the derivative
+    if derivative is None:
+        return None
+    return derivative * np.expand_dims(partial, -1)
+
+
+def _matmul_partials(a, b):
+    """
+    d(a @ b) from da @ b + a @ db, the seed directions (last axis of
+    each derivative) are moved to the front and ride along as a batch
+    """
+    first = second = None
+    if a.derivative is not None:
+        if a.ndim == 1:
+            # (k, d) against b: b^T da
+            b_t = b.value if b.ndim == 1 else np.swapaxes(b.value, -1, -2)
+            first = b_t @ a.derivative
+        else:
+            first = np.moveaxis(np.moveaxis(a.derivative, -1, 0) @ b.value, 0, -1)
+    if b.derivative is not None:
+        if b.ndim == 1:
+            second = a.value @ b.derivative
+        else:
+            second = np.moveaxis(a.value @ np.moveaxis(b.derivative, -1, 0), 0, -1)
+    return _sum(first, second)
+
+
+def _sum_reduce(x, axis=0, keepdims=False):
+    value = np.add.reduce(x.value, axis=axis, keepdims=keepdims)
+    if x.derivative is None:
+        return Dual(value)
+
+    # the same axes of the derivative, never its trailing seed axis
+    if axis is None:
+        axes = tuple(range(x.ndim))
+    else:
+        axes = tuple(i % x.ndim for i in np.atleast_1d(axis))
+    return Dual(value, np.add.reduce(x.derivative, axis=axes, keepdims=keepdims))
+
+
+def _sum(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return first + second
+
+
+class Dual:
+    """
+    Dual number v + dε with ε^2 = 0, carrying a value and its derivative
+
+    Idea:
+    Evaluating f on v + ε gives f(v) + f'(v)ε, so the derivative comes
+    out of the same pass as the value, exact up to rounding. Both parts
+    may be arrays: derivative has one extra trailing axis holding the
+    derivative along each seed direction, which is how a whole Jacobian
+    comes out of a single evaluation.
+
+    NumPy ufuncs (np.sin, np.exp, ...) and the arithmetic operators are
+    overloaded, so compiled formulas and NumPy-based functions work
+    unchanged, as do matrix products (A @ x, np.dot) and sums (np.sum,
+    np.add.reduce), which covers linear systems. Any other ufunc or ufunc
+    method (np.maximum, np.cumsum, out=...) raises a TypeError. The math
+    module's functions convert their argument to float, so passing them
+    a Dual raises a TypeError rather than losing the derivative.
+    """
+
+    def __init__(self, value, derivative=None):
+        self.value = np.asarray(value, dtype=float)
+        if derivative is not None:
+            derivative = np.asarray(derivative, dtype=float)
+            shape = self.value.shape + derivative.shape[-1:]
+            derivative = np.broadcast_to(derivative, shape)
+        # None is a zero derivative (a constant)
+        self.derivative = derivative
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, index):
+        derivative = None if self.derivative is None else self.derivative[index]
+        return Dual(self.value[index], derivative)
+
+    def sum(self, axis=None, dtype=None, out=None, keepdims=False):
+        # np.sum(dual) ends up here
+        if dtype is not None or out is not None:
+            raise TypeError("Dual.sum does not support dtype or out")
+        return _sum_reduce(self, axis, keepdims)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if ufunc is np.add and method == "reduce" and len(inputs) == 1:
+            if set(kwargs) <= {"axis", "keepdims"}:
+                return _sum_reduce(inputs[0], **kwargs)
+
+        if method != "__call__" or kwargs:
+            name = ufunc.__name__
+            if method != "__call__":
+                name += f".{method}"
+            arguments = f" with {', '.join(kwargs)}" if kwargs else ""
+            raise TypeError(f"np.{name}{arguments} is not supported on Dual numbers")
+
+        if len(inputs) == 2 and ufunc is np.matmul:
+            a, b = (_lift(x) for x in inputs)
+            return Dual(a.value @ b.value, _matmul_partials(a, b))
+
+        if len(inputs) == 1 and ufunc in UNARY:
+            (x,) = inputs
+            result = ufunc(x.value)
+            return Dual(result, _chain(x.derivative, UNARY[ufunc](x.value, result)))
+
+        if len(inputs) == 2 and ufunc in BINARY:
+            a, b = (_lift(x) for x in inputs)
+            result = ufunc(a.value, b.value)
+            da, db = BINARY[ufunc](a.value, b.value, result)
+            derivative = _sum(_chain(a.derivative, da), _chain(b.derivative, db))
+            return Dual(result, derivative)
+
+        raise TypeError(f"np.{ufunc.__name__} is not supported on Dual numbers")
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+    def __matmul__(self, other):
+        return np.matmul(self, other)
+
+    def __rmatmul__(self, other):
+        return np.matmul(other, self)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    # comparisons only look at the value, so branches keep working
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+    def __float__(self):
+        # math.sin(x) and friends go through float(), which would drop
+        # the derivative and silently return a wrong (zero) slope
+        if self.derivative is not None:
+            raise TypeError(
+                "Cannot convert a Dual to float without losing its derivative, "
+                "use NumPy functions (np.sin, ...) or a formula string instead "
+                "of math.*"
+            )
+        return float(self.value)
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.derivative!r})"
+
+
+def _value(x):
+    return x.value if isinstance(x, Dual) else x
+
+
+def _collect(result, directions):
+    """
+    Value and derivative of whatever f returned: a Dual, a constant, or
+    a list/array of those (e.g. np.array([f1, f2]) for a vector function)
+    """
+    if isinstance(result, Dual):
+        value = result.value
+        if result.derivative is None:
+            return value, np.zeros(value.shape + (directions,))
+        return value, np.array(result.derivative)
+
+    if isinstance(result, (list, tuple)) or (
+        isinstance(result, np.ndarray) and result.dtype == object
+    ):
+        parts = [_collect(item, directions) for item in result]
+        values = np.array([value for value, _ in parts])
+        derivatives = np.array([derivative for _, derivative in parts])
+        return values, derivatives
+
+    value = np.asarray(result, dtype=float)
+    return value, np.zeros(value.shape + (directions,))
+
+
+def _lift(x):
+    if isinstance(x, Dual):
+        return x
+    if isinstance(x, np.ndarray) and x.dtype == object:
+        # e.g. np.array([f1, f2]) built from Duals inside a vector function
+        seeded = [
+            item
+            for item in x.flat
+            if isinstance(item, Dual) and item.derivative is not None
+        ]
+        directions = seeded[0].derivative.shape[-1] if seeded else 1
+        return Dual(*_collect(x, directions))
+    return Dual(x)
+
+
+def value_and_derivative(f, x):
+    """
+    f(x) and f'(x) of a scalar function in one evaluation pass, x may
+    be an array of points (f is then evaluated elementwise)
+    """
+    f = as_function(f)
+    x = np.asarray(x, dtype=float)
+    value, derivative = _collect(f(Dual(x, np.ones(x.shape + (1,)))), 1)
+    value, derivative = np.broadcast_arrays(value, derivative[..., 0])
+    return value[()], derivative[()]
+
+
+def derivative(f, x):
+    """
+    Exact f'(x) by forward-mode automatic differentiation
+
+    f must be a formula string or built from NumPy functions and
+    arithmetic, math.sin and the like raise a TypeError on dual numbers
+    """
+    return value_and_derivative(f, x)[1]
+
+
+def value_and_jacobian(f, x):
+    """
+    f(x) and the Jacobian J[i, j] = df_i/dx_j of f: R^n -> R^m
+
+    x is seeded with the n unit directions at once, so the whole
+    Jacobian comes out of a single evaluation of f.
+    """
+    f = as_function(f)
+    x = np.asarray(x, dtype=float)
+    if x.ndim != 1:
+        raise ValueError("x must be a 1-D vector")
+
+    return _collect(f(Dual(x, np.eye(len(x)))), len(x))
+
+
+def jacobian(f, x):
+    return value_and_jacobian(f, x)[1]
+
+
+@instrumented("differentiation.automatic_difference")
+def automatic_difference(x, fx, delta=None):
+    """
+    Drop-in exact replacement for forward_difference, backward_difference
+    and center_difference, delta is accepted and ignored since there is
+    no step size (and no truncation error)
+
+    Returns:
+    - f'(x)
+    """
+    return derivative(counted(as_function(fx)), x)
+
+
+def evaluate():
+    from differentiation.center_difference import center_difference
+
+    test_cases = [
+        {"fx": compile_expression("sin(x)"), "x": 0},
+        {"fx": compile_expression("e^x"), "x": 2},
+        {"fx": compile_expression("x^3 - 2*x - 5"), "x": 2},
+        {"fx": compile_expression("2 - x^-1 * log(x)"), "x": 1 / 3},
+    ]
+
+    print("FORWARD-MODE AUTOMATIC DIFFERENTIATION\n")
+    for idx, test in enumerate(test_cases):
+        fx = test["fx"]
+        x = test["x"]
+        print_header(idx, fx=fx, x=x)
+        print("- automatic:", automatic_difference(x, fx))
+        print("- center difference (h = 0.001):", center_difference(x, fx, 0.001))
+
+    # whole arrays of points in one pass
+    x = np.linspace(0, np.pi, 5)
+    print("\nd/dx sin(x) at", np.round(x, 4).tolist())
+    print("-", np.round(derivative("sin(x)", x), 12).tolist())
+
+    # Jacobian of f(u, v) = (u^2 v, 5u + sin(v))
+    def f(x):
+        u, v = x[0], x[1]
+        return [u**2 * v, 5 * u + np.sin(v)]
+
+    print("\nJacobian of (u^2 v, 5u + sin(v)) at (1, 2):")
+    print("-", jacobian(f, [1.0, 2.0]).tolist())
+
+
+if __name__ == "__main__":
+    evaluate()
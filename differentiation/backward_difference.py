@@ -1,8 +1,8 @@
-import math
-
-from utils import print_header
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import counted, instrumented
 
 
+@instrumented("differentiation.backward_difference")
 def backward_difference(x, fx, delta):
     """
     Backward difference is similar to the forward variation, the only difference being in the formula
@@ -16,13 +16,14 @@ def backward_difference(x, fx, delta):
     """
     if delta <= 0:
         raise ValueError("Delta must be positive")
+    fx = counted(as_function(fx))
     return (fx(x) - fx(x - delta)) / delta
 
 
 def evaluate():
     test_cases = [
-        {"fx": lambda x: math.sin(x), "x": 0, "h": 0.003},
-        {"fx": lambda x: 2 * x, "x": 2, "h": 0.003},
+        {"fx": compile_expression("sin(x)"), "x": 0, "h": 0.003},
+        {"fx": compile_expression("2*x"), "x": 2, "h": 0.003},
     ]
 
     print("BACKBWARD DIFFERENCE METHOD\n")
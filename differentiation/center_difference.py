@@ -1,8 +1,8 @@
-import math
-
-from utils import print_header
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import counted, instrumented
 
 
+@instrumented("differentiation.center_difference")
 def center_difference(x, fx, delta):
     """
     Center difference is similar to both forward and backward difference
@@ -15,15 +15,16 @@ def center_difference(x, fx, delta):
     """
     if delta <= 0:
         raise ValueError("Delta must be positive")
+    fx = counted(as_function(fx))
     return (fx(x + delta) - fx(x - delta)) / (2 * delta)
 
 
 def evaluate():
     test_cases = [
-        {"fx": lambda x: math.sin(x), "x": 0, "h": 0.003},
-        {"fx": lambda x: math.cos(x), "x": 90, "h": 0.001},
-        {"fx": lambda x: math.pow(math.e, x), "x": 2, "h": 0.001},
-        {"fx": lambda x: 2 * x, "x": 2, "h": 0.001},
+        {"fx": compile_expression("sin(x)"), "x": 0, "h": 0.003},
+        {"fx": compile_expression("cos(x)"), "x": 90, "h": 0.001},
+        {"fx": compile_expression("e^x"), "x": 2, "h": 0.001},
+        {"fx": compile_expression("2*x"), "x": 2, "h": 0.001},
     ]
 
     print("CENTER DIFFERENCE METHOD\n")
@@ -1,6 +1,8 @@
-from utils import print_header
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import counted, instrumented
 
 
+@instrumented("differentiation.forward_difference")
 def forward_difference(x, fx, delta):
     """
     The forward difference method allows us to approximate the
@@ -12,7 +14,7 @@ def forward_difference(x, fx, delta):
 
     Parameters:
     - x: point at which to approximate derivative
-    - fx: function of x
+    - fx: function of x or a formula string, x may be an array
     - delta: step size
 
     Returns:
@@ -20,13 +22,14 @@ def forward_difference(x, fx, delta):
     """
     if delta <= 0:
         raise ValueError("Delta must be positive")
+    fx = counted(as_function(fx))
     return (fx(x + delta) - fx(x)) / delta
 
 
 def evaluate():
     test_cases = [
-        {"fx": lambda x: x**2, "x": 2, "h": 0.001},
-        {"fx": lambda x: 2 * x, "x": 2, "h": 0.001},
+        {"fx": compile_expression("x^2"), "x": 2, "h": 0.001},
+        {"fx": compile_expression("2*x"), "x": 2, "h": 0.001},
     ]
     print("FORWARD DIFFERENCE METHOD\n")
     for idx, test in enumerate(test_cases):
@@ -0,0 +1,42 @@
+"""
+Fourier transforms, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "convolution",
+    "discrete_fourier_transform",
+    "fast_fourier_transform",
+    "real_fft",
+    "short_time_fourier_transform",
+]
+
+EXPORTS = {
+    "batched_fft": "batched_fft",
+    "batched_ifft": "batched_fft",
+    "fftn": "batched_fft",
+    "ifftn": "batched_fft",
+    "fft2": "batched_fft",
+    "ifft2": "batched_fft",
+    "fft_convolve": "convolution",
+    "fft_correlate": "convolution",
+    "overlap_add": "convolution",
+    "overlap_save": "convolution",
+    "stream_correlate": "convolution",
+    "dft": "discrete_fourier_transform",
+    "plot_dft": "discrete_fourier_transform",
+    "FFT": "fast_fourier_transform",
+    "compute_fft": "fast_fourier_transform",
+    "plot_fft": "fast_fourier_transform",
+    "compute_and_plot_fft": "fast_fourier_transform",
+    "rfft": "real_fft",
+    "irfft": "real_fft",
+    "stft": "short_time_fourier_transform",
+    "stft_frequencies": "short_time_fourier_transform",
+    "write_spectrogram": "short_time_fourier_transform",
+    "plot_spectrogram": "short_time_fourier_transform",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
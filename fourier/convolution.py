@@ -0,0 +1,263 @@
+import numpy as np
+
+from fourier.batched_fft import batched_fft, batched_ifft
+from fourier.real_fft import irfft, rfft
+from utils.instrumentation import count, instrumented
+
+
+def next_power_of_two(n):
+    return 1 << max(n - 1, 0).bit_length()
+
+
+def _forward(x, nfft, real):
+    padded = np.zeros(nfft, dtype=float if real else complex)
+    padded[: len(x)] = x
+    return rfft(padded) if real else batched_fft(padded)
+
+
+def _inverse(X, nfft, real):
+    return irfft(X, nfft) if real else batched_ifft(X)
+
+
+@instrumented("fourier.fft_convolve")
+def fft_convolve(x, h) -> np.ndarray:
+    """
+    Idea:
+    Convolution in time is multiplication in frequency. Both sequences
+    are zero padded to a power of two at least N + M - 1 long so the
+    circular convolution computed by the FFT equals the linear one.
+
+    Formula:
+    - y = IFFT(FFT(x) * FFT(h)), truncated to N + M - 1 samples
+
+    Parameters:
+    - x: input signal
+    - h: kernel
+
+    Returns:
+    - full linear convolution of x and h
+    """
+    x, h = np.asarray(x), np.asarray(h)
+    if len(x) == 0 or len(h) == 0:
+        raise ValueError("Cannot convolve empty sequences")
+
+    real = not (np.iscomplexobj(x) or np.iscomplexobj(h))
+    size = len(x) + len(h) - 1
+    nfft = max(next_power_of_two(size), 2)
+    count("padded_length", nfft)
+
+    y = _inverse(_forward(x, nfft, real) * _forward(h, nfft, real), nfft, real)
+    return y[:size]
+
+
+@instrumented("fourier.fft_correlate")
+def fft_correlate(x, template) -> np.ndarray:
+    """
+    Full cross-correlation of x against a template, computed as the
+    convolution with the time reversed, conjugated template. Lags run
+    from -(M-1) to N-1 (same layout as numpy.correlate in "full" mode).
+    """
+    template = np.asarray(template)
+    return fft_convolve(x, np.conj(template[::-1]))
+
+
+def rechunk(stream, size):
+    """
+    Regroups an iterable of arbitrarily sized chunks (or a flat array)
+    into blocks of exactly `size` samples, the last one may be shorter
+    """
+    if isinstance(stream, np.ndarray):
+        for start in range(0, len(stream), size):
+            yield stream[start : start + size]
+        return
+
+    buffer = []
+    buffered = 0
+    for chunk in stream:
+        chunk = np.atleast_1d(np.asarray(chunk))
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered < size:
+            continue
+
+        joined = np.concatenate(buffer)
+        start = 0
+        while buffered - start >= size:
+            yield joined[start : start + size]
+            start += size
+        buffer = [joined[start:]]
+        buffered -= start
+
+    if buffered:
+        yield np.concatenate(buffer)
+
+
+def _plan(kernel, block_size):
+    M = len(kernel)
+    if M == 0:
+        raise ValueError("Kernel must not be empty")
+    if block_size is None:
+        block_size = max(next_power_of_two(4 * M) - M + 1, M)
+
+    nfft = max(next_power_of_two(block_size + M - 1), 2)
+    return M, block_size, nfft
+
+
+def _complex_block(real, automatic, block):
+    """
+    Whether a block forces the switch from the real to the complex
+    transform, explicit real=True with complex data is an error
+    """
+    if not real or not np.iscomplexobj(block):
+        return False
+    if not automatic:
+        raise ValueError("Complex input needs real=False (or None to detect it)")
+    return True
+
+
+def _padded(chunks, count):
+    """
+    The input chunks followed by count zeros, nothing at all when the
+    input holds no samples
+    """
+    empty = True
+    for chunk in chunks:
+        chunk = np.atleast_1d(np.asarray(chunk))
+        empty = empty and len(chunk) == 0
+        yield chunk
+
+    if not empty:
+        yield np.zeros(count)
+
+
+def overlap_add(stream, kernel, block_size=None, real=None):
+    """
+    Idea:
+    Streaming linear convolution of a long (possibly unbounded) input
+    with a short kernel. The input is cut into blocks of L samples, each
+    block is convolved with the kernel via one FFT of size >= L + M - 1,
+    and the M - 1 sample tail of every block is added onto the next.
+
+    Parameters:
+    - stream: iterable of input chunks, or a 1-D array
+    - kernel: the M filter taps, its spectrum is computed once
+    - block_size: samples per block L, defaults to roughly 3M
+    - real: use the real-input transform, None detects it like
+      fft_convolve (from the kernel, switching to the complex transform
+      at the first complex input chunk)
+
+    Yields:
+    - output chunks, together they form the full N + M - 1 convolution
+    """
+    kernel = np.asarray(kernel)
+    M, L, nfft = _plan(kernel, block_size)
+    automatic = real is None
+    if automatic or real:
+        # a complex kernel needs the complex transform from the start
+        real = not _complex_block(True, automatic, kernel)
+    H = _forward(kernel, nfft, real)
+    tail = np.zeros(M - 1, dtype=float if real else complex)
+
+    block = None
+    for block in rechunk(stream, L):
+        if _complex_block(real, automatic, block):
+            real, H, tail = False, _forward(kernel, nfft, False), tail.astype(complex)
+
+        n = len(block)
+        y = _inverse(_forward(block, nfft, real) * H, nfft, real)[: n + M - 1]
+        y[: M - 1] += tail
+
+        yield y[:n]
+        tail = y[n:]
+
+    # an empty input has an empty convolution, not M - 1 zeros
+    if M > 1 and block is not None:
+        yield tail
+
+
+def overlap_save(stream, kernel, block_size=None, real=None):
+    """
+    Idea:
+    Streaming linear convolution that keeps the last M - 1 input samples
+    as history in a preallocated frame. Each frame of size nfft is
+    transformed in one go and the first M - 1 (circularly aliased) outputs
+    are discarded, so no additions between blocks are needed.
+
+    Parameters:
+    - stream: iterable of input chunks, or a 1-D array
+    - kernel: the M filter taps, its spectrum is computed once
+    - block_size: new samples consumed per frame, defaults to roughly 3M
+    - real: use the real-input transform, None detects it like
+      fft_convolve (from the kernel, switching to the complex transform
+      at the first complex input chunk)
+
+    Yields:
+    - output chunks, together they form the full N + M - 1 convolution
+    """
+    kernel = np.asarray(kernel)
+    M, L, nfft = _plan(kernel, block_size)
+    automatic = real is None
+    if automatic or real:
+        # a complex kernel needs the complex transform from the start
+        real = not _complex_block(True, automatic, kernel)
+    H = _forward(kernel, nfft, real)
+    frame = np.zeros(nfft, dtype=float if real else complex)
+
+    # M - 1 zeros pushed through after the input emit the convolution
+    # tail, regrouped with it so no block is ever longer than L
+    chunks = [stream] if isinstance(stream, np.ndarray) else stream
+    for block in rechunk(_padded(chunks, M - 1), L):
+        if _complex_block(real, automatic, block):
+            real, H, frame = False, _forward(kernel, nfft, False), frame.astype(complex)
+
+        n = len(block)
+        frame[M - 1 : M - 1 + n] = block
+        frame[M - 1 + n :] = 0
+
+        y = _inverse(_forward(frame, nfft, real) * H, nfft, real)
+        yield y[M - 1 : M - 1 + n]
+
+        # the last M - 1 samples seen become the next history
+        if M > 1:
+            frame[: M - 1] = frame[n : n + M - 1].copy()
+
+
+def stream_correlate(stream, template, block_size=None, real=None):
+    """
+    Matched filter over a stream, i.e. overlap-save correlation against
+    a short template with bounded memory
+    """
+    template = np.asarray(template)
+    return overlap_save(stream, np.conj(template[::-1]), block_size, real)
+
+
+def evaluate():
+    header = "FFT CONVOLUTION AND CORRELATION"
+    print(header)
+    print("-" * len(header))
+
+    rng = np.random.default_rng(225)
+    signals = rng.standard_normal(1000)
+    kernel = np.array([0.25, 0.5, 0.25])
+
+    direct = np.convolve(signals, kernel)
+    error = np.max(np.abs(fft_convolve(signals, kernel) - direct))
+    print("Max error (fft_convolve):", error)
+
+    chunks = np.array_split(signals, 7)
+    streamed = np.concatenate(list(overlap_add(chunks, kernel, block_size=64)))
+    print("Max error (overlap_add):", np.max(np.abs(streamed - direct)))
+
+    streamed = np.concatenate(list(overlap_save(chunks, kernel, block_size=64)))
+    print("Max error (overlap_save):", np.max(np.abs(streamed - direct)))
+
+    # hide a template in noise and find it again
+    template = np.sin(np.linspace(0, 4 * np.pi, 32))
+    signals[600:632] += 5 * template
+    chunks = np.array_split(signals, 7)
+    scores = np.concatenate(list(stream_correlate(chunks, template)))
+    print("Template found at:", int(np.argmax(scores)) - len(template) + 1)
+
+
+if __name__ == "__main__":
+    evaluate()
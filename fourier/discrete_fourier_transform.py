@@ -1,7 +1,10 @@
 import cmath
-import matplotlib.pyplot as plt
 
+from utils.instrumentation import count, instrumented
+from utils.plotting import pyplot, show
 
+
+@instrumented("fourier.dft")
 def dft(x):
     """
     Idea:
@@ -13,6 +16,7 @@ def dft(x):
         - Xk = result of DFT at point k
     """
     N = len(x)
+    count("samples", N)
     X = []
     for k in range(N):
         Xk = 0
@@ -24,13 +28,14 @@ def dft(x):
 
 
 def plot_dft(frequencies, magnitudes):
+    plt = pyplot()
     plt.stem(frequencies, magnitudes, basefmt=" ", label="DFT Magnitude")
     plt.legend()
     plt.title("Discrete Fourier Transforms on Evenly Spaced Intervals")
     plt.xlabel("Frequency Bins (Hz)")
     plt.ylabel("DFT Amplitude |X[freq]|")
     plt.grid(True)
-    plt.show()
+    show()
 
 
 def evaluate():
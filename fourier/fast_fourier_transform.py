@@ -1,9 +1,11 @@
-from cmath import exp, pi
-
-import matplotlib.pyplot as plt
 import numpy as np
 
+from fourier.batched_fft import twiddle_factors
+from utils.instrumentation import instrumented
+from utils.plotting import pyplot, show
+
 
+@instrumented("fourier.fft_recursive")
 def FFT(frequencies) -> np.ndarray:
     N = len(frequencies)
     if N <= 1:
@@ -13,23 +15,27 @@ def FFT(frequencies) -> np.ndarray:
     odd = FFT(frequencies[1::2])
     partial = np.zeros(N).astype(np.complex64)
 
-    # Compute up to half the frequencies
-    for u in range(N // 2):
-        partial[u] = even[u] + exp(-2j * pi * u / N) * odd[u]
-        partial[u + N // 2] = even[u] - exp(-2j * pi * u / N) * odd[u]
+    # Compute up to half the frequencies, twiddles shared with batched_fft
+    half = N // 2
+    t = twiddle_factors(N) * odd[:half]
+    partial[:half] = even[:half] + t
+    partial[half : 2 * half] = even[:half] - t
 
     return partial
 
 
-def compute_and_plot_fft(signals, sampling_rate):
-    N = len(signals)
+def compute_fft(signals, sampling_rate):
+    """
+    FFT of the signals and the frequency of every bin, no plotting
+    """
     fft_result = FFT(signals)
-    freqs = np.fft.fftfreq(N, d=1 / sampling_rate)
+    freqs = np.fft.fftfreq(len(signals), d=1 / sampling_rate)
+    return fft_result, freqs
 
-    print("\nFFT Result:")
-    for idx, entry in enumerate(fft_result):
-        print(f"{idx + 1}: {entry}")
 
+def plot_fft(freqs, fft_result):
+    plt = pyplot()
+    N = len(fft_result)
     magnitude = np.abs(fft_result)
 
     # Plot frequency spectrum
@@ -41,12 +47,23 @@ def compute_and_plot_fft(signals, sampling_rate):
     plt.xlabel("Frequency (Hz)")
     plt.ylabel("Amplitude")
     plt.grid(True)
-    plt.show()
+    show()
+
+
+def compute_and_plot_fft(signals, sampling_rate):
+    fft_result, freqs = compute_fft(signals, sampling_rate)
+
+    print("\nFFT Result:")
+    for idx, entry in enumerate(fft_result):
+        print(f"{idx + 1}: {entry}")
+
+    plot_fft(freqs, fft_result)
 
     return fft_result, freqs
 
 
 def plot_sampled_wave(time, signals):
+    plt = pyplot()
     plt.figure()
     plt.plot(time, signals, "o-", color="blue", label="Sampled Wave")
     plt.legend()
@@ -54,7 +71,7 @@ def plot_sampled_wave(time, signals):
     plt.xlabel("Time (t)")
     plt.ylabel("Sampled Signals")
     plt.grid(True)
-    plt.show()
+    show()
 
 
 def print_header():
@@ -0,0 +1,110 @@
+import numpy as np
+
+from fourier.batched_fft import batched_fft, batched_ifft, twiddle_factors
+from utils.instrumentation import count, instrumented
+
+
+@instrumented("fourier.rfft")
+def rfft(signals, axis=-1) -> np.ndarray:
+    """
+    Idea:
+    The spectrum of a real signal is Hermitian i.e. X[N-k] = conj(X[k]), so
+    only the first N/2 + 1 bins carry information. Instead of transforming
+    N real samples as N complex ones, we pack the even samples into the real
+    part and the odd samples into the imaginary part of a half-length
+    complex signal, run a single N/2 point FFT and untangle the result.
+
+    Formula:
+    - z[n] = x[2n] + i * x[2n+1], Z = FFT(z), M = N/2
+    - E[k] = (Z[k] + conj(Z[M-k])) / 2
+    - O[k] = (Z[k] - conj(Z[M-k])) / 2i
+    - X[k] = E[k] + e^{-2πi * k / N} * O[k], for k = 0..M
+
+    Parameters:
+    - signals: real samples, N must be a power of two
+    - axis: axis along which to transform, every other axis is a batch
+
+    Returns:
+    - the N/2 + 1 non-redundant frequency bins
+    """
+    x = np.moveaxis(np.asarray(signals, dtype=float), axis, -1)
+    N = x.shape[-1]
+    if N < 2 or N & (N - 1):
+        raise ValueError("Number of samples must be a power of two")
+
+    count("samples", x.size)
+    M = N // 2
+    Z = batched_fft(x[..., 0::2] + 1j * x[..., 1::2])
+
+    # Z[M] wraps around to Z[0]
+    Z = np.concatenate((Z, Z[..., :1]), axis=-1)
+    Z_mirror = np.conj(Z[..., ::-1])
+
+    even = 0.5 * (Z + Z_mirror)
+    odd = -0.5j * (Z - Z_mirror)
+    twiddles = np.append(twiddle_factors(N), -1)
+
+    return np.moveaxis(even + twiddles * odd, -1, axis)
+
+
+@instrumented("fourier.irfft")
+def irfft(spectrum, n=None, axis=-1) -> np.ndarray:
+    """
+    Inverse of rfft, rebuilds the N real samples from the N/2 + 1 bins
+    by reversing the packing and running a single N/2 point inverse FFT
+
+    Parameters:
+    - spectrum: the N/2 + 1 bins returned by rfft
+    - n: length of the output signal, defaults to 2 * (len(spectrum) - 1)
+    - axis: axis holding the frequency bins
+
+    Returns:
+    - the real signal
+    """
+    X = np.moveaxis(np.asarray(spectrum, dtype=complex), axis, -1)
+    N = 2 * (X.shape[-1] - 1) if n is None else n
+    if N < 2 or N & (N - 1) or X.shape[-1] != N // 2 + 1:
+        raise ValueError("Spectrum must hold N/2 + 1 bins for a power of two N")
+
+    count("samples", X.size // (N // 2 + 1) * N)
+    M = N // 2
+    X_mirror = np.conj(X[..., ::-1])
+    twiddles = np.conj(np.append(twiddle_factors(N), -1))
+
+    even = (0.5 * (X + X_mirror))[..., :M]
+    odd = (0.5 * (X - X_mirror) * twiddles)[..., :M]
+
+    z = batched_ifft(even + 1j * odd)
+
+    x = np.empty(X.shape[:-1] + (N,))
+    x[..., 0::2] = z.real
+    x[..., 1::2] = z.imag
+    return np.moveaxis(x, -1, axis)
+
+
+def evaluate():
+    sampling_rate = 32  # Hz
+    N = 32
+    sampled_time = np.arange(N) / sampling_rate
+    sampled_signals = 10 * np.sin(2 * np.pi * 5 * sampled_time) + 4 * np.cos(
+        2 * np.pi * 8 * sampled_time
+    )
+
+    header = "REAL-INPUT FAST FOURIER TRANSFORM (RFFT)"
+    print(header)
+    print("-" * len(header))
+
+    spectrum = rfft(sampled_signals)
+    freqs = np.arange(N // 2 + 1) * sampling_rate / N
+    magnitudes = np.abs(spectrum)
+
+    print("Sampling rate:", sampling_rate)
+    print("Frequencies:", freqs.tolist())
+    print("Magnitudes:", np.round(magnitudes, 4).tolist())
+
+    restored = irfft(spectrum)
+    print("Max round trip error:", np.max(np.abs(restored - sampled_signals)))
+
+
+if __name__ == "__main__":
+    evaluate()
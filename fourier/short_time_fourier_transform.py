@@ -0,0 +1,149 @@
+from functools import lru_cache
+
+import numpy as np
+
+from fourier.convolution import rechunk
+from fourier.real_fft import rfft
+from utils.plotting import pyplot, show
+
+
+@lru_cache(maxsize=None)
+def window_function(name, size) -> np.ndarray:
+    """
+    Tapering windows applied to every frame before the transform,
+    computed once per (name, size)
+    """
+    n = np.arange(size)
+    if name == "hann":
+        w = 0.5 - 0.5 * np.cos(2 * np.pi * n / size)
+    elif name == "hamming":
+        w = 0.54 - 0.46 * np.cos(2 * np.pi * n / size)
+    elif name == "rectangular":
+        w = np.ones(size)
+    else:
+        raise ValueError(f"Unknown window: {name}")
+
+    w.flags.writeable = False
+    return w
+
+
+def stft(stream, frame_size=256, hop=None, window="hann"):
+    """
+    Idea:
+    The Short-Time Fourier Transform slides a window of frame_size
+    samples over the signal, advancing hop samples at a time, and takes
+    the FFT of every windowed frame. Input is consumed hop by hop into a
+    single preallocated frame buffer, so memory stays constant no matter
+    how long the stream is.
+
+    Formula:
+    - X[m, k] = sum(x[n + m * hop] * w[n] * e^{-2πi * kn / N}) for n = 0..N-1
+
+    Parameters:
+    - stream: iterable of sample chunks (e.g. sensor reads), or a 1-D array
+    - frame_size: samples per frame N, a power of two
+    - hop: samples between frames, defaults to N/4
+    - window: "hann", "hamming" or "rectangular"
+
+    Yields:
+    - the N/2 + 1 bin spectrum of each frame, a trailing partial hop is
+      zero padded
+    """
+    hop = frame_size // 4 if hop is None else hop
+    if not 0 < hop <= frame_size:
+        raise ValueError("Hop must be between 1 and the frame size")
+
+    w = window_function(window, frame_size)
+    frame = np.zeros(frame_size)
+    windowed = np.empty(frame_size)
+    filled = 0
+
+    for block in rechunk(stream, hop):
+        n = len(block)
+
+        # slide the frame left by one hop, new samples go at the end
+        frame[:-hop] = frame[hop:]
+        frame[-hop:] = 0
+        frame[frame_size - hop : frame_size - hop + n] = block
+        filled += hop
+
+        if filled >= frame_size:
+            np.multiply(frame, w, out=windowed)
+            yield rfft(windowed)
+
+
+def stft_frequencies(frame_size, sampling_rate) -> np.ndarray:
+    return np.arange(frame_size // 2 + 1) * sampling_rate / frame_size
+
+
+def write_spectrogram(stream, path, frame_size=256, hop=None, window="hann"):
+    """
+    Streams magnitude spectra frame by frame to a raw float32 file and
+    returns it as a read-only memory-mapped (frames x bins) array, so
+    spectrograms larger than RAM can be built and inspected
+    """
+    bins = frame_size // 2 + 1
+    frames = 0
+
+    with open(path, "wb") as f:
+        for spectrum in stft(stream, frame_size, hop, window):
+            np.abs(spectrum).astype(np.float32).tofile(f)
+            frames += 1
+
+    if frames == 0:
+        return np.zeros((0, bins), dtype=np.float32)
+
+    return np.memmap(path, dtype=np.float32, mode="r", shape=(frames, bins))
+
+
+def plot_spectrogram(spectrogram, sampling_rate, hop):
+    """
+    Optional plotting, matplotlib is only imported when a plot is asked for
+    """
+    plt = pyplot()
+
+    spectrogram = np.asarray(spectrogram)
+    frames, bins = spectrogram.shape
+    frame_size = 2 * (bins - 1)
+
+    plt.figure()
+    plt.imshow(
+        20 * np.log10(spectrogram.T + 1e-12),
+        origin="lower",
+        aspect="auto",
+        extent=(0, frames * hop / sampling_rate, 0, sampling_rate / 2),
+    )
+    plt.colorbar(label="Magnitude (dB)")
+    plt.title(f"Spectrogram (frame size {frame_size}, hop {hop})")
+    plt.xlabel("Time (s)")
+    plt.ylabel("Frequency (Hz)")
+    show()
+
+
+def evaluate():
+    header = "STREAMING SHORT-TIME FOURIER TRANSFORM (STFT)"
+    print(header)
+    print("-" * len(header))
+
+    sampling_rate = 1024  # Hz
+    frame_size = 256
+    hop = 64
+
+    def sensor(seconds, chunk=100):
+        # a chirp read in small chunks, as a sensor would deliver it
+        for start in range(0, seconds * sampling_rate, chunk):
+            t = np.arange(start, start + chunk) / sampling_rate
+            yield np.sin(2 * np.pi * (50 + 100 * t) * t)
+
+    freqs = stft_frequencies(frame_size, sampling_rate)
+    spectra = stft(sensor(2), frame_size, hop)
+    peaks = [float(freqs[np.argmax(np.abs(X))]) for X in spectra]
+
+    print("Sampling rate:", sampling_rate)
+    print("Frame size:", frame_size, "Hop:", hop)
+    print("Frames:", len(peaks))
+    print("Peak frequency (Hz) every 8th frame:", peaks[::8])
+
+
+if __name__ == "__main__":
+    evaluate()
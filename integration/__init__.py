@@ -0,0 +1,26 @@
+"""
+Numerical integration, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "gaussian_quadrature",
+    "trapezoid_rule",
+]
+
+EXPORTS = {
+    "trapezoidal_rule": "trapezoid_rule",
+    "gauss_legendre": "gaussian_quadrature",
+    "composite_gauss_legendre": "gaussian_quadrature",
+    "clenshaw_curtis": "gaussian_quadrature",
+    "gauss_laguerre": "gaussian_quadrature",
+    "gauss_hermite": "gaussian_quadrature",
+    "legendre_rule": "gaussian_quadrature",
+    "laguerre_rule": "gaussian_quadrature",
+    "hermite_rule": "gaussian_quadrature",
+    "clenshaw_curtis_rule": "gaussian_quadrature",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
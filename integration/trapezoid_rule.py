@@ -1,8 +1,12 @@
 import math
 
-from utils import print_header
+import numpy as np
 
+from utils import Expression, as_function, compile_expression, print_header
+from utils.instrumentation import count, counted, instrumented
 
+
+@instrumented("integration.trapezoidal_rule")
 def trapezoidal_rule(f, a, b, n=100, epsilon=1e-6):
     """
     Approximates the definite integral of function f from a to b
@@ -16,13 +20,23 @@ def trapezoidal_rule(f, a, b, n=100, epsilon=1e-6):
     - n: number of required intervals
 
     Parameters:
-    - f: function of x, anti derivative
+    - f: function of x, anti derivative, or a formula string
     - a: lower limit
     - b: upper limit
     - n: intervals
     - epsilon: tolerance threshold
     """
+    f = as_function(f)
     h = (b - a) / n
+    count("points", n + 1)
+
+    if isinstance(f, Expression):
+        # compiled formulas take every node in one vectorized call
+        count("evaluations", n + 1)
+        y = f(np.linspace(a, b, n + 1))
+        return (y.sum() - 0.5 * (y[0] + y[-1])) * h
+
+    f = counted(f)
     # for equal interval approximations, the endpoints
     # are halved
     summa = 0.5 * (f(a) + f(b))
@@ -37,23 +51,17 @@ def trapezoidal_rule(f, a, b, n=100, epsilon=1e-6):
 
 def evaluate():
     test_cases = [
-        {"fx": lambda x: math.sin(x), "a": 0, "b": math.pi / 2, "desc": "math.sin(x)"},
-        {
-            "fx": lambda x: math.pow(math.e, x),
-            "a": 0,
-            "b": 2,
-            "desc": "math.pow(math.e, x)",
-        },
-        {"fx": lambda x: math.pow(x, 3), "a": 0, "b": 3, "desc": "math.pow(x, 3)"},
+        {"fx": compile_expression("sin(x)"), "a": 0, "b": math.pi / 2},
+        {"fx": compile_expression("e^x"), "a": 0, "b": 2},
+        {"fx": compile_expression("x^3"), "a": 0, "b": 3},
     ]
 
     print("TRAPEZOIDAL RULE FOR NUMERICAL INTEGRATION\n")
     for idx, test in enumerate(test_cases):
         fx = test["fx"]
-        desc = test["desc"]
         a = test["a"]
         b = test["b"]
-        print_header(idx, fx=desc, a=a, b=b)
+        print_header(idx, fx=fx, a=a, b=b)
         result = trapezoidal_rule(fx, a, b)
         print("- solution:", result)
 
@@ -0,0 +1,28 @@
+"""
+Spline and Chebyshev interpolation, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "chebyshev",
+    "cubic_splines",
+    "linear_splines",
+    "quadratic_splines",
+]
+
+EXPORTS = {
+    "lerp": "linear_splines",
+    "plot_lerp": "linear_splines",
+    "qerp": "quadratic_splines",
+    "plot_qerp": "quadratic_splines",
+    "cerp": "cubic_splines",
+    "plot_cerp": "cubic_splines",
+    "ChebyshevProxy": "chebyshev",
+    "chebyshev_proxy": "chebyshev",
+    "chebyshev_points": "chebyshev",
+    "chebyshev_coefficients": "chebyshev",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
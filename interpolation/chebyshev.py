@@ -0,0 +1,306 @@
+import numpy as np
+
+from fourier.real_fft import rfft
+from utils import as_function, compile_expression
+from utils.instrumentation import count, instrumented
+
+# roots are found on pieces of at most this degree, see ChebyshevProxy.roots
+ROOT_DEGREE = 50
+
+# a relative coefficient tail this small that stops decaying is noise
+PLATEAU = 1e-10
+
+# slightly off-center so subdivision rarely splits exactly at a root
+SPLIT = -0.004849834917525
+
+
+def chebyshev_points(n, a=-1.0, b=1.0) -> np.ndarray:
+    """
+    The n + 1 Chebyshev extreme points x_j = cos(πj / n), mapped from
+    [-1, 1] to [a, b] (ordered from b down to a)
+    """
+    t = np.cos(np.pi * np.arange(n + 1) / n)
+    return 0.5 * (a + b) + 0.5 * (b - a) * t
+
+
+def chebyshev_coefficients(values) -> np.ndarray:
+    """
+    Coefficients c_k of the interpolant Σ c_k T_k(t) through values at
+    the n + 1 Chebyshev points, n must be a power of two
+
+    Idea:
+    At t_j = cos(πj / n), T_k(t_j) = cos(πjk / n), so the coefficients
+    are a type-I discrete cosine transform of the values. The DCT is the
+    real FFT of the even extension [f_0 .. f_n, f_{n-1} .. f_1], whose
+    length 2n is again a power of two.
+
+    Formula:
+    - c_k = (2 / n) Σ'' f_j cos(πjk / n), endpoint terms halved
+    - c_0 and c_n are halved once more
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values) - 1
+    extended = np.concatenate((values, values[-2:0:-1]))
+    c = rfft(extended).real / n
+    c[0] /= 2
+    c[n] /= 2
+    return c
+
+
+def _sample(f, x):
+    # vectorized call when f takes arrays, point by point otherwise
+    try:
+        y = np.asarray(f(x), dtype=float)
+    except (TypeError, ValueError):
+        y = np.array([f(xi) for xi in x], dtype=float)
+    count("evaluations", len(x))
+    return np.broadcast_to(y, x.shape)
+
+
+def _chop(c, tol):
+    # trailing coefficients below tol relative to the largest are dropped
+    scale = np.max(np.abs(c))
+    if scale == 0:
+        return c[:1]
+    significant = np.nonzero(np.abs(c) > tol * scale)[0]
+    return c[: significant[-1] + 1]
+
+
+class ChebyshevProxy:
+    """
+    Σ c_k T_k(t) on [a, b], t = (2x - a - b) / (b - a), a polynomial
+    standing in for a smooth function
+
+    Evaluation, derivatives, integrals and roots come from the
+    coefficients alone, so f is never evaluated again. The proxy is a
+    plain callable and can be passed to bisection, newton_raphson (dual
+    numbers go through Clenshaw's recurrence too), trapezoidal_rule or
+    the finite differences in place of f.
+    """
+
+    def __init__(self, coefficients, a=-1.0, b=1.0):
+        if not a < b:
+            raise ValueError("Interval must satisfy a < b")
+        self.coefficients = np.atleast_1d(np.asarray(coefficients, dtype=float))
+        self.a = a
+        self.b = b
+
+    @property
+    def degree(self):
+        return len(self.coefficients) - 1
+
+    def _to_unit(self, x):
+        return (2 * x - self.a - self.b) / (self.b - self.a)
+
+    def __call__(self, x):
+        """
+        Clenshaw's recurrence, O(degree) vectorized steps for any number
+        of points
+
+        Formula:
+        - b_k = c_k + 2t b_{k+1} - b_{k+2}
+        - p(t) = c_0 + t b_1 - b_2
+        """
+        if not isinstance(x, (int, float)) and not hasattr(x, "__array_ufunc__"):
+            x = np.asarray(x, dtype=float)
+        t = self._to_unit(x)
+        c = self.coefficients
+
+        b1, b2 = 0.0, 0.0
+        for ck in c[:0:-1]:
+            b1, b2 = ck + 2 * t * b1 - b2, b1
+        return c[0] + t * b1 - b2
+
+    def derivative(self, order=1):
+        """
+        Proxy of the derivative
+
+        Formula:
+        - c'_{k-1} = c'_{k+1} + 2k c_k, with c'_0 halved
+        - scaled by 2 / (b - a) for the change of variable
+        """
+        c = self.coefficients
+        for _ in range(order):
+            n = len(c) - 1
+            if n == 0:
+                c = np.zeros(1)
+                break
+
+            d = np.zeros(n + 2)
+            for k in range(n, 0, -1):
+                d[k - 1] = d[k + 1] + 2 * k * c[k]
+            d[0] /= 2
+            c = d[:n] * (2 / (self.b - self.a))
+
+        return ChebyshevProxy(c, self.a, self.b)
+
+    def antiderivative(self):
+        """
+        Proxy of the integral from a to x
+
+        Formula:
+        - C_k = (c_{k-1} - c_{k+1}) / 2k for k >= 1, with c_0 doubled
+        - C_0 chosen so the antiderivative vanishes at a
+        """
+        c = np.append(self.coefficients, [0.0, 0.0])
+        c[0] *= 2
+        n = len(self.coefficients)
+
+        C = np.zeros(n + 1)
+        k = np.arange(1, n + 1)
+        C[1:] = (c[k - 1] - c[k + 1]) / (2 * k) * (0.5 * (self.b - self.a))
+
+        F = ChebyshevProxy(C, self.a, self.b)
+        F.coefficients[0] = -F(self.a)
+        return F
+
+    def integral(self, lo=None, hi=None):
+        """
+        Definite integral over [lo, hi], the whole interval by default
+
+        Over [a, b] it is a weighted sum of the even coefficients:
+        - ∫ T_k = 2 / (1 - k^2) on [-1, 1] for even k, 0 for odd k
+        """
+        if lo is None and hi is None:
+            c = self.coefficients
+            k = np.arange(0, len(c), 2)
+            return float(np.sum(c[k] * 2 / (1 - k**2)) * 0.5 * (self.b - self.a))
+
+        lo = self.a if lo is None else lo
+        hi = self.b if hi is None else hi
+        F = self.antiderivative()
+        return float(F(hi) - F(lo))
+
+    def roots(self, tol=1e-8):
+        """
+        Every real root in [a, b], ascending
+
+        Idea:
+        The roots of Σ c_k T_k(t) are the eigenvalues of the colleague
+        matrix, the Chebyshev analogue of the companion matrix. Its
+        eigenvalues cost O(n^3), so proxies of degree above ROOT_DEGREE
+        are first split into two pieces, each fitted from this proxy.
+
+        Formula (n x n, degree n):
+        - C[0, 1] = 1, C[i, i ± 1] = 1/2 otherwise
+        - last row -= c_0..c_{n-1} / (2 c_n)
+        """
+        if self.degree > ROOT_DEGREE:
+            split = 0.5 * (self.a + self.b) + 0.5 * (self.b - self.a) * SPLIT
+            left = chebyshev_proxy(self, self.a, split).roots(tol)
+            right = chebyshev_proxy(self, split, self.b).roots(tol)
+            found = np.concatenate((left, right))
+            # a root on the split point is found by both pieces
+            keep = np.diff(found, prepend=-np.inf) > 1e-12 * (self.b - self.a)
+            return found[keep]
+
+        c = _chop(self.coefficients, 1e-15)
+        n = len(c) - 1
+        if n == 0:
+            return np.array([])
+
+        C = np.zeros((n, n))
+        if n > 1:
+            C[0, 1] = 1
+            i = np.arange(1, n - 1)
+            C[i, i - 1] = C[i, i + 1] = 0.5
+            C[n - 1, n - 2] = 0.5
+        C[n - 1] -= c[:n] / (2 * c[n])
+
+        t = np.linalg.eigvals(C)
+        t = np.sort(t[(np.abs(t.imag) <= tol) & (np.abs(t.real) <= 1 + tol)].real)
+        t = np.clip(t, -1, 1)
+        return 0.5 * (self.a + self.b) + 0.5 * (self.b - self.a) * t
+
+    def __repr__(self):
+        return f"ChebyshevProxy(degree={self.degree}, interval=[{self.a}, {self.b}])"
+
+
+@instrumented("interpolation.chebyshev_proxy")
+def chebyshev_proxy(f, a=-1.0, b=1.0, tol=1e-15, max_degree=1 << 16):
+    """
+    Fits a Chebyshev proxy to a smooth function on [a, b]
+
+    Idea:
+    f is sampled at n + 1 Chebyshev points for n = 16, 32, 64, ... until
+    the tail of the coefficients has decayed to tol relative to the
+    largest one (or to the noise level of f, when rounding in f keeps it
+    above tol), then the negligible coefficients are chopped. The
+    points of n are half of the points of 2n, so every doubling only
+    evaluates f at the n new points.
+
+    Parameters:
+    - f: function or formula string, called with arrays when it can be
+    - a, b: interval
+    - tol: relative size of the coefficients considered negligible
+    - max_degree: give up above this degree (f isn't smooth enough)
+
+    Returns:
+    - ChebyshevProxy
+    """
+    f = as_function(f)
+    if not a < b:
+        raise ValueError("Interval must satisfy a < b")
+
+    n = 16
+    values = _sample(f, chebyshev_points(n, a, b))
+    previous = np.inf
+    while True:
+        c = chebyshev_coefficients(values)
+        scale = np.max(np.abs(c))
+        if scale == 0:
+            return ChebyshevProxy([0.0], a, b)
+
+        tail = np.max(np.abs(c[-max(2, n // 8) :])) / scale
+        if tail <= tol:
+            return ChebyshevProxy(_chop(c, tol), a, b)
+
+        # rounding errors in f put a floor under the coefficients, once
+        # doubling n no longer lowers a small tail it has hit that floor
+        if tail <= PLATEAU and tail > previous / 2:
+            return ChebyshevProxy(_chop(c, 2 * tail), a, b)
+        previous = tail
+
+        if 2 * n > max_degree:
+            raise Exception("Chebyshev coefficients did not converge")
+
+        # the odd points of the doubled grid are the new ones
+        refined = np.empty(2 * n + 1)
+        refined[0::2] = values
+        refined[1::2] = _sample(f, chebyshev_points(2 * n, a, b)[1::2])
+        values, n = refined, 2 * n
+
+
+def evaluate():
+    from integration.trapezoid_rule import trapezoidal_rule
+    from root_finding.bisection import bisection
+
+    header = "CHEBYSHEV PROXY FUNCTIONS"
+    print(header)
+    print("-" * len(header))
+
+    f = compile_expression("sin(3*x) * e^(-x/4) + x/10")
+    a, b = 0, 10
+    p = chebyshev_proxy(f, a, b)
+
+    x = np.linspace(a, b, 1001)
+    print(f"f(x) = {f.text} on [{a}, {b}]")
+    print(f"- degree: {p.degree}")
+    print(f"- max |p - f| on 1001 points: {np.max(np.abs(p(x) - f(x))):.3e}")
+
+    df = compile_expression("3*cos(3*x) * e^(-x/4) - sin(3*x) * e^(-x/4) / 4 + 1/10")
+    print(f"- max |p' - f'|: {np.max(np.abs(p.derivative()(x) - df(x))):.3e}")
+
+    print(f"- integral over [{a}, {b}]: {p.integral():.12f}")
+    print(f"- trapezoidal rule (n = 10^5): {trapezoidal_rule(f, a, b, 100000):.12f}")
+
+    roots = p.roots()
+    print(f"- {len(roots)} roots:", np.round(roots, 10).tolist())
+    print(f"- max |f(root)|: {np.max(np.abs(f(roots))):.3e}")
+
+    first = bisection(f, 0.5, 1.5, 1e-12)
+    print(f"- bisection on [0.5, 1.5]: {first:.10f}")
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -1,13 +1,25 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from linear_algebra.banded import thomas
+from utils.cache import cached
+from utils.instrumentation import count, instrumented
+from utils.plotting import pyplot, show
 
+
+@instrumented("interpolation.cerp")
 def cerp(x, y, X):
+    count("knots", len(x))
+    count("queries", len(X))
+
     x_points = np.array(x)
     y_points = np.array(y)
     n = len(x)
 
-    y2 = find_second_derivative(x_points, y_points, n)
+    y2 = cached(
+        "cerp",
+        (x_points.astype(float), y_points.astype(float)),
+        lambda: {"y2": find_second_derivative(x_points, y_points, n)},
+    )["y2"]
 
     X_dense = np.array(X)
     Y_dense = np.zeros_like(X_dense)
@@ -44,26 +56,7 @@ def find_second_derivative(x, y, n):
         d[i] = 6 * ((y[i + 1] - y[i]) / h_i1 - (y[i] - y[i - 1]) / h_i)
 
     # Solve tri-diagonal system using Thomas algorithm
-    return thomas_alg(a, b, c, d)
-
-
-def thomas_alg(a, b, c, d):
-    n = len(d)
-
-    # Forward elimination
-    for i in range(1, n):
-        factor = a[i] / b[i - 1]
-        b[i] -= factor * c[i - 1]
-        d[i] -= factor * d[i - 1]
-
-    # Back substitution
-    x = np.zeros(n)
-    x[n - 1] = d[n - 1] / b[n - 1]
-
-    for i in range(n - 2, -1, -1):
-        x[i] = (d[i] - c[i] * x[i + 1]) / b[i]
-
-    return x
+    return thomas(a, b, c, d)
 
 
 def find_interval(xi, x):
@@ -83,13 +76,14 @@ def find_interval(xi, x):
 
 
 def plot_cerp(x, y, X, Y):
+    plt = pyplot()
     plt.figure(figsize=(10, 6))
     plt.plot(x, y, "o", label="Data Points", color="black")
     plt.plot(X, Y, "-", label="Cubic Spline", color="blue")
     plt.legend()
     plt.grid(True)
     plt.title("Cubic Spline Interpolation")
-    plt.show()
+    show()
 
 
 def evaluate():
@@ -1,6 +1,8 @@
-import matplotlib.pyplot as plt
+from utils.instrumentation import count, instrumented
+from utils.plotting import pyplot, show
 
 
+@instrumented("interpolation.lerp")
 def lerp(x, y, X):
     """
     Linear interpolation is a curve-fitting method of approximating paths
@@ -25,6 +27,8 @@ def lerp(x, y, X):
     Formula:
     - y = y0 + (y1 - y0) * (x - x0) / (x1 - x0)
     """
+    count("knots", len(x))
+    count("queries", len(X))
 
     Y = []
     for xi in X:
@@ -43,6 +47,7 @@ def lerp(x, y, X):
 
 
 def plot_lerp(x_points, y_points, X_dense, Y_dense):
+    plt = pyplot()
     plt.plot(x_points, y_points, "o", label="Data Points", color="black")
     plt.plot(X_dense, Y_dense, "-", label="Linear Spline", color="red")
     plt.legend()
@@ -50,7 +55,7 @@ def plot_lerp(x_points, y_points, X_dense, Y_dense):
     plt.xlabel("x")
     plt.ylabel("y")
     plt.grid(True)
-    plt.show()
+    show()
 
 
 def evaluate():
@@ -1,6 +1,11 @@
-import matplotlib.pyplot as plt
+import numpy as np
 
+from linear_algebra.sparse import CSRMatrix, spsolve
+from utils.instrumentation import count, instrumented
+from utils.plotting import pyplot, show
 
+
+@instrumented("interpolation.qerp")
 def qerp(x, y, X):
     """
     Quadratic spline interpolation is a method of constructing
@@ -29,55 +34,53 @@ def qerp(x, y, X):
         - Boundary condition: a0 = 0
         - Interpolation constraint: ci = yi and aihi^2 + bihi + ci = yi+1
         - Continuity constraint: 2aihi + bi = bi+1
-    - Solve Ax = b using Gaussian elimination
+    - Solve the sparse, banded system Ax = b using Gaussian elimination
     - Extract coefficients (ai, bi, ci) for each spline
     - Find which interval [xi, xi+1] contains x (assume ascending order)
     - Compute Si(x) = ai(x-xi)^2 + bi(x-xi) + ci
     """
+    count("knots", len(x))
+    count("queries", len(X))
     n = len(x)
     n_splines = n - 1
     size = 3 * n_splines
 
-    # System: Ax = b
-    A = [[0.0] * size for _ in range(size)]
-    b = [0.0] * size
-    row = 0
-
-    A[row][0] = 1.0
-    b[row] = 0.0
-    row += 1
+    # System: Ax = b, stored as (row, col, value) triplets since
+    # each row holds at most three nonzeros. The equations of spline i
+    # are kept together so the matrix stays banded.
+    rows, cols, values = [0], [0], [1.0]
+    b = np.zeros(size)
+    b[0] = 0.0
 
-    # Interpolation for ci = yi
     for i in range(n_splines):
-        A[row][3*i + 2] = 1.0
+        h = x[i+1] - x[i]
+        row = 3*i + 1
+
+        # Interpolation for ci = yi
+        rows.append(row)
+        cols.append(3*i + 2)
+        values.append(1.0)
         b[row] = y[i]
-        row += 1
 
-    # Interpolation for aihi^2 + bihi + ci = yi+1
-    # where h = x - xi
-    for i in range(n_splines):
-        h = x[i+1] - x[i]
+        # Interpolation for aihi^2 + bihi + ci = yi+1
+        # where h = x - xi
         # ai -> bi -> ci
-        A[row][3*i] = h*h
-        A[row][3*i + 1] = h
-        A[row][3*i + 2] = 1.0
-        b[row] = y[i+1]
-        # should move to next row
-        row += 1
-
-    # Continuity for 2aihi + bi = bi+1
-    for i in range(n_splines - 1):
-        h = x[i+1] - x[i]
-        # 2aihi -> bi -> -bi+1
-        A[row][3*i] = 2*h
-        A[row][3*i + 1] = 1.0
-        A[row][3*(i+1) + 1] = -1.0
-        b[row] = 0.0
-        # again, next row
-        row += 1
-
-    # Gaussian elimination for system Ax = b
-    coeffs = gauss_solve(A, b)
+        rows += [row + 1] * 3
+        cols += [3*i, 3*i + 1, 3*i + 2]
+        values += [h*h, h, 1.0]
+        b[row + 1] = y[i+1]
+
+        # Continuity for 2aihi + bi = bi+1
+        if i < n_splines - 1:
+            # 2aihi -> bi -> -bi+1
+            rows += [row + 2] * 3
+            cols += [3*i, 3*i + 1, 3*(i+1) + 1]
+            values += [2*h, 1.0, -1.0]
+            b[row + 2] = 0.0
+
+    # Sparse (banded) elimination for system Ax = b
+    A = CSRMatrix.from_coo(rows, cols, values, (size, size))
+    coeffs = spsolve(A, b).tolist()
     spline_coeffs = [(coeffs[3*i], coeffs[3*i + 1], coeffs[3*i + 2])
                      for i in range(n_splines)]
 
@@ -100,46 +103,8 @@ def qerp(x, y, X):
     return Y
 
 
-def gauss_solve(A, b):
-    """
-    Solve a system of linear equations using Gaussian Elimination
-    Algorithm:
-    - forward elimination
-    - backward substitution
-    """
-    n = len(A)
-
-    # Forward elimination
-    for i in range(n):
-        # pivot is the max row
-        max_row = i
-        for k in range(i+1, n):
-            if abs(A[k][i]) > abs(A[max_row][i]):
-                max_row = k
-
-        A[i], A[max_row] = A[max_row], A[i]
-        b[i], b[max_row] = b[max_row], b[i]
-
-        # zero all rows below current col
-        for k in range(i+1, n):
-            if A[i][i] != 0:
-                factor = A[k][i] / A[i][i]
-                for j in range(i, n):
-                    A[k][j] -= factor * A[i][j]
-                b[k] -= factor * b[i]
-
-    # Backward substitution
-    x = [0.0] * n
-    for i in range(n-1, -1, -1):
-        x[i] = b[i]
-        for j in range(i+1, n):
-            x[i] -= A[i][j] * x[j]
-        x[i] /= A[i][i]
-
-    return x
-
-
 def plot_qerp(x_points, y_points, X_dense, Y_dense):
+    plt = pyplot()
     plt.plot(x_points, y_points, "o", label="Data Points", color="Black")
     plt.plot(X_dense, Y_dense, "-", label="Quadratic Spline", color="Green")
     plt.legend()
@@ -147,7 +112,7 @@ def plot_qerp(x_points, y_points, X_dense, Y_dense):
     plt.xlabel("x")
     plt.ylabel("y")
     plt.grid(True)
-    plt.show()
+    show()
 
 
 def evaluate():
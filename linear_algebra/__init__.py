@@ -0,0 +1,50 @@
+"""
+Linear algebra, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "banded",
+    "cholesky_decomposition",
+    "eigenvalues",
+    "iterative_methods",
+    "lu_decomposition",
+    "qr_decomposition",
+    "sparse",
+    "system_io",
+]
+
+EXPORTS = {
+    "blocked_lu": "blocked_lu",
+    "LU": "lu_decomposition",
+    "LUFactorization": "lu_decomposition",
+    "lu_factor": "lu_decomposition",
+    "solve": "lu_decomposition",
+    "banded_lu": "banded",
+    "thomas": "banded",
+    "cyclic_thomas": "banded",
+    "CholeskyFactorization": "cholesky_decomposition",
+    "cholesky": "cholesky_decomposition",
+    "QRFactorization": "qr_decomposition",
+    "householder_qr": "qr_decomposition",
+    "lstsq": "qr_decomposition",
+    "jacobi": "iterative_methods",
+    "sor": "iterative_methods",
+    "gauss_seidel": "iterative_methods",
+    "conjugate_gradient": "iterative_methods",
+    "CSRMatrix": "sparse",
+    "spsolve": "sparse",
+    "poisson_matrix": "sparse",
+    "power_iteration": "eigenvalues",
+    "inverse_iteration": "eigenvalues",
+    "lanczos": "eigenvalues",
+    "arnoldi": "eigenvalues",
+    "load_npy": "system_io",
+    "load_csv": "system_io",
+    "load_matrix_market": "system_io",
+    "load_system": "system_io",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
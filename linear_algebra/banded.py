@@ -0,0 +1,261 @@
+import numpy as np
+
+from utils.instrumentation import count, instrumented
+
+
+def to_banded(A, kl, ku) -> np.ndarray:
+    """
+    Packs a dense matrix with kl sub-diagonals and ku super-diagonals
+    into row-oriented band storage: W[i, j - i + kl] = A[i][j]. Each row
+    holds 2kl + ku + 1 slots, the extra kl slots on the right take the
+    fill-in produced by row swaps during pivoting.
+    """
+    A = np.asarray(A, dtype=float)
+    N = len(A)
+    W = np.zeros((N, 2 * kl + ku + 1))
+
+    for offset in range(-kl, ku + 1):
+        diagonal = np.diagonal(A, offset)
+        rows = np.arange(len(diagonal)) + max(-offset, 0)
+        W[rows, offset + kl] = diagonal
+
+    return W
+
+
+class BandedLUFactorization:
+    """
+    Banded LU factors with partial pivoting, kept in band storage. The
+    row swaps are recorded in order (pivots[k] is the row swapped with
+    row k at step k), the same convention as LAPACK's gbtrf.
+    """
+
+    def __init__(self, bands, pivots, kl, ku):
+        self.bands = bands
+        self.pivots = pivots
+        self.kl = kl
+        self.ku = ku
+
+    def solve(self, B):
+        """
+        Solves AX = B for a vector or an (N x k) matrix of right-hand
+        sides in O(N * (2kl + ku)) per column
+        """
+        W, kl, ku = self.bands, self.kl, self.ku
+        N = len(W)
+        x = np.array(B, dtype=float)
+
+        # Ly = Pb, swaps and eliminations applied in the order they happened
+        for k in range(N - 1):
+            p = self.pivots[k]
+            if p != k:
+                x[[k, p]] = x[[p, k]]
+
+            end = min(k + kl + 1, N)
+            below = np.arange(1, end - k)
+            multipliers = W[k + below, kl - below]
+            x[k + 1 : end] -= np.multiply.outer(multipliers, x[k])
+
+        # Ux = y, U has kl + ku super-diagonals after pivoting
+        for k in range(N - 1, -1, -1):
+            end = min(k + kl + ku + 1, N)
+            x[k] -= W[k, kl + 1 : kl + end - k] @ x[k + 1 : end]
+            x[k] /= W[k][kl]
+
+        return x
+
+
+@instrumented("linear_algebra.banded_lu")
+def banded_lu(A, kl, ku):
+    """
+    LU Decomposition with partial pivoting for banded matrices
+
+    Idea:
+    Only the kl + 1 rows below (and including) the pivot can hold
+    nonzeros in the pivot column, and only kl + ku + 1 columns can be
+    touched, so each elimination step is a rank-1 update of a small
+    (kl + 1) x (kl + ku + 1) block. Cost is O(N * kl * (kl + ku))
+    instead of O(N^3), memory O(N * (2kl + ku)) instead of O(N^2).
+
+    Parameters:
+    - A: dense square matrix, or any matrix with a to_banded(kl, ku)
+      method (e.g. CSRMatrix)
+    - kl: number of sub-diagonals
+    - ku: number of super-diagonals
+
+    Returns:
+    - BandedLUFactorization
+    """
+    if hasattr(A, "to_banded"):
+        W = A.to_banded(kl, ku)
+    else:
+        W = to_banded(A, kl, ku)
+
+    N = len(W)
+    pivots = np.arange(N)
+
+    for k in range(N):
+        rows = np.arange(k, min(k + kl, N - 1) + 1)
+        cols = np.arange(k, min(k + kl + ku, N - 1) + 1)
+        slots = cols[None, :] - rows[:, None] + kl
+        block = W[rows[:, None], slots]
+
+        p = np.argmax(np.abs(block[:, 0]))
+        if block[p][0] == 0:
+            raise Exception("Matrix is singular")
+
+        if p != 0:
+            block[[0, p]] = block[[p, 0]]
+            pivots[k] = k + p
+
+        block[1:, 0] /= block[0][0]
+        block[1:, 1:] -= np.outer(block[1:, 0], block[0, 1:])
+        W[rows[:, None], slots] = block
+
+    count("pivots", int(np.count_nonzero(pivots != np.arange(N))))
+    return BandedLUFactorization(W, pivots, kl, ku)
+
+
+def _broadcast(*arrays):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in arrays))
+
+
+@instrumented("linear_algebra.thomas")
+def thomas(a, b, c, d) -> np.ndarray:
+    """
+    Thomas Algorithm for tridiagonal systems, batched
+
+    Idea:
+    Gaussian elimination specialised to a tridiagonal matrix: one sweep
+    down eliminates the sub-diagonal, one sweep up back substitutes.
+    Any leading axes are treated as a batch of independent systems, so
+    each of the 2N steps updates the whole batch in one array operation.
+    The inputs are not modified.
+
+    Formula:
+    - a[i] x[i-1] + b[i] x[i] + c[i] x[i+1] = d[i]
+    - c'[i] = c[i] / (b[i] - a[i] c'[i-1])
+    - d'[i] = (d[i] - a[i] d'[i-1]) / (b[i] - a[i] c'[i-1])
+    - x[i] = d'[i] - c'[i] x[i+1]
+
+    Parameters:
+    - a: sub-diagonal (a[..., 0] is unused)
+    - b: diagonal
+    - c: super-diagonal (c[..., -1] is unused)
+    - d: right-hand side, shape (..., N)
+
+    Returns:
+    - x with the broadcast shape of the inputs
+    """
+    # put the system axis first so every step works on a contiguous batch
+    a, b, c, d = (
+        np.ascontiguousarray(np.moveaxis(v, -1, 0)) for v in _broadcast(a, b, c, d)
+    )
+    N = len(d)
+
+    c_prime = np.empty_like(d)
+    d_prime = np.empty_like(d)
+    c_prime[0] = c[0] / b[0]
+    d_prime[0] = d[0] / b[0]
+
+    # Forward elimination
+    for i in range(1, N):
+        m = b[i] - a[i] * c_prime[i - 1]
+        c_prime[i] = c[i] / m
+        d_prime[i] = (d[i] - a[i] * d_prime[i - 1]) / m
+
+    # Back substitution
+    x = d_prime
+    for i in range(N - 2, -1, -1):
+        x[i] -= c_prime[i] * x[i + 1]
+
+    return np.moveaxis(x, 0, -1)
+
+
+@instrumented("linear_algebra.cyclic_thomas")
+def cyclic_thomas(a, b, c, d) -> np.ndarray:
+    """
+    Cyclic (periodic) tridiagonal systems, batched
+
+    The corners couple the first and last unknowns: a[0] multiplies
+    x[N-1] and c[N-1] multiplies x[0]. The corner terms form a rank-1
+    correction, so the Sherman-Morrison formula reduces the problem to
+    two ordinary Thomas solves.
+
+    Formula:
+    - A = T + u v^T, with u = (γ, 0, ..., 0, c[N-1]), v = (1, 0, ..., 0, a[0]/γ)
+    - γ = -b[0], or minus the size of the first row when b[0] = 0
+    - x = y - (v·y / (1 + v·z)) z, where Ty = d and Tz = u
+    """
+    a, b, c, d = _broadcast(a, b, c, d)
+    if d.shape[-1] < 3:
+        raise ValueError("Cyclic systems need at least 3 unknowns")
+
+    # γ = -b[0] doubles the first pivot, any γ with b[0] - γ != 0 will
+    # do, so a zero b[0] takes the size of the rest of its row instead
+    row = np.abs(a[..., 0]) + np.abs(c[..., 0])
+    gamma = np.where(b[..., 0] != 0, -b[..., 0], -np.where(row != 0, row, 1.0))
+    corner_low, corner_high = a[..., 0], c[..., -1]
+
+    T_diagonal = b.copy()
+    T_diagonal[..., 0] -= gamma
+    T_diagonal[..., -1] -= corner_low * corner_high / gamma
+
+    u = np.zeros_like(d)
+    u[..., 0] = gamma
+    u[..., -1] = corner_high
+
+    # both solves share one batched call
+    y, z = thomas(a, T_diagonal, c, np.stack((d, u)))
+
+    factor = (y[..., 0] + corner_low * y[..., -1] / gamma) / (
+        1 + z[..., 0] + corner_low * z[..., -1] / gamma
+    )
+    return y - factor[..., None] * z
+
+
+def print_header():
+    header = "BANDED LINEAR SYSTEMS"
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+
+def evaluate():
+    rng = np.random.default_rng(225)
+    N, kl, ku = 10, 2, 1
+
+    A = np.zeros((N, N))
+    for offset in range(-kl, ku + 1):
+        A += np.diag(rng.uniform(-1, 1, N - abs(offset)), offset)
+    b = rng.standard_normal(N)
+
+    print_header()
+    print(f"{'N:':<8} {N}")
+    print(f"{'kl, ku:':<8} {kl}, {ku}")
+
+    x = banded_lu(A, kl, ku).solve(b)
+    print(f"{'x:':<8} {np.round(x, 6).tolist()}")
+    print(f"{'|Ax-b|:':<8} {np.linalg.norm(A @ x - b):.2e}")
+
+    # a batch of independent, diagonally dominant tridiagonal systems
+    systems = 10000
+    a = rng.uniform(-1, 1, (systems, N))
+    c = rng.uniform(-1, 1, (systems, N))
+    b = 4 + rng.uniform(0, 1, (systems, N))
+    d = rng.standard_normal((systems, N))
+
+    x = thomas(a, b, c, d)
+    residual = b * x - d
+    residual[:, 1:] += a[:, 1:] * x[:, :-1]
+    residual[:, :-1] += c[:, :-1] * x[:, 1:]
+    print(f"\nBatched Thomas ({systems} systems)")
+    print(f"{'max residual:':<14} {np.abs(residual).max():.2e}")
+
+    x = cyclic_thomas(a, b, c, d)
+    residual = b * x - d + a * np.roll(x, 1, axis=1) + c * np.roll(x, -1, axis=1)
+    print(f"\nCyclic Thomas ({systems} systems)")
+    print(f"{'max residual:':<14} {np.abs(residual).max():.2e}")
+
+
+if __name__ == "__main__":
+    evaluate()
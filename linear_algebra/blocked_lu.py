@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+
+from linear_algebra.lu_decomposition import LUFactorization, lu_factor
+from utils.instrumentation import count, instrumented
+
+
+@instrumented("linear_algebra.blocked_lu")
+def blocked_lu(A, block_size=64, overwrite=False):
+    """
+    Right-looking blocked LU Decomposition with partial pivoting
+
+    Idea:
+    The unblocked algorithm touches the whole trailing matrix once per
+    pivot. Here the columns are processed in panels of block_size: the
+    panel is factorized column by column (pivot rows are swapped across
+    the full width), then the trailing matrix is updated once per panel
+    with a matrix-matrix product, which BLAS runs cache-blocked and
+    multi-threaded.
+
+    Formula (panel k:e):
+    - P [A11 A12; A21 A22] = [L11 0; L21 I] [U11 U12; 0 S]
+    - U12 = L11^-1 A12
+    - S = A22 - L21 U12
+
+    Parameters:
+    - A: square matrix
+    - block_size: panel width, tune to the cache size
+    - overwrite: factorize in place when A is already a float array,
+      this avoids holding a second N x N copy in memory
+
+    Returns:
+    - LUFactorization, same object as lu_factor returns
+    """
+    A = np.asarray(A, dtype=float)
+    if not overwrite:
+        A = A.copy()
+
+    N = len(A)
+    if A.shape != (N, N):
+        raise Exception("Matrix must be square")
+    if block_size < 1:
+        raise ValueError("Block size must be positive")
+
+    perm = np.arange(N)
+    swaps = 0
+    for k in range(0, N, block_size):
+        e = min(k + block_size, N)
+
+        # Panel factorization, rank-1 updates restricted to the panel
+        for j in range(k, e):
+            p = j + np.argmax(np.abs(A[j:, j]))
+            if A[p][j] == 0:
+                raise Exception("Matrix is singular")
+
+            if p != j:
+                A[[j, p]] = A[[p, j]]
+                perm[[j, p]] = perm[[p, j]]
+                swaps += 1
+
+            A[j + 1 :, j] /= A[j][j]
+            A[j + 1 :, j + 1 : e] -= np.outer(A[j + 1 :, j], A[j, j + 1 : e])
+
+        if e == N:
+            break
+
+        # U12 = L11^-1 A12, in place (L11 has a unit diagonal)
+        for i in range(k + 1, e):
+            A[i, e:] -= A[i, k:i] @ A[k:i, e:]
+
+        # S = A22 - L21 U12, a few rows at a time to bound the temporaries
+        step = 4 * block_size
+        for r in range(e, N, step):
+            A[r : r + step, e:] -= A[r : r + step, k:e] @ A[k:e, e:]
+
+    count("pivots", swaps)
+    return LUFactorization(A, perm)
+
+
+def evaluate():
+    header = "BLOCKED LU DECOMPOSITION"
+    print(header)
+    print("-" * len(header))
+
+    rng = np.random.default_rng(225)
+    N = 600
+    A = rng.standard_normal((N, N))
+    b = rng.standard_normal(N)
+
+    start = time.perf_counter()
+    unblocked = lu_factor(A)
+    unblocked_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blocked = blocked_lu(A, block_size=64)
+    blocked_time = time.perf_counter() - start
+
+    print("N:", N)
+    print(f"{'unblocked:':<12} {unblocked_time:.4f}s")
+    print(f"{'blocked:':<12} {blocked_time:.4f}s")
+    print("Max difference in factors:", np.max(np.abs(blocked.lu - unblocked.lu)))
+    print("Residual |Ax - b|:", np.linalg.norm(A @ blocked.solve(b) - b))
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -0,0 +1,424 @@
+import warnings
+
+import numpy as np
+
+from linear_algebra.banded import banded_lu
+from linear_algebra.iterative_methods import as_matvec
+from linear_algebra.lu_decomposition import LUFactorization, lu_factor
+from linear_algebra.sparse import CSRMatrix
+from utils.instrumentation import count, instrumented
+
+
+def _starting_vector(A, x0, n):
+    if x0 is not None:
+        x = np.array(x0, dtype=float)
+    else:
+        if n is None:
+            if not hasattr(A, "shape"):
+                raise ValueError("The dimension n is required when A is a callable")
+            n = A.shape[0]
+        x = np.random.default_rng(225).standard_normal(n)
+
+    return x / np.linalg.norm(x)
+
+
+@instrumented("linear_algebra.power_iteration")
+def power_iteration(A, x0=None, tol=1e-10, max_iter=1000, n=None):
+    """
+    Power Iteration for the dominant eigenpair
+
+    Idea:
+    Repeatedly applying A amplifies the component along the eigenvector
+    of largest |λ| by |λ1/λ2| per step. One matvec per iteration, so it
+    works for sparse matrices and matvec-only operators alike.
+
+    Formula:
+    - x_{k+1} = Ax_k / |Ax_k|
+    - λ ~ x_k · Ax_k (Rayleigh quotient)
+
+    Parameters:
+    - A: matrix, CSRMatrix or matvec callable
+    - x0: starting vector, random if omitted
+    - tol: stop once |Ax - λx| <= tol * |λ|
+    - max_iter: iteration limit
+    - n: dimension, only needed for callables without x0
+
+    Returns:
+    - eigenvalue, eigenvector, and the residual history
+    """
+    if max_iter < 1:
+        raise ValueError("At least one iteration is needed")
+
+    matvec = as_matvec(A)
+    x = _starting_vector(A, x0, n)
+    residuals = []
+
+    for _ in range(max_iter):
+        y = matvec(x)
+        eigenvalue = x @ y
+        residuals.append(np.linalg.norm(y - eigenvalue * x))
+        if residuals[-1] <= tol * abs(eigenvalue):
+            break
+
+        norm = np.linalg.norm(y)
+        if norm == 0:
+            break
+        x = y / norm
+
+    count("iterations", len(residuals))
+    return eigenvalue, x, residuals
+
+
+@instrumented("linear_algebra.inverse_iteration")
+def inverse_iteration(
+    A, shift=0.0, x0=None, tol=1e-10, max_iter=100, factors=None
+):
+    """
+    Shifted Inverse Iteration for the eigenpair closest to a shift σ
+
+    Idea:
+    Power iteration on (A - σI)^-1, whose dominant eigenvalue 1/(λ - σ)
+    belongs to the eigenvalue λ nearest σ. A - σI is factorized once
+    and every iteration is only a pair of triangular solves.
+
+    Parameters:
+    - A: square matrix
+    - shift: σ, a guess of the wanted eigenvalue
+    - x0: starting vector, random if omitted
+    - tol: stop once |Ax - λx| <= tol * max(|λ|, 1)
+    - max_iter: iteration limit
+    - factors: an existing LUFactorization of A - σI to reuse
+
+    Returns:
+    - eigenvalue, eigenvector, and the residual history
+    """
+    if max_iter < 1:
+        raise ValueError("At least one iteration is needed")
+
+    A = np.asarray(A, dtype=float)
+    if factors is None:
+        factors = lu_factor(A - shift * np.eye(len(A)))
+    elif not isinstance(factors, LUFactorization):
+        raise ValueError("factors must be an LUFactorization of A - shift * I")
+
+    x = _starting_vector(A, x0, None)
+    residuals = []
+
+    for _ in range(max_iter):
+        y = factors.solve(x)
+        x = y / np.linalg.norm(y)
+
+        Ax = A @ x
+        eigenvalue = x @ Ax
+        residuals.append(np.linalg.norm(Ax - eigenvalue * x))
+        if residuals[-1] <= tol * max(abs(eigenvalue), 1):
+            break
+
+    count("iterations", len(residuals))
+    return eigenvalue, x, residuals
+
+
+def _select(values, k, which):
+    # real spectra are ordered algebraically, complex ones by magnitude
+    key = values if np.isrealobj(values) else np.abs(values)
+    if which == "largest":
+        order = np.argsort(-key)
+    elif which == "smallest":
+        order = np.argsort(key)
+    else:
+        raise ValueError("which must be 'largest' or 'smallest'")
+    return order[:k]
+
+
+def _breakdown(H, j):
+    # w vanished up to rounding: the basis spans an invariant subspace
+    return H[j + 1, j] <= 1e-12 * np.linalg.norm(H[: j + 2, j])
+
+
+def _check_breakdown(H, j, k):
+    # the Krylov space became invariant before holding k vectors, A (as
+    # seen from this start vector) has fewer than k distinct eigenvalues
+    m = j + 1
+    if m < k and _breakdown(H, j):
+        raise Exception(
+            f"Krylov subspace breakdown after {m} vectors, fewer than k = {k} "
+            "eigenvalues are reachable from this starting vector"
+        )
+
+
+def _warn_unconverged(method, max_restarts):
+    warnings.warn(
+        f"{method} did not converge within {max_restarts} restarts, "
+        "the returned Ritz pairs are approximate",
+        RuntimeWarning,
+        stacklevel=4,
+    )
+
+
+@instrumented("linear_algebra.lanczos")
+def lanczos(
+    A,
+    k=3,
+    which="largest",
+    x0=None,
+    tol=1e-10,
+    subspace=None,
+    max_restarts=100,
+    n=None,
+):
+    """
+    Thick-Restart Lanczos Method for a few extreme eigenpairs of a
+    symmetric operator
+
+    Idea:
+    The Krylov subspace span{x, Ax, A^2x, ...} quickly captures the
+    extreme eigenvectors. For symmetric A the projection onto an
+    orthonormal Krylov basis Q is (nearly) tridiagonal, so after m
+    matvecs only a small m x m eigenproblem is solved. When the basis
+    is full, the best Ritz vectors are kept and the rest discarded
+    (thick restart), so memory stays at n x subspace. The basis is fully
+    reorthogonalized to keep it numerically orthogonal.
+
+    Formula:
+    - AQ_m = Q_m T_m + β_m q_{m+1} e_m^T
+    - Ritz pair (θ, Q_m s) has residual |β_m s_m|
+
+    Parameters:
+    - A: symmetric matrix, CSRMatrix or matvec callable
+    - k: number of eigenpairs
+    - which: "largest" or "smallest" (algebraically)
+    - x0: starting vector, random if omitted
+    - tol: stop once every wanted Ritz residual <= tol * |θ|
+    - subspace: basis size before restarting, defaults to max(2k + 1, 20)
+    - max_restarts: restart limit
+    - n: dimension, only needed for callables without x0
+
+    Returns:
+    - k eigenvalues, the (n x k) eigenvectors, and the number of matvecs
+    """
+    matvec = as_matvec(A)
+    q = _starting_vector(A, x0, n)
+    n = len(q)
+    m_max = min(n, max(2 * k + 1, 20) if subspace is None else subspace)
+    if not k <= m_max:
+        raise ValueError("Subspace must hold at least k vectors")
+
+    Q = np.zeros((n, m_max + 1))
+    H = np.zeros((m_max + 1, m_max))
+    Q[:, 0] = q
+    start = 0
+    matvecs = 0
+
+    for restart in range(max_restarts + 1):
+        for j in range(start, m_max):
+            w = matvec(Q[:, j])
+            matvecs += 1
+
+            # orthogonalize against the whole basis (twice is enough)
+            for _ in range(2):
+                h = Q[:, : j + 1].T @ w
+                w -= Q[:, : j + 1] @ h
+                H[: j + 1, j] += h
+            H[j + 1, j] = np.linalg.norm(w)
+
+            if _breakdown(H, j):
+                H[j + 1, j] = 0
+                break
+            Q[:, j + 1] = w / H[j + 1, j]
+
+        _check_breakdown(H, j, k)
+        m = j + 1
+        theta, S = np.linalg.eigh(H[:m, :m])
+        wanted = _select(theta, k, which)
+
+        beta = H[m, m - 1]
+        ritz_residuals = np.abs(beta * S[-1, wanted])
+        scale = np.maximum(np.abs(theta[wanted]), 1e-300)
+        converged = np.all(ritz_residuals <= tol * scale) or m == n
+        if converged or restart == max_restarts:
+            break
+
+        # thick restart: keep the best p Ritz vectors plus the residual direction
+        p = min(k + (m - k) // 2, m - 1)
+        keep = _select(theta, p, which)
+        Q[:, :p] = Q[:, :m] @ S[:, keep]
+        Q[:, p] = Q[:, m]
+
+        H[:] = 0
+        H[np.arange(p), np.arange(p)] = theta[keep]
+        H[p, :p] = beta * S[-1, keep]
+        start = p
+
+    if not converged:
+        _warn_unconverged("Lanczos", max_restarts)
+    count("matvecs", matvecs)
+    return theta[wanted], Q[:, :m] @ S[:, wanted], matvecs
+
+
+def _arnoldi(matvec, q, k, tol, max_iter, max_restarts):
+    """
+    Restarted Arnoldi for the k eigenvalues of largest magnitude,
+    returns them with their eigenvectors, the matvec count and whether
+    they converged
+    """
+    n = len(q)
+    Q = np.zeros((n, max_iter + 1))
+    H = np.zeros((max_iter + 1, max_iter))
+    matvecs = 0
+
+    for restart in range(max_restarts + 1):
+        Q[:, 0] = q
+        H[:] = 0
+        for j in range(max_iter):
+            w = matvec(Q[:, j])
+            matvecs += 1
+            for _ in range(2):
+                h = Q[:, : j + 1].T @ w
+                w -= Q[:, : j + 1] @ h
+                H[: j + 1, j] += h
+            H[j + 1, j] = np.linalg.norm(w)
+
+            _check_breakdown(H, j, k)
+            if _breakdown(H, j):
+                H[j + 1, j] = 0
+            m = j + 1
+            if m >= k:
+                theta, S = np.linalg.eig(H[:m, :m])
+                wanted = _select(theta.astype(complex), k, "largest")
+                ritz_residuals = np.abs(H[j + 1, j] * S[-1, wanted])
+                scale = np.maximum(np.abs(theta[wanted]), 1e-300)
+                # a breakdown means the basis spans an invariant subspace
+                converged = np.all(ritz_residuals <= tol * scale) or H[j + 1, j] == 0
+                if converged or m == max_iter:
+                    break
+
+            Q[:, j + 1] = w / H[j + 1, j]
+
+        if converged or m == n or restart == max_restarts:
+            break
+
+        # explicit restart, real and imaginary parts keep q real
+        ritz = Q[:, :m] @ S[:, wanted]
+        q = ritz.real.sum(axis=1) + ritz.imag.sum(axis=1)
+        q /= np.linalg.norm(q)
+
+    return theta[wanted], Q[:, :m] @ S[:, wanted], matvecs, converged
+
+
+def _inverse(A):
+    # solve callable of A^-1 from a single factorization
+    if callable(A):
+        raise ValueError(
+            "which='smallest' factorizes A, pass a matrix or CSRMatrix, not a callable"
+        )
+    if isinstance(A, CSRMatrix):
+        kl, ku = A.bandwidth()
+        return banded_lu(A, kl, ku).solve
+    return lu_factor(np.asarray(A, dtype=float)).solve
+
+
+@instrumented("linear_algebra.arnoldi")
+def arnoldi(
+    A,
+    k=3,
+    which="largest",
+    x0=None,
+    tol=1e-10,
+    max_iter=None,
+    max_restarts=50,
+    n=None,
+):
+    """
+    Arnoldi Method for a few eigenvalues of largest (or smallest)
+    magnitude of a general, possibly non-symmetric operator
+
+    Same idea as Lanczos, but without symmetry the projection
+    H_m = Q_m^T A Q_m is upper Hessenberg instead of tridiagonal. The
+    basis grows until the wanted Ritz values converge. When it is full,
+    Arnoldi starts over from the combination of the wanted Ritz vectors
+    (explicit restart), which steers the new basis towards them. Ritz
+    pairs that still haven't converged after max_restarts are returned
+    with a RuntimeWarning.
+
+    The smallest eigenvalues converge far too slowly in a plain Krylov
+    space, so which="smallest" runs on A^-1 instead (shift-invert with
+    σ = 0): A is factorized once, each step is a solve, and the largest
+    μ of A^-1 give λ = 1/μ. A must then be a matrix or CSRMatrix.
+
+    Parameters:
+    - A: matrix, CSRMatrix or matvec callable
+    - k: number of eigenvalues
+    - which: "largest" or "smallest" (in magnitude)
+    - x0: starting vector, random if omitted
+    - tol: stop once every wanted Ritz residual <= tol * |θ|
+    - max_iter: largest basis size, defaults to min(n, max(10k, 50))
+    - max_restarts: restart limit
+    - n: dimension, only needed for callables without x0
+
+    Returns:
+    - k (possibly complex) eigenvalues, the eigenvectors, and the
+      number of matvecs (solves for "smallest")
+    """
+    if which == "largest":
+        matvec = as_matvec(A)
+    elif which == "smallest":
+        matvec = _inverse(A)
+    else:
+        raise ValueError("which must be 'largest' or 'smallest'")
+
+    q = _starting_vector(A, x0, n)
+    n = len(q)
+    max_iter = min(n, max(10 * k, 50)) if max_iter is None else min(max_iter, n)
+    if not k <= max_iter:
+        raise ValueError("Basis must hold at least k vectors")
+
+    theta, vectors, matvecs, converged = _arnoldi(
+        matvec, q, k, tol, max_iter, max_restarts
+    )
+    if which == "smallest":
+        theta = 1 / theta
+
+    if not converged:
+        _warn_unconverged("Arnoldi", max_restarts)
+    count("matvecs", matvecs)
+    return theta, vectors, matvecs
+
+
+def print_header():
+    header = "EIGENVALUES: POWER, INVERSE ITERATION AND LANCZOS"
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+
+def evaluate():
+    from linear_algebra.sparse import poisson_matrix
+
+    A = np.array([[2.0, -1, 0], [-1, 2, -1], [0, -1, 2]])
+
+    print_header()
+    print(f"{'A:':<22} {A.tolist()}")
+    print(f"{'exact:':<22} {[2 - np.sqrt(2), 2.0, 2 + np.sqrt(2)]}")
+
+    eigenvalue, _, residuals = power_iteration(A)
+    print(f"{'power iteration:':<22} {eigenvalue} ({len(residuals)} iterations)")
+
+    eigenvalue, _, residuals = inverse_iteration(A, shift=0.5)
+    print(f"{'inverse (σ = 0.5):':<22} {eigenvalue} ({len(residuals)} iterations)")
+
+    # 2-D Laplacian with 10,000 unknowns, only matvecs are used
+    n = 100
+    L = poisson_matrix(n)
+    # a single Krylov sequence finds each distinct eigenvalue once
+    modes = 4 - 2 * np.cos(np.arange(n - 3, n + 1) * np.pi / (n + 1))
+    exact = np.unique(np.add.outer(modes, modes - 4).round(12))[::-1][:3]
+
+    eigenvalues, _, matvecs = lanczos(L, k=3)
+    print(f"\nSparse Laplacian, N = {L.shape[0]}")
+    print(f"{'Lanczos (largest):':<22} {np.round(eigenvalues, 8).tolist()}")
+    print(f"{'exact:':<22} {np.round(exact, 8).tolist()}")
+    print(f"{'matvecs:':<22} {matvecs}")
+
+
+if __name__ == "__main__":
+    evaluate()
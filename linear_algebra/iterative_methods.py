@@ -0,0 +1,252 @@
+import numpy as np
+
+from linear_algebra.lu_decomposition import forward_substitution
+from linear_algebra.sparse import CSRMatrix, sparse_forward_substitution
+from utils.instrumentation import count, instrumented
+
+
+def as_matvec(A):
+    """
+    Turns a matrix (anything supporting A @ x) into a matvec callable,
+    callables are passed through untouched
+    """
+    if callable(A):
+        return A
+
+    if not hasattr(A, "shape"):
+        A = np.asarray(A, dtype=float)
+
+    return lambda x: A @ x
+
+
+def _diagonal(A, diagonal):
+    if diagonal is not None:
+        return np.asarray(diagonal, dtype=float)
+    if callable(A):
+        raise ValueError("The diagonal is required when A is a callable")
+    if hasattr(A, "diagonal"):
+        return np.asarray(A.diagonal(), dtype=float)
+    return np.diag(np.asarray(A, dtype=float))
+
+
+def _start(A, b, x0):
+    b = np.asarray(b, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    return as_matvec(A), b, x
+
+
+@instrumented("linear_algebra.jacobi")
+def jacobi(A, b, x0=None, tol=1e-8, max_iter=1000, diagonal=None):
+    """
+    Jacobi Method for solving Ax = b
+
+    Idea:
+    Every unknown is updated simultaneously from the previous iterate,
+    which makes a whole sweep one matrix-vector product. Converges for
+    strictly diagonally dominant A.
+
+    Formula:
+    - x_{k+1} = x_k + D^-1 (b - A x_k)
+    - where D is the diagonal of A
+
+    Parameters:
+    - A: matrix, or a matvec callable (then diagonal must be given)
+    - b: RHS constants
+    - x0: initial guess (warm start), defaults to zeros
+    - tol: stop once |b - Ax| <= tol * |b|
+    - max_iter: iteration limit
+    - diagonal: the diagonal of A, required for matvec callables
+
+    Returns:
+    - x, and the residual norm history (initial residual first)
+    """
+    matvec, b, x = _start(A, b, x0)
+    diagonal = _diagonal(A, diagonal)
+    if np.any(diagonal == 0):
+        raise Exception("Division by zero")
+
+    target = tol * np.linalg.norm(b)
+    r = b - matvec(x)
+    residuals = [np.linalg.norm(r)]
+
+    for _ in range(max_iter):
+        if residuals[-1] <= target:
+            break
+
+        x += r / diagonal
+        r = b - matvec(x)
+        residuals.append(np.linalg.norm(r))
+
+    count("iterations", len(residuals) - 1)
+    return x, residuals
+
+
+@instrumented("linear_algebra.sor")
+def sor(A, b, omega=1.5, x0=None, tol=1e-8, max_iter=1000):
+    """
+    Successive Over-Relaxation (SOR) for solving Ax = b
+
+    Idea:
+    Gauss-Seidel uses each updated unknown as soon as it is available,
+    SOR additionally over-relaxes the update by omega. A sweep is one
+    lower triangular solve, done a row at a time with vectorized dots.
+
+    Formula:
+    - (D + ωL) x_{k+1} = ωb - (ωU + (ω - 1)D) x_k
+    - where A = L + D + U
+
+    Parameters:
+    - A: dense matrix or CSRMatrix
+    - b: RHS constants
+    - omega: relaxation factor, 0 < omega < 2 (1 is Gauss-Seidel)
+    - x0: initial guess (warm start), defaults to zeros
+    - tol: stop once |b - Ax| <= tol * |b|
+    - max_iter: iteration limit
+
+    Returns:
+    - x, and the residual norm history (initial residual first)
+    """
+    if not 0 < omega < 2:
+        raise ValueError("Omega must lie in (0, 2)")
+
+    matvec, b, x = _start(A, b, x0)
+    if isinstance(A, CSRMatrix):
+        D = A.select(lambda rows, cols: rows == cols)
+        lower = D + A.tril(-1).scale(omega)
+        upper = A.triu(1).scale(omega) + D.scale(omega - 1)
+        substitute = sparse_forward_substitution
+    else:
+        A = np.asarray(A, dtype=float)
+        D = np.diag(np.diag(A))
+        lower = D + omega * np.tril(A, -1)
+        upper = omega * np.triu(A, 1) + (omega - 1) * D
+        substitute = forward_substitution
+
+    target = tol * np.linalg.norm(b)
+    residuals = [np.linalg.norm(b - matvec(x))]
+
+    for _ in range(max_iter):
+        if residuals[-1] <= target:
+            break
+
+        x = substitute(lower, omega * b - upper @ x)
+        residuals.append(np.linalg.norm(b - matvec(x)))
+
+    count("iterations", len(residuals) - 1)
+    return x, residuals
+
+
+@instrumented("linear_algebra.gauss_seidel")
+def gauss_seidel(A, b, x0=None, tol=1e-8, max_iter=1000):
+    """
+    Gauss-Seidel Method, i.e. SOR without relaxation (omega = 1)
+    """
+    return sor(A, b, 1.0, x0, tol, max_iter)
+
+
+@instrumented("linear_algebra.conjugate_gradient")
+def conjugate_gradient(
+    A, b, x0=None, tol=1e-8, max_iter=None, preconditioner=None, diagonal=None
+):
+    """
+    (Preconditioned) Conjugate Gradient Method for symmetric positive
+    definite systems Ax = b
+
+    Idea:
+    Minimizes the A-norm of the error over successively larger Krylov
+    subspaces using A-conjugate search directions. One matvec per
+    iteration, and in exact arithmetic it terminates in at most N steps.
+
+    Formula:
+    - α = (r·z) / (p·Ap)
+    - x = x + αp, r = r - αAp, z = M^-1 r
+    - β = (r_new·z_new) / (r·z), p = z + βp
+
+    Parameters:
+    - A: SPD matrix, or a matvec callable
+    - b: RHS constants
+    - x0: initial guess (warm start), defaults to zeros
+    - tol: stop once |b - Ax| <= tol * |b|
+    - max_iter: iteration limit, defaults to N
+    - preconditioner: None, "jacobi", or a callable applying M^-1
+    - diagonal: the diagonal of A for the Jacobi preconditioner when
+      A is a callable
+
+    Returns:
+    - x, and the residual norm history (initial residual first)
+    """
+    matvec, b, x = _start(A, b, x0)
+    max_iter = len(b) if max_iter is None else max_iter
+
+    if preconditioner == "jacobi":
+        inverse_diagonal = 1 / _diagonal(A, diagonal)
+        apply_preconditioner = lambda r: inverse_diagonal * r
+    elif preconditioner is None:
+        apply_preconditioner = lambda r: r
+    else:
+        apply_preconditioner = preconditioner
+
+    target = tol * np.linalg.norm(b)
+    r = b - matvec(x)
+    z = apply_preconditioner(r)
+    p = z.copy()
+    rz = r @ z
+    residuals = [np.linalg.norm(r)]
+
+    for _ in range(max_iter):
+        if residuals[-1] <= target:
+            break
+
+        Ap = matvec(p)
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        residuals.append(np.linalg.norm(r))
+
+        z = apply_preconditioner(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+
+    count("iterations", len(residuals) - 1)
+    return x, residuals
+
+
+def print_header():
+    header = "ITERATIVE METHODS FOR SYSTEMS OF LINEAR EQUATIONS"
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+
+def evaluate():
+    rng = np.random.default_rng(225)
+    N = 200
+
+    # strictly diagonally dominant and symmetric positive definite
+    B = rng.uniform(-1, 1, (N, N))
+    A = (B + B.T) / 2 + np.diag(np.full(N, N / 2))
+    b = rng.standard_normal(N)
+
+    print_header()
+    print(f"{'N:':<26} {N}")
+
+    solvers = {
+        "Jacobi": lambda: jacobi(A, b),
+        "Gauss-Seidel": lambda: gauss_seidel(A, b),
+        "SOR (omega = 1.1)": lambda: sor(A, b, omega=1.1),
+        "Conjugate Gradient": lambda: conjugate_gradient(A, b),
+        "Jacobi-Preconditioned CG": lambda: conjugate_gradient(
+            A, b, preconditioner="jacobi"
+        ),
+    }
+
+    for name, run in solvers.items():
+        x, residuals = run()
+        error = np.linalg.norm(A @ x - b)
+        iterations = len(residuals) - 1
+        print(f"{name + ':':<26} {iterations:>4} iterations, |Ax - b| = {error:.2e}")
+
+
+if __name__ == "__main__":
+    evaluate()
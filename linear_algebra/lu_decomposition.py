@@ -1,28 +1,164 @@
 import numpy as np
 
+from utils.cache import cached
+from utils.instrumentation import count, instrumented
 
+
+@instrumented("linear_algebra.LU")
 def LU(A):
     """
     Applies LU Decomposition using Doolittle's Algorithm to factorize
     a square matrix A
+
+    Each elimination step is a single rank-1 update of the trailing
+    sub-matrix instead of one row update per j
     """
-    N = len(A)
-    U = A.copy()
-    L = np.eye(N)
+    U = np.array(A, dtype=float)
 
-    for k in range(N):
-        for j in range(k + 1, N):
+    def factorize():
+        N = len(U)
+        L = np.eye(N)
+        for k in range(N - 1):
             if U[k][k] == 0:
                 raise Exception("Division by zero")
 
-            factor = U[j][k] / U[k][k]
-            L[j][k] = factor
-            U[j] = U[j] - factor * U[k]
+            L[k + 1 :, k] = U[k + 1 :, k] / U[k][k]
+            U[k + 1 :] -= np.outer(L[k + 1 :, k], U[k])
+
+        return {"L": L, "U": U}
+
+    factors = cached("LU", (U,), factorize)
+    return factors["L"], factors["U"]
+
+
+class LUFactorization:
+    """
+    Pivoted LU factorization PA = LU, stored packed in a single array
+    (unit diagonal of L implied) together with the row permutation, so
+    the same system can be solved for many right-hand sides without
+    factorizing again
+    """
+
+    def __init__(self, lu, perm):
+        self.lu = lu
+        self.perm = perm
+
+    @property
+    def L(self):
+        return np.tril(self.lu, -1) + np.eye(len(self.lu))
+
+    @property
+    def U(self):
+        return np.triu(self.lu)
+
+    @property
+    def P(self):
+        return np.eye(len(self.lu))[self.perm]
+
+    def determinant(self):
+        # every swap in the permutation flips the sign
+        perm = list(self.perm)
+        swaps = 0
+        for i in range(len(perm)):
+            while perm[i] != i:
+                j = perm[i]
+                perm[i], perm[j] = perm[j], perm[i]
+                swaps += 1
+
+        return (-1) ** swaps * np.prod(np.diag(self.lu))
+
+    def solve(self, B):
+        """
+        Solves AX = B where B is a vector or an (N x k) matrix of
+        right-hand sides: Ly = Pb, then Ux = y
+        """
+        B = np.asarray(B, dtype=float)
+        y = forward_substitution(self.lu, B[self.perm], unit_diagonal=True)
+        return back_substitution(self.lu, y)
+
+
+@instrumented("linear_algebra.lu_factor")
+def lu_factor(A, overwrite=False):
+    """
+    LU Decomposition with partial pivoting
+
+    At step k the row with the largest |A[i][k]| (i >= k) is swapped
+    into the pivot position, which avoids zero pivots and keeps the
+    multipliers in L bounded by 1. The elimination itself is one
+    rank-1 update of the trailing sub-matrix:
+
+    - A[k+1:, k] /= A[k][k]
+    - A[k+1:, k+1:] -= outer(A[k+1:, k], A[k, k+1:])
+
+    Parameters:
+    - A: square matrix
+    - overwrite: factorize in place when A is already a float array
+      (not guaranteed when the factors come from the disk cache)
+
+    Returns:
+    - LUFactorization holding the packed factors and permutation
+    """
+    A = np.asarray(A, dtype=float)
+    if not overwrite:
+        A = A.copy()
+
+    N = len(A)
+    if A.shape != (N, N):
+        raise Exception("Matrix must be square")
+
+    def factorize():
+        perm = np.arange(N)
+        swaps = 0
+        for k in range(N):
+            p = k + np.argmax(np.abs(A[k:, k]))
+            if A[p][k] == 0:
+                raise Exception("Matrix is singular")
+
+            if p != k:
+                A[[k, p]] = A[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+                swaps += 1
+
+            A[k + 1 :, k] /= A[k][k]
+            A[k + 1 :, k + 1 :] -= np.outer(A[k + 1 :, k], A[k, k + 1 :])
 
-    return L, U
+        count("pivots", swaps)
+        return {"lu": A, "perm": perm}
 
+    # the key is taken from A before factorize() overwrites it
+    factors = cached("lu_factor", (A,), factorize)
+    return LUFactorization(factors["lu"], factors["perm"])
 
-def solve(A, b):
+
+def forward_substitution(L, B, unit_diagonal=False):
+    """
+    Solves Ly = B for lower triangular L, each row is a single dot
+    product over all right-hand sides at once
+    """
+    y = np.array(B, dtype=float)
+    for i in range(len(y)):
+        y[i] -= L[i, :i] @ y[:i]
+        if not unit_diagonal:
+            y[i] /= L[i][i]
+
+    return y
+
+
+def back_substitution(U, Y):
+    """
+    Solves Ux = Y for upper triangular U, vectorized across the
+    columns of Y
+    """
+    x = np.array(Y, dtype=float)
+    for k in range(len(x) - 1, -1, -1):
+        x[k] -= U[k, k + 1 :] @ x[k + 1 :]
+        x[k] /= U[k][k]
+
+    return x
+
+
+@instrumented("linear_algebra.solve")
+def solve(A, b, verbose=False):
     """
     Solves a system of linear equations by applying LU Decomposition
     and using Gaussian Elimination
@@ -41,72 +177,60 @@ def solve(A, b):
     This system can be solved by combining LU-Decomposition and Gaussian
     Elimination/Back substitution:
 
-    A = LU
-    Ly = b
+    PA = LU
+    Ly = Pb
     Ux = y
 
     Where:
     A represents your coefficients matrix
+    P represents the row permutation chosen by partial pivoting
     L represents a lower triangular matrix (Doolittle's format)
     U represents an upper triangular matrix
     y represents intermediate vector for determining x
     x represents the final result i.e. the unknowns
     """
-    N = len(A)
-    L, U = LU(A)
-
-    print(f"{'L:':<{8}} {L.tolist()}")
-    print(f"{'U:':<{8}} {U.tolist()}")
-
-    # Solve: Ly = b
-    y = np.zeros(N)
-    y[0] = b[0] / L[0][0]
-    for i in range(N):
-        sum_ = 0
-        for j in range(i):
-            sum_ += L[i][j] * y[j]
-
-        y[i] = (b[i] - sum_) / L[i][i]
-
-    print(f"{'y:':<{8}} {y.tolist()}")
+    factors = lu_factor(A)
+    Pb = np.asarray(b, dtype=float)[factors.perm]
+    y = forward_substitution(factors.lu, Pb, unit_diagonal=True)
+    x = back_substitution(factors.lu, y)
 
-    # Solve: Ux = y (back substitution)
-    x = np.zeros(N)
-    for k in range(N - 1, -1, -1):
-        sum_ = 0
-        for j in range(k + 1, N):
-            sum_ += U[k][j] * x[j]
+    if verbose:
+        print(f"{'P:':<{8}} {factors.P.tolist()}")
+        print(f"{'L:':<{8}} {factors.L.tolist()}")
+        print(f"{'U:':<{8}} {factors.U.tolist()}")
+        print(f"{'y:':<{8}} {y.tolist()}")
+        print(f"{'x:':<{8}} {x.tolist()}")
 
-        x[k] = (y[k] - sum_) / U[k][k]
+    return x
 
-    print(f"{'x:':<{8}} {x.tolist()}")
 
-
-def extrapolate_components(system):
+def extrapolate_components(system, square=True):
     """
     System of equations where each array represents the coefficients
     of x1, x2,..., xn and the final element represents the RHS constant
+
+    With square=False the system may be overdetermined (more equations
+    than unknowns), e.g. for least-squares fitting with QR
+
+    A and b are returned as views into the system when it is already a
+    float array (e.g. memory-mapped), so nothing is copied
     """
-    N = len(system)
+    system = np.asarray(system, dtype=float)
+    if system.ndim != 2 or system.shape[1] < 2:
+        raise Exception("System must be a 2-D array of equations")
 
-    entries = 0
-    for eqn in system:
-        for _ in range(len(eqn) - 1):
-            entries += 1
+    N, M = system.shape[0], system.shape[1] - 1
 
-    if N**2 != entries:
+    if square and N != M:
         raise Exception("Number of unknowns doesn't match number of linear equations")
 
-    # Extract first n-1 coefficients from each row
-    # This is the coefficients matrix A
-    # Last entry in each eqn is the RHS column vector b
-    A = np.zeros((N, N))
-    for i in range(N):
-        eqn = system[i]
-        for j in range(len(eqn) - 1):
-            A[i][j] = system[i][j]
+    if not square and N < M:
+        raise Exception("Need at least as many equations as unknowns")
 
-    b = np.array([eqn[-1] for eqn in system])
+    # First n-1 coefficients of each row are the coefficients matrix A
+    # Last entry in each eqn is the RHS column vector b
+    A = system[:, :-1]
+    b = system[:, -1]
 
     return A, b
 
@@ -130,7 +254,7 @@ def evaluate():
     print(f"{'A:':<{8}} {A.tolist()}")
     print(f"{'b:':<{8}} {b.tolist()}")
 
-    solve(A, b)
+    solve(A, b, verbose=True)
 
 
 if __name__ == "__main__":
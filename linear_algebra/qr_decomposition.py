@@ -0,0 +1,193 @@
+import numpy as np
+
+from linear_algebra.lu_decomposition import back_substitution
+from utils.instrumentation import instrumented
+
+
+class QRFactorization:
+    """
+    Householder QR factorization A = QR of an (M x N) matrix, M >= N,
+    stored packed like LAPACK's geqrf: R on and above the diagonal, the
+    Householder vectors (unit leading entry implied) below it, and the
+    reflector scalars in tau. Q is never formed unless asked for.
+    """
+
+    def __init__(self, qr, tau):
+        self.qr = qr
+        self.tau = tau
+
+    @property
+    def R(self):
+        N = self.qr.shape[1]
+        return np.triu(self.qr[:N])
+
+    def apply_qt(self, B):
+        """
+        Q^T B, one reflector H_j = I - tau_j v_j v_j^T at a time,
+        vectorized across the columns of B
+        """
+        Y = np.array(B, dtype=float)
+        for j, tau in enumerate(self.tau):
+            if tau == 0:
+                continue
+            v = np.concatenate(([1.0], self.qr[j + 1 :, j]))
+            Y[j:] -= tau * np.multiply.outer(v, v @ Y[j:])
+
+        return Y
+
+    @property
+    def Q(self):
+        """
+        Thin (M x N) orthonormal factor, built by applying the
+        reflectors in reverse order to the first N columns of I
+        """
+        M, N = self.qr.shape
+        Q = np.eye(M, N)
+        for j in range(N - 1, -1, -1):
+            v = np.concatenate(([1.0], self.qr[j + 1 :, j]))
+            Q[j:] -= self.tau[j] * np.outer(v, v @ Q[j:])
+
+        return Q
+
+    def solve(self, B):
+        """
+        Least-squares solution of AX ~ B (exact when A is square):
+        minimizing |Ax - b| reduces to Rx = (Q^T b)[:N]
+
+        A rank deficient A has no unique solution, back substitution
+        would divide by a (numerically) zero diagonal entry of R, so an
+        |R[k, k]| <= max(M, N) * eps * max |R[j, j]| raises instead
+        """
+        M, N = self.qr.shape
+        diagonal = np.abs(np.diag(self.qr[:N]))
+        if N and np.any(diagonal <= max(M, N) * np.finfo(float).eps * diagonal.max()):
+            raise Exception("Matrix is rank deficient")
+
+        y = self.apply_qt(B)[:N]
+        return back_substitution(self.qr[:N], y)
+
+
+def _householder(x):
+    """
+    Reflector H = I - tau v v^T (v[0] = 1) with Hx = beta e1
+    """
+    sigma = x[1:] @ x[1:]
+    if sigma == 0:
+        return np.zeros(len(x) - 1), 0.0, x[0]
+
+    norm = np.sqrt(x[0] ** 2 + sigma)
+    beta = -norm if x[0] >= 0 else norm
+    tau = (beta - x[0]) / beta
+    return x[1:] / (x[0] - beta), tau, beta
+
+
+@instrumented("linear_algebra.householder_qr")
+def householder_qr(A, block_size=32, overwrite=False):
+    """
+    Blocked Householder QR Decomposition
+
+    Idea:
+    Each column is zeroed below the diagonal by a reflection, which is
+    numerically stable (no normal equations are formed). Columns are
+    processed in panels: reflectors are applied inside the panel one by
+    one, then accumulated into the compact WY form I - V T V^T so the
+    whole block is applied to the trailing matrix with matrix products.
+
+    Formula:
+    - H_j = I - tau_j v_j v_j^T
+    - H_1 H_2 ... H_b = I - V T V^T
+    - T[:j, j] = -tau_j T[:j, :j] V[:, :j]^T v_j, T[j, j] = tau_j
+
+    Parameters:
+    - A: (M x N) matrix with M >= N
+    - block_size: panel width
+    - overwrite: work in place when A is already a float array
+
+    Returns:
+    - QRFactorization
+    """
+    A = np.asarray(A, dtype=float)
+    if not overwrite:
+        A = A.copy()
+
+    M, N = A.shape
+    if M < N:
+        raise Exception("Need at least as many equations as unknowns")
+    if block_size < 1:
+        raise ValueError("Block size must be positive")
+
+    tau = np.zeros(N)
+    for k in range(0, N, block_size):
+        e = min(k + block_size, N)
+
+        # Panel factorization
+        for j in range(k, e):
+            v_tail, tau[j], beta = _householder(A[j:, j])
+            A[j][j] = beta
+            A[j + 1 :, j] = v_tail
+
+            if tau[j] != 0 and j + 1 < e:
+                v = np.concatenate(([1.0], v_tail))
+                A[j:, j + 1 : e] -= tau[j] * np.outer(v, v @ A[j:, j + 1 : e])
+
+        if e == N:
+            break
+
+        # compact WY form of the panel's reflectors
+        V = np.tril(A[k:, k:e], -1)
+        V[np.arange(e - k), np.arange(e - k)] = 1.0
+
+        T = np.zeros((e - k, e - k))
+        for i in range(e - k):
+            T[:i, i] = -tau[k + i] * T[:i, :i] @ (V[:, :i].T @ V[:, i])
+            T[i][i] = tau[k + i]
+
+        # trailing update: C = (I - V T V^T)^T C
+        C = A[k:, e:]
+        C -= V @ (T.T @ (V.T @ C))
+
+    return QRFactorization(A, tau)
+
+
+def lstsq(A, b):
+    """
+    Least-squares solution of the overdetermined system Ax ~ b, A must
+    have full column rank
+    """
+    return householder_qr(A).solve(b)
+
+
+def print_header():
+    header = "QR DECOMPOSITION AND LEAST SQUARES"
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+
+def evaluate():
+    # fit a quadratic through noisy samples, 20 equations and 3 unknowns
+    rng = np.random.default_rng(225)
+    x = np.linspace(0, 2, 20)
+    y = 1.5 - 2 * x + 0.75 * x**2 + rng.normal(0, 0.05, len(x))
+    A = np.column_stack((np.ones_like(x), x, x**2))
+
+    print_header()
+    print("Model: y = c0 + c1 x + c2 x^2")
+    print(f"{'samples:':<12} {len(x)}")
+
+    coefficients = lstsq(A, y)
+    print(f"{'fitted:':<12} {np.round(coefficients, 4).tolist()}")
+    print(f"{'residual:':<12} {np.linalg.norm(A @ coefficients - y):.4f}")
+
+    M, N = 2000, 300
+    A = rng.standard_normal((M, N))
+    b = rng.standard_normal(M)
+    x = householder_qr(A, block_size=32).solve(b)
+
+    # the least-squares residual is orthogonal to the range of A
+    orthogonality = np.linalg.norm(A.T @ (A @ x - b))
+    print(f"\nBlocked, {M} x {N}, |A^T(Ax - b)| = {orthogonality:.2e}")
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -0,0 +1,234 @@
+import numpy as np
+
+from linear_algebra.banded import banded_lu
+from utils.instrumentation import instrumented
+
+
+class CSRMatrix:
+    """
+    Compressed Sparse Row (CSR) matrix
+
+    Idea:
+    Only the nonzero entries are stored, row after row:
+    - data: the nonzero values
+    - indices: the column of each value
+    - indptr: row i occupies data[indptr[i]:indptr[i+1]]
+
+    Memory and matvec cost are O(nnz) instead of O(N^2).
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+        # row of every stored entry, used by the vectorized matvec
+        self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """
+        Builds a CSR matrix from coordinate triplets (row, col, value),
+        duplicate coordinates are summed
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        n_rows, n_cols = shape
+
+        if len(rows) and (
+            rows.min() < 0 or rows.max() >= n_rows
+            or cols.min() < 0 or cols.max() >= n_cols
+        ):
+            raise ValueError("Coordinates are outside the matrix shape")
+
+        # sort by row then column and merge duplicates
+        keys = rows * n_cols + cols
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        data = np.bincount(inverse, weights=values, minlength=len(unique_keys))
+        unique_rows, indices = np.divmod(unique_keys, n_cols)
+
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(unique_rows, minlength=n_rows), out=indptr[1:])
+
+        return cls(data, indices, indptr, shape)
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def to_coo(self):
+        return self._rows, self.indices, self.data
+
+    def toarray(self):
+        A = np.zeros(self.shape)
+        A[self._rows, self.indices] = self.data
+        return A
+
+    def matvec(self, x):
+        """
+        y = Ax, all products are formed at once and summed per row
+        """
+        x = np.asarray(x)
+        if x.ndim == 1:
+            products = self.data * x[self.indices]
+            return np.bincount(self._rows, weights=products, minlength=self.shape[0])
+
+        # several right-hand sides, one column at a time
+        return np.column_stack([self.matvec(column) for column in x.T])
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+    @property
+    def T(self):
+        return CSRMatrix.from_coo(
+            self.indices, self._rows, self.data, self.shape[::-1]
+        )
+
+    def diagonal(self):
+        d = np.zeros(min(self.shape))
+        on_diagonal = self._rows == self.indices
+        d[self._rows[on_diagonal]] = self.data[on_diagonal]
+        return d
+
+    def select(self, keep):
+        """
+        Sub-matrix of the entries where keep(rows, cols) is True
+        """
+        mask = keep(self._rows, self.indices)
+        return CSRMatrix.from_coo(
+            self._rows[mask], self.indices[mask], self.data[mask], self.shape
+        )
+
+    def tril(self, k=0):
+        return self.select(lambda rows, cols: cols - rows <= k)
+
+    def triu(self, k=0):
+        return self.select(lambda rows, cols: cols - rows >= k)
+
+    def scale(self, alpha):
+        return CSRMatrix(alpha * self.data, self.indices, self.indptr, self.shape)
+
+    def __add__(self, other):
+        rows = np.concatenate((self._rows, other._rows))
+        cols = np.concatenate((self.indices, other.indices))
+        values = np.concatenate((self.data, other.data))
+        return CSRMatrix.from_coo(rows, cols, values, self.shape)
+
+    def bandwidth(self):
+        """
+        Number of nonzero sub-diagonals (kl) and super-diagonals (ku)
+        """
+        offsets = self.indices - self._rows
+        if self.nnz == 0:
+            return 0, 0
+        return int(max(-offsets.min(), 0)), int(max(offsets.max(), 0))
+
+    def to_banded(self, kl, ku):
+        """
+        Band storage used by linear_algebra.banded, built directly from
+        the nonzeros without going through a dense matrix
+        """
+        offsets = self.indices - self._rows
+        if np.any(offsets < -kl) or np.any(offsets > ku):
+            raise ValueError("Matrix has entries outside the given bandwidth")
+
+        W = np.zeros((self.shape[0], 2 * kl + ku + 1))
+        W[self._rows, offsets + kl] = self.data
+        return W
+
+
+def sparse_forward_substitution(L, b):
+    """
+    Solves Lx = b for a lower triangular CSRMatrix, each row costs only
+    its own nonzeros
+    """
+    x = np.array(b, dtype=float)
+    for i in range(len(x)):
+        start, end = L.indptr[i], L.indptr[i + 1]
+        cols, values = L.indices[start:end], L.data[start:end]
+
+        # columns are sorted, so the diagonal is the last entry
+        if end == start or cols[-1] != i or values[-1] == 0:
+            raise Exception("Division by zero")
+
+        x[i] = (x[i] - values[:-1] @ x[cols[:-1]]) / values[-1]
+
+    return x
+
+
+@instrumented("linear_algebra.spsolve")
+def spsolve(A, b):
+    """
+    Direct sparse solve of Ax = b through a banded LU with partial
+    pivoting. Memory is O(N * bandwidth), so rows and columns should be
+    ordered to keep nonzeros close to the diagonal.
+    """
+    if A.shape[0] != A.shape[1]:
+        raise Exception("Matrix must be square")
+
+    kl, ku = A.bandwidth()
+    return banded_lu(A, kl, ku).solve(b)
+
+
+def poisson_matrix(n):
+    """
+    5-point Laplacian on an n x n grid, N = n^2 unknowns and at most
+    five nonzeros per row
+    """
+    N = n * n
+    idx = np.arange(N)
+    rows, cols, values = [idx], [idx], [np.full(N, 4.0)]
+
+    for step, valid in (
+        (1, idx % n != n - 1),
+        (-1, idx % n != 0),
+        (n, idx < N - n),
+        (-n, idx >= n),
+    ):
+        rows.append(idx[valid])
+        cols.append(idx[valid] + step)
+        values.append(np.full(valid.sum(), -1.0))
+
+    return CSRMatrix.from_coo(
+        np.concatenate(rows), np.concatenate(cols), np.concatenate(values), (N, N)
+    )
+
+
+def print_header():
+    header = "SPARSE (CSR) LINEAR SYSTEMS"
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+
+def evaluate():
+    from linear_algebra.iterative_methods import conjugate_gradient
+
+    n = 60
+    A = poisson_matrix(n)
+    b = np.ones(A.shape[0])
+
+    print_header()
+    print(f"{'N:':<12} {A.shape[0]}")
+    print(f"{'nnz:':<12} {A.nnz}")
+    print(f"{'density:':<12} {A.nnz / A.shape[0] ** 2:.4%}")
+    print(f"{'bandwidth:':<12} {A.bandwidth()}")
+
+    _, residuals = conjugate_gradient(A, b, preconditioner="jacobi")
+    iterations = len(residuals) - 1
+    print(f"{'CG:':<12} {iterations} iterations, |Ax - b| = {residuals[-1]:.2e}")
+
+    x_lu = spsolve(A, b)
+    print(f"{'banded LU:':<12} |Ax - b| = {np.linalg.norm(A @ x_lu - b):.2e}")
+
+
+if __name__ == "__main__":
+    evaluate()
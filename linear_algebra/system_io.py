@@ -0,0 +1,254 @@
+import os
+import tempfile
+from itertools import islice
+
+import numpy as np
+
+from linear_algebra.lu_decomposition import extrapolate_components
+from linear_algebra.sparse import CSRMatrix
+
+
+def load_npy(path, mmap_mode="c", square=True):
+    """
+    Loads an augmented system [A | b] saved with numpy.save
+
+    The file is memory-mapped, so pages are only read when touched and
+    A, b are views into the mapping (no copy). With the default
+    copy-on-write mode, an in-place factorization (e.g. blocked_lu with
+    overwrite=True) only costs memory for the pages it modifies and
+    never writes back to the file.
+
+    Only float64 files can be used in place. Any other dtype is
+    converted into a float64 array in memory (one full copy), and "r+"
+    raises for them since nothing would be written back.
+
+    Parameters:
+    - path: .npy file holding an N x (M + 1) float64 array
+    - mmap_mode: "r" read-only, "c" copy-on-write, "r+" write-through,
+      None to read everything into memory
+    - square: require N == M
+
+    Returns:
+    - A, b
+    """
+    system = np.load(path, mmap_mode=mmap_mode)
+    if system.dtype != np.float64 and mmap_mode == "r+":
+        raise Exception(f"Write-through needs a float64 file, not {system.dtype}")
+    return extrapolate_components(system, square)
+
+
+def _rows(f):
+    # lines holding data, "#" starts a comment anywhere like in np.loadtxt
+    return (line for line in f if line.split("#", 1)[0].strip())
+
+
+def _count_rows(path):
+    with open(path) as f:
+        return sum(1 for _ in _rows(f))
+
+
+def load_csv(path, delimiter=",", chunk_rows=10000, square=True, out=None):
+    """
+    Loads an augmented system [A | b] from a CSV file in chunks
+
+    A first pass counts the rows, then one N x (M + 1) array is
+    allocated and filled chunk_rows lines at a time, so parsing never
+    holds more than one chunk of Python objects on top of the result.
+
+    Parameters:
+    - path: CSV file, one equation per line, "#" starts a comment
+    - delimiter: field separator
+    - chunk_rows: lines parsed per chunk
+    - square: require N == M
+    - out: optional .npy path, the result is then written into a
+      memory-mapped file instead of RAM
+
+    Returns:
+    - A, b
+    """
+    N = _count_rows(path)
+    if N == 0:
+        raise Exception("System is empty")
+
+    with open(path) as f:
+        lines = _rows(f)
+        first = np.loadtxt(islice(lines, 1), delimiter=delimiter, ndmin=1)
+
+        shape = (N, len(first))
+        if out is None:
+            system = np.empty(shape)
+        else:
+            system = np.lib.format.open_memmap(
+                out, mode="w+", dtype=float, shape=shape
+            )
+
+        system[0] = first
+        row = 1
+        while row < N:
+            chunk = np.loadtxt(islice(lines, chunk_rows), delimiter=delimiter, ndmin=2)
+            if chunk.shape[1] != shape[1]:
+                raise Exception(f"Equation {row + 1} has the wrong number of entries")
+
+            system[row : row + len(chunk)] = chunk
+            row += len(chunk)
+
+    return extrapolate_components(system, square)
+
+
+def load_matrix_market(path, chunk_rows=100000):
+    """
+    Reads a Matrix Market (.mtx) file
+
+    - "coordinate" files are returned as a CSRMatrix, symmetric ones
+      are expanded to both triangles
+    - "array" files (column-major dense) are returned as an ndarray,
+      symmetric ones hold only the lower triangle column by column
+    - other symmetries (skew-symmetric, hermitian) are rejected
+
+    Entries are parsed chunk_rows lines at a time into preallocated
+    arrays.
+    """
+    with open(path) as f:
+        header = f.readline().lower().split()
+        if len(header) < 5 or header[:2] != ["%%matrixmarket", "matrix"]:
+            raise Exception("Not a Matrix Market matrix file")
+
+        layout, field, symmetry = header[2], header[3], header[4]
+        if field not in ("real", "integer", "double"):
+            raise Exception(f"Unsupported Matrix Market field: {field}")
+
+        lines = (line for line in f if line.strip() and not line.startswith("%"))
+        sizes = [int(v) for v in next(lines).split()]
+
+        def read(count, columns):
+            values = np.empty((count, columns))
+            row = 0
+            while row < count:
+                chunk = np.loadtxt(islice(lines, chunk_rows), ndmin=2)
+                if len(chunk) == 0:
+                    raise Exception("Matrix Market file ended early")
+                values[row : row + len(chunk)] = chunk
+                row += len(chunk)
+            return values
+
+        if layout == "array":
+            n_rows, n_cols = sizes
+            if symmetry == "general":
+                values = read(n_rows * n_cols, 1)[:, 0]
+                return values.reshape((n_rows, n_cols), order="F")
+            if symmetry != "symmetric":
+                raise Exception(f"Unsupported Matrix Market symmetry: {symmetry}")
+            if n_rows != n_cols:
+                raise Exception("Symmetric Matrix Market matrix must be square")
+
+            # the upper triangle's row-major order is the lower's column-major
+            cols, rows = np.triu_indices(n_rows)
+            A = np.zeros((n_rows, n_cols))
+            A[rows, cols] = A[cols, rows] = read(len(rows), 1)[:, 0]
+            return A
+
+        if layout != "coordinate":
+            raise Exception(f"Unsupported Matrix Market layout: {layout}")
+
+        n_rows, n_cols, nnz = sizes
+        entries = read(nnz, 3)
+
+    rows = entries[:, 0].astype(np.int64) - 1
+    cols = entries[:, 1].astype(np.int64) - 1
+    values = entries[:, 2]
+
+    if symmetry == "symmetric":
+        off_diagonal = rows != cols
+        rows, cols = (
+            np.concatenate((rows, cols[off_diagonal])),
+            np.concatenate((cols, rows[off_diagonal])),
+        )
+        values = np.concatenate((values, values[off_diagonal]))
+    elif symmetry != "general":
+        raise Exception(f"Unsupported Matrix Market symmetry: {symmetry}")
+
+    return CSRMatrix.from_coo(rows, cols, values, (n_rows, n_cols))
+
+
+def load_system(path, rhs=None, square=True):
+    """
+    Loads a linear system by file extension
+
+    - .npy and .csv hold the augmented [A | b]
+    - .mtx holds A alone (dense or sparse) with b in a separate rhs
+      file, or a dense augmented [A | b]
+
+    Returns:
+    - A, b
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return load_npy(path, square=square)
+    if extension == ".csv":
+        return load_csv(path, square=square)
+    if extension != ".mtx":
+        raise Exception(f"Unknown system file type: {extension}")
+
+    A = load_matrix_market(path)
+    if rhs is None:
+        if isinstance(A, CSRMatrix):
+            raise Exception("Sparse systems need a separate right-hand side file")
+        return extrapolate_components(A, square)
+
+    rhs_extension = os.path.splitext(rhs)[1].lower()
+    if rhs_extension == ".npy":
+        b = np.load(rhs, mmap_mode="c")
+    elif rhs_extension == ".mtx":
+        b = load_matrix_market(rhs)
+    else:
+        b = np.loadtxt(rhs, delimiter=",", ndmin=1)
+
+    b = np.asarray(b, dtype=float).reshape(-1)
+    if len(b) != A.shape[0]:
+        raise Exception("Right-hand side doesn't match the number of equations")
+
+    return A, b
+
+
+def print_header():
+    header = "LOADING LINEAR SYSTEMS FROM FILES"
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+
+def evaluate():
+    system = np.array([[1.0, 1, 1, 1], [4, 3, -1, 6], [3, 5, 3, 4]])
+
+    print_header()
+    print(f"{'system:':<12} {system.tolist()}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        npy = os.path.join(directory, "system.npy")
+        np.save(npy, system)
+
+        csv = os.path.join(directory, "system.csv")
+        np.savetxt(csv, system, delimiter=",")
+
+        mtx = os.path.join(directory, "A.mtx")
+        rows, cols = np.nonzero(system[:, :-1])
+        with open(mtx, "w") as f:
+            f.write("%%MatrixMarket matrix coordinate real general\n")
+            f.write(f"3 3 {len(rows)}\n")
+            for i, j in zip(rows, cols):
+                f.write(f"{i + 1} {j + 1} {system[i, j]}\n")
+
+        rhs = os.path.join(directory, "b.npy")
+        np.save(rhs, system[:, -1])
+
+        for path, b_path in ((npy, None), (csv, None), (mtx, rhs)):
+            A, b = load_system(path, b_path)
+            kind = type(A).__name__
+            print(f"{os.path.basename(path) + ':':<12} {kind}, b = {b.tolist()}")
+
+        A, b = load_npy(npy)
+        print(f"{'views:':<12} A is a view of the mapped file: {A.base is not None}")
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -0,0 +1,20 @@
+"""
+Root finding methods, submodules are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "root_scanner",
+]
+
+EXPORTS = {
+    "bisection": "bisection",
+    "newton_raphson": "newton_raphson",
+    "secant_method": "secant_method",
+    "bisection_vectorized": "bisection",
+    "find_roots": "root_scanner",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
@@ -1,7 +1,10 @@
-import math
-import inspect
+import numpy as np
 
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import count, counted, instrumented
 
+
+@instrumented("root_finding.bisection")
 def bisection(f, a, b, epsilon):
     """
         Bisection is a root-finding method for continuous functions
@@ -16,18 +19,21 @@ def bisection(f, a, b, epsilon):
         numbers within a tolerance threshold
 
         parameters:
-        - f: function
+        - f: function or formula string
         - a: first value of the interval
         - b: second value of the interval
         - epsilon: tolerance threshold
     """
+    f = counted(as_function(f))
+    count("iterations")
     fa, fb = f(a), f(b)
 
     if abs(fa) < epsilon:
         return a
     if abs(fb) < epsilon:
         return b
-    if fa * fb > 0:
+    # NaN (f undefined there, e.g. x^(1/3) for x < 0) fails too
+    if not fa * fb <= 0:
         raise Exception("Interval does not cross 0")
 
     c = (a + b) / 2
@@ -42,45 +48,84 @@ def bisection(f, a, b, epsilon):
         return bisection(f, a, c, epsilon)
 
 
-def source(fx):
+@instrumented("root_finding.bisection_vectorized")
+def bisection_vectorized(f, a, b, epsilon, max_iter=200):
     """
-        Helper function to get lambda source text
+        Bisection on many intervals at once, each one halved exactly
+        as bisection would, but every step evaluates f once on the
+        midpoints of all intervals still searching
+
+        parameters:
+        - f: vectorized function or formula string
+        - a: first values of the intervals (array)
+        - b: second values of the intervals (array)
+        - epsilon: tolerance threshold
+        - max_iter: iteration limit
+
+        returns:
+        - array of roots, NaN where the interval does not cross 0
+          (or max_iter was reached)
     """
-    text = inspect.getsource(fx)
-    text = text.strip()
-    text = text.split("lambda x: ")[1]
-    return text
+    f = as_function(f)
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    shape = a.shape
+    # copies, the intervals are narrowed in place
+    a, b = a.flatten(), b.flatten()
+    fa = np.broadcast_to(f(a), a.shape).astype(float)
+    fb = np.broadcast_to(f(b), b.shape).astype(float)
+    count("evaluations", 2 * a.size)
+
+    roots = np.full(a.size, np.nan)
+    roots[np.abs(fb) < epsilon] = b[np.abs(fb) < epsilon]
+    roots[np.abs(fa) < epsilon] = a[np.abs(fa) < epsilon]
+    active = np.isnan(roots) & (fa * fb <= 0)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        count("iterations")
+
+        index = np.nonzero(active)[0]
+        c = (a[index] + b[index]) / 2
+        fc = np.broadcast_to(f(c), c.shape)
+        count("evaluations", c.size)
+
+        done = (np.abs(fc) < epsilon) | (np.abs(b[index] - a[index]) < epsilon)
+        roots[index[done]] = c[done]
+        active[index[done]] = False
+
+        # keep the half whose endpoints still differ in sign
+        left = ~done & (fa[index] * fc > 0)
+        right = ~done & ~left
+        a[index[left]], fa[index[left]] = c[left], fc[left]
+        b[index[right]] = c[right]
+
+    return roots.reshape(shape)
 
 
 if __name__ == "__main__":
     test_cases = [
-        {"fx": lambda x: 1 - (2 * x * math.pow(math.e, -x/2)),
-         "a": 0.1, "b": 2},
-        {"fx": lambda x: 5 - math.pow(x, -1), "a": 0.1, "b": 0.3},
-        {"fx": lambda x: math.pow(x, 3) - (2 * x) - 5, "a": 2, "b": 3},
-        {"fx": lambda x: math.pow(math.e, x) - 2, "a": 0, "b": 2},
-        {"fx": lambda x: x - math.pow(math.e, -x), "a": 0, "b": 1},
-        {"fx": lambda x: math.pow(x, 6) - x - 1, "a": 1, "b": 2},
-        {"fx": lambda x: math.pow(x, 2) - math.sin(x), "a": 0, "b": 1},
-        {"fx": lambda x: math.pow(x, 3) - 2, "a": 1, "b": 2},
-        {"fx": lambda x: x + math.tan(x), "a": -1, "b": 0},
-        # {"fx": lambda x: 2 - (math.pow(x, -1) * math.log(x)), "a": 0.01, "b": 2},
+        {"fx": "1 - 2*x*e^(-x/2)", "a": 0.1, "b": 2},
+        {"fx": "5 - x^-1", "a": 0.1, "b": 0.3},
+        {"fx": "x^3 - 2*x - 5", "a": 2, "b": 3},
+        {"fx": "e^x - 2", "a": 0, "b": 2},
+        {"fx": "x - e^(-x)", "a": 0, "b": 1},
+        {"fx": "x^6 - x - 1", "a": 1, "b": 2},
+        {"fx": "x^2 - sin(x)", "a": 0, "b": 1},
+        {"fx": "x^3 - 2", "a": 1, "b": 2},
+        {"fx": "x + tan(x)", "a": -1, "b": 0},
+        # {"fx": "2 - x^-1 * log(x)", "a": 0.01, "b": 2},
         # the above can't be solved with bisection, tsk tsk
     ]
 
     EPSILON = 1e-6
     print("FINDING ROOTS USING BISECTION METHOD")
     for idx, test in enumerate(test_cases):
-        fx = test["fx"]
+        fx = compile_expression(test["fx"])
         a = test["a"]
         b = test["b"]
 
-        print("-" * 55)
-        print(f"Problem {chr(65 + idx)}")
-        print("-" * 55)
-        print(f"- f(x): {source(fx)}")
-        print(f"- a: {a}")
-        print(f"- b: {b}")
+        print_header(idx, **{"f(x)": fx, "a": a, "b": b})
 
         root = bisection(fx, a, b, EPSILON)
         print(f"- found root as: {root}\n")
@@ -1,7 +1,11 @@
-import math
-import inspect
+import numpy as np
 
+from differentiation.automatic_differentiation import value_and_derivative
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import count, counted, instrumented
 
+
+@instrumented("root_finding.newton_raphson")
 def newton_raphson(fx, fx_prime, x0, epsilon, max_iter=100, iteration=0):
     """
         Newton Raphson's method is a root finding algorithm
@@ -9,8 +13,11 @@ def newton_raphson(fx, fx_prime, x0, epsilon, max_iter=100, iteration=0):
         a real-valued function
 
         parameters:
-        - fx: the initial function
-        - fx_prime: the derivative of the function, fx
+        - fx: the initial function (callable or formula string)
+        - fx_prime: the derivative of the function, fx, or None to get
+          it exactly by automatic differentiation in the same pass as fx
+          (fx must then use NumPy functions or be a formula string,
+          math.* functions raise a TypeError on dual numbers)
         - x0: initial guess
         - epsilon: tolerance threshold
 
@@ -22,7 +29,13 @@ def newton_raphson(fx, fx_prime, x0, epsilon, max_iter=100, iteration=0):
     if iteration >= max_iter:
         raise Exception("Newton Raphson did not converge")
 
-    f, fp = fx(x0), fx_prime(x0)
+    fx = counted(as_function(fx))
+    fx_prime = counted(as_function(fx_prime), "derivative_evaluations")
+    count("iterations")
+    if fx_prime is None:
+        f, fp = value_and_derivative(fx, x0)
+    else:
+        f, fp = fx(x0), fx_prime(x0)
     if fp == 0:
         raise Exception("Cannot divide by zero")
 
@@ -36,98 +49,38 @@ def newton_raphson(fx, fx_prime, x0, epsilon, max_iter=100, iteration=0):
     return newton_raphson(fx, fx_prime, x1, epsilon, max_iter, iteration + 1)
 
 
-def source(fx):
-    """
-        Helper function to get lambda source text
-    """
-    text = inspect.getsource(fx)
-    text = text.strip()
-    text = text.split("lambda x: ")[1]
-    return text
-
-
 if __name__ == "__main__":
-    # note: sec(x) replaced with 1/cos(x)
     test_cases = [
-        {
-            "fx": lambda x: 1 - (2 * x * math.pow(math.e, -x/2)),
-            "fx_prime": lambda x: math.pow(math.e, -x/2) * (x - 2),
-            "x0": 0
-        },
-
-        {
-            "fx": lambda x: 5 - math.pow(x, -1),
-            "fx_prime": lambda x: math.pow(x, -2),
-            "x0": 1/4
-        },
-
-        {
-            "fx": lambda x: math.pow(x, 3) - (2 * x) - 5,
-            "fx_prime": lambda x: 3 * math.pow(x, 2) - 2,
-            "x0": 2
-        },
-
-        {
-            "fx": lambda x: math.pow(math.e, x) - 2,
-            "fx_prime": lambda x: math.pow(math.e, x),
-            "x0": 1
-        },
-
-        {
-            "fx": lambda x: x - math.pow(math.e, -x),
-            "fx_prime": lambda x: 1 + math.pow(math.e, -x),
-            "x0": 1
-        },
-
-        {
-            "fx": lambda x: math.pow(x, 6) - x - 1,
-            "fx_prime": lambda x: 6 * math.pow(x, 5) - 1,
-            "x0": 1
-        },
-
-        {
-            "fx": lambda x: math.pow(x, 2) - math.sin(x),
-            "fx_prime": lambda x: (2 * x) - math.cos(x),
-            "x0": 1/2
-        },
-
-        {
-            "fx": lambda x: math.pow(x, 3) - 2,
-            "fx_prime": lambda x: 3 * math.pow(x, 2),
-            "x0": 1
-        },
-
-        {
-            "fx": lambda x: x + math.tan(x),
-            "fx_prime": lambda x: 1 + math.pow(1/math.cos(x), 2),
-            "x0": 3
-        },
-
-        {
-            "fx": lambda x: 2 - (math.pow(x, -1) * math.log(x)),
-            "fx_prime": lambda x: (1 - math.log(x)) / math.pow(x, 2),
-            "x0": 1/3
-        },
+        {"fx": "1 - 2*x*e^(-x/2)", "fx_prime": "e^(-x/2) * (x - 2)", "x0": 0},
+        {"fx": "5 - x^-1", "fx_prime": "x^-2", "x0": 1/4},
+        {"fx": "x^3 - 2*x - 5", "fx_prime": "3*x^2 - 2", "x0": 2},
+        {"fx": "e^x - 2", "fx_prime": "e^x", "x0": 1},
+        {"fx": "x - e^(-x)", "fx_prime": "1 + e^(-x)", "x0": 1},
+        {"fx": "x^6 - x - 1", "fx_prime": "6*x^5 - 1", "x0": 1},
+        {"fx": "x^2 - sin(x)", "fx_prime": "2*x - cos(x)", "x0": 1/2},
+        {"fx": "x^3 - 2", "fx_prime": "3*x^2", "x0": 1},
+        {"fx": "x + tan(x)", "fx_prime": "1 + sec(x)^2", "x0": 3},
+        # ln(x)/x <= 1/e, so there is no real root to find here
+        {"fx": "2 - x^-1 * log(x)", "fx_prime": "(log(x) - 1) / x^2", "x0": 1/3},
     ]
 
     EPSILON = 1e-6
 
     print("FINDING ROOTS USING NEWTON-RAPHSON METHOD\n")
     for idx, test in enumerate(test_cases):
-        fx = test["fx"]
-        fx_prime = test["fx_prime"]
+        fx = compile_expression(test["fx"])
+        fx_prime = compile_expression(test["fx_prime"])
         x0 = test["x0"]
 
-        print("-" * 55)
-        print(f"Problem {chr(65 + idx)}")
-        print("-" * 55)
-        print(f"- f(x): {source(fx)}")
-        print(f"- f'(x): {source(fx_prime)}")
-        print(f"- x0: {x0}")
+        print_header(idx, **{"f(x)": fx, "f'(x)": fx_prime, "x0": x0})
 
+        # iterates may leave the domain of f, that ends in an error
         try:
-            root = newton_raphson(fx, fx_prime, x0, EPSILON)
-            print(f"- found root as: {root}\n")
+            with np.errstate(invalid="ignore", divide="ignore"):
+                root = newton_raphson(fx, fx_prime, x0, EPSILON)
+                print(f"- found root as: {root}")
+                root = newton_raphson(fx, None, x0, EPSILON)
+                print(f"- with automatic f'(x): {root}\n")
 
         except Exception as e:
             print(f"- error: {e}\n")
@@ -0,0 +1,174 @@
+import numpy as np
+
+from root_finding.bisection import bisection, bisection_vectorized
+from utils import as_function, compile_expression, print_header
+from utils.instrumentation import count, instrumented
+
+GOLDEN = (np.sqrt(5) - 1) / 2
+
+
+def _vectorized(f, x):
+    """
+        f itself when it takes arrays, otherwise a wrapper calling it
+        point by point, together with f on the grid x
+    """
+    try:
+        y = np.asarray(f(x), dtype=float)
+    except (TypeError, ValueError):
+        f = np.vectorize(f, otypes=[float])
+        y = f(x)
+    count("evaluations", len(x))
+    return f, np.broadcast_to(y, x.shape)
+
+
+def _minimize(f, lo, hi, sign, iterations):
+    """
+        Golden section search for the minimum of sign * f on every
+        interval [lo, hi] at once, one evaluation of f per step
+    """
+    c, d = hi - GOLDEN * (hi - lo), lo + GOLDEN * (hi - lo)
+    fc, fd = sign * f(c), sign * f(d)
+
+    for _ in range(iterations):
+        left = fc < fd
+        hi = np.where(left, d, hi)
+        lo = np.where(left, lo, c)
+        kept, f_kept = np.where(left, c, d), np.where(left, fc, fd)
+
+        new = np.where(left, hi - GOLDEN * (hi - lo), lo + GOLDEN * (hi - lo))
+        f_new = sign * f(new)
+        c, fc = np.where(left, new, kept), np.where(left, f_new, f_kept)
+        d, fd = np.where(left, kept, new), np.where(left, f_kept, f_new)
+
+    count("evaluations", (iterations + 2) * len(lo))
+    return np.where(fc < fd, c, d), sign * np.minimum(fc, fd)
+
+
+@instrumented("root_finding.find_roots")
+def find_roots(f, a, b, samples=1000, epsilon=1e-10, touch_tol=None):
+    """
+        Finds every root of f in [a, b] without hand-picked brackets
+
+        f is sampled once on a grid of samples + 1 points, then:
+        - grid points where f is exactly 0 are roots
+        - every cell where f changes sign is a bracket
+        - every local minimum of |f| where f keeps its sign is refined
+          by golden section search, a root touching the axis there
+          (|f| <= touch_tol, e.g. a double root) is kept, and a dip
+          below the axis (two roots in one cell) becomes two brackets
+
+        all brackets are then refined together by bisection_vectorized,
+        roots closer than 2 * epsilon are merged. A sign change across
+        a pole (x + tan(x) at pi/2) is rejected, since there |f| grows
+        instead of shrinking towards the bracket's midpoint.
+
+        roots closer together than the grid spacing that f does not
+        separate with a sign change or a local minimum can still be
+        missed, more samples narrow that gap
+
+        parameters:
+        - f: function or formula string
+        - a: start of the interval
+        - b: end of the interval
+        - samples: number of grid cells
+        - epsilon: tolerance threshold
+        - touch_tol: largest |f| accepted as a touching root,
+          epsilon when None
+
+        returns:
+        - sorted array of roots
+    """
+    if b <= a:
+        raise ValueError("Interval must satisfy a < b")
+    if samples < 2:
+        raise ValueError("At least 2 samples are needed")
+    touch_tol = epsilon if touch_tol is None else touch_tol
+
+    x = np.linspace(a, b, samples + 1)
+    f, y = _vectorized(as_function(f), x)
+    roots = [x[y == 0]]
+
+    # cells where f changes sign
+    crossing = np.nonzero(y[:-1] * y[1:] < 0)[0]
+    lo, hi = [x[crossing]], [x[crossing + 1]]
+
+    # local minima of |f| not crossing the axis
+    inner = np.abs(y[1:-1])
+    dips = np.nonzero(
+        (y[:-2] * y[1:-1] > 0)
+        & (y[1:-1] * y[2:] > 0)
+        & (inner < np.abs(y[:-2]))
+        & (inner <= np.abs(y[2:]))
+    )[0] + 1
+    if len(dips):
+        h = x[1] - x[0]
+        # steps to shrink the 2h wide dips down to epsilon
+        iterations = int(np.ceil(np.log(epsilon / (2 * h)) / np.log(GOLDEN)))
+        iterations = min(max(iterations, 1), 100)
+        sign = np.sign(y[dips])
+        m, fm = _minimize(f, x[dips - 1], x[dips + 1], sign, iterations)
+
+        touching = np.abs(fm) <= touch_tol
+        roots.append(m[touching])
+        split = ~touching & (sign * fm < 0)
+        lo += [x[dips - 1][split], m[split]]
+        hi += [m[split], x[dips + 1][split]]
+
+    lo, hi = np.concatenate(lo), np.concatenate(hi)
+    count("brackets", len(lo))
+    if len(lo):
+        refined = bisection_vectorized(f, lo, hi, epsilon)
+        at_root = np.abs(f(refined))
+        at_ends = np.minimum(np.abs(f(lo)), np.abs(f(hi)))
+        count("evaluations", 3 * len(lo))
+        roots.append(refined[at_root <= np.maximum(at_ends, touch_tol)])
+
+    roots = np.sort(np.concatenate(roots))
+    if len(roots):
+        roots = roots[np.concatenate([[True], np.diff(roots) > 2 * epsilon])]
+
+    return roots
+
+
+if __name__ == "__main__":
+    import time
+
+    test_cases = [
+        {"fx": "sin(x)", "a": 0, "b": 50},
+        {"fx": "x^3 - 2*x - 5", "a": -10, "b": 10},
+        {"fx": "(x - 1)^2 * (x - 2)", "a": 0, "b": 3},
+        {"fx": "(x - 0.5003) * (x - 0.5006)", "a": 0, "b": 1},
+        {"fx": "x + tan(x)", "a": -1, "b": 10},
+        {"fx": "sin(1/x)", "a": 0.05, "b": 1},
+    ]
+
+    EPSILON = 1e-10
+    print("FINDING ALL ROOTS IN AN INTERVAL\n")
+    for idx, test in enumerate(test_cases):
+        fx = compile_expression(test["fx"])
+        a, b = test["a"], test["b"]
+
+        print_header(idx, **{"f(x)": fx, "a": a, "b": b})
+
+        roots = find_roots(fx, a, b, epsilon=EPSILON)
+        print(f"- found {len(roots)} roots: {np.round(roots, 8).tolist()}\n")
+
+    # the same roots by bisection on every blind sub-interval, one call each
+    fx = compile_expression("sin(x)")
+    grid = np.linspace(0, 50, 1001)
+
+    started = time.perf_counter()
+    blind = []
+    for lo, hi in zip(grid[:-1], grid[1:]):
+        try:
+            blind.append(bisection(fx, lo, hi, EPSILON))
+        except Exception:
+            pass
+    blind_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scanned = find_roots(fx, 0, 50, epsilon=EPSILON)
+    scan_time = time.perf_counter() - started
+
+    print(f"blind bisection loop: {len(set(blind))} roots in {blind_time * 1e3:.1f} ms")
+    print(f"find_roots:           {len(scanned)} roots in {scan_time * 1e3:.1f} ms")
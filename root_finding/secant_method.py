@@ -1,6 +1,8 @@
-import math
+from utils import as_function, compile_expression
+from utils.instrumentation import count, counted, instrumented
 
 
+@instrumented("root_finding.secant_method")
 def secant_method(x_n, x_nm1, fx, epsilon, max_iter=100, iter=0):
     """
     The Secant method is a root finding algorithm
@@ -10,7 +12,7 @@ def secant_method(x_n, x_nm1, fx, epsilon, max_iter=100, iter=0):
     parameters:
     - x_n: initial value of x
     - x_nm1: value of x preceding x_n
-    - fx: function of x
+    - fx: function of x or a formula string
 
     formula:
     - x_np1 = x_n - f(x_n)/denominator
@@ -19,6 +21,8 @@ def secant_method(x_n, x_nm1, fx, epsilon, max_iter=100, iter=0):
     if iter >= max_iter:
         return x_n
 
+    fx = counted(as_function(fx))
+    count("iterations")
     f_xn = fx(x_n)
     f_xnm1 = fx(x_nm1)
 
@@ -43,8 +47,8 @@ if __name__ == "__main__":
     EPSILON = 1e-6
 
     test_cases = [
-        {"fx": lambda x: 1 - (2 * x * math.pow(math.e, -x / 2)), "x_n": 2, "x_nm1": 1},
-        {"fx": lambda x: 5 - math.pow(x, -1), "x_n": 2, "x_nm1": 1},
+        {"fx": compile_expression("1 - 2*x*e^(-x/2)"), "x_n": 2, "x_nm1": 1},
+        {"fx": compile_expression("5 - x^-1"), "x_n": 2, "x_nm1": 1},
     ]
 
     for idx, test in enumerate(test_cases):
@@ -0,0 +1,22 @@
+"""
+Asyncio front-end batching concurrent numerical requests, submodules
+are only imported on first use
+"""
+
+from utils.lazy import lazy_package
+
+SUBMODULES = [
+    "batcher",
+    "methods",
+    "server",
+]
+
+EXPORTS = {
+    "MicroBatcher": "batcher",
+    "HANDLERS": "methods",
+    "Service": "server",
+    "serve": "server",
+}
+
+__getattr__, __dir__ = lazy_package(__name__, SUBMODULES, EXPORTS)
+__all__ = SUBMODULES + list(EXPORTS)
@@ -0,0 +1,40 @@
+"""
+Serves root finding, integration and interpolation over local HTTP
+
+    python -m service --port 8225 --max-batch-size 64 --max-wait-ms 2
+
+    curl -d '{"f": "x^3 - 2*x - 5", "a": 2, "b": 3}' localhost:8225/root
+    curl -d '{"f": "e^x", "a": 0, "b": 2, "n": 10}' localhost:8225/integrate
+    curl -d '{"x": [0, 1, 2], "y": [0, 1, 4], "X": 1.5}' localhost:8225/interpolate
+    curl localhost:8225/metrics
+"""
+
+import argparse
+import asyncio
+import os
+
+# a service never opens a plot window
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from service.server import serve  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8225)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.max_batch_size, args.max_wait_ms / 1000)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into batches for one handler
+
+    Requests wait until max_batch_size of them are queued or the oldest
+    has waited max_wait seconds, whichever comes first, then the whole
+    batch goes to handler(payloads) in a single call. The handler
+    returns one result per payload, an Exception instance fails only
+    that request. Under light load a request waits at most max_wait,
+    under heavy load batches fill up and the per-request overhead is
+    shared by the whole batch.
+
+    The handler runs in an executor thread, so a long batch does not
+    stall the event loop, which keeps accepting and queueing requests
+    meanwhile.
+
+    Parameters:
+    - handler: function from a list of payloads to a list of results
+    - max_batch_size: largest batch handed to the handler
+    - max_wait: seconds the first request of a batch may wait
+    - history: number of recent latencies kept for the percentiles
+    - executor: concurrent.futures executor running the handler, None
+      for the event loop's default thread pool
+    """
+
+    def __init__(
+        self, handler, max_batch_size=64, max_wait=0.002, history=10000, executor=None
+    ):
+        if max_batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        if max_wait < 0:
+            raise ValueError("Wait time cannot be negative")
+
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self._queue = []
+        self._running = set()
+        self._timer = None
+        self._latencies = deque(maxlen=history)
+        self._requests = 0
+        self._processed = 0
+        self._batches = 0
+        self._errors = 0
+        self._max_depth = 0
+
+    async def submit(self, payload):
+        """
+        Queues one request and waits for its result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((payload, future, time.perf_counter()))
+        self._requests += 1
+        self._max_depth = max(self._max_depth, len(self._queue))
+
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue:
+            batch = self._queue[: self.max_batch_size]
+            del self._queue[: self.max_batch_size]
+            # the loop only keeps weak references to its tasks
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        payloads = [payload for payload, _, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.handler, payloads)
+        except Exception as error:
+            results = [error] * len(batch)
+
+        self._batches += 1
+        self._processed += len(batch)
+        finished = time.perf_counter()
+        for (_, future, queued), result in zip(batch, results):
+            self._latencies.append(finished - queued)
+            if future.cancelled():
+                continue
+            if isinstance(result, Exception):
+                self._errors += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def metrics(self):
+        """
+        Queue depth, batch counts and latency percentiles (seconds, from
+        queueing to the result being ready)
+        """
+        latencies = np.array(self._latencies)
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0, 0)
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self._max_depth,
+            "requests": self._requests,
+            "batches": self._batches,
+            "errors": self._errors,
+            "mean_batch_size": self._processed / self._batches if self._batches else 0,
+            "latency_p50": float(p50),
+            "latency_p99": float(p99),
+        }
@@ -0,0 +1,134 @@
+"""
+Batch handlers behind the service, one per method
+
+Each handler takes the payloads of one micro-batch and returns one
+result (or Exception) per payload. Payloads asking about the same
+function are grouped and answered by a single call of the vectorized
+method, so a batch of 64 root requests on one formula costs about as
+much as one.
+"""
+
+import numpy as np
+
+from integration.gaussian_quadrature import gauss_legendre
+from interpolation.cubic_splines import cerp
+from root_finding.bisection import bisection_vectorized
+
+# largest Gauss-Legendre rule a request may ask for, every new n costs an
+# O(n^2) rule computation and a slot in the rule cache
+MAX_NODES = 200
+
+
+def _require(payload, *names):
+    missing = [name for name in names if name not in payload]
+    if missing:
+        raise ValueError(f"Missing parameters: {', '.join(missing)}")
+
+
+def _grouped(payloads, key, run):
+    """
+    Calls run(group) once per group of payloads sharing key(payload)
+
+    When a group call fails, its payloads are retried one by one so
+    only the offending requests get the error.
+    """
+    results = [None] * len(payloads)
+    groups = {}
+    for index, payload in enumerate(payloads):
+        try:
+            groups.setdefault(key(payload), []).append(index)
+        except Exception as error:
+            results[index] = error
+
+    for indices in groups.values():
+        try:
+            answers = run([payloads[i] for i in indices])
+        except Exception:
+            answers = []
+            for i in indices:
+                try:
+                    answers += run([payloads[i]])
+                except Exception as error:
+                    answers.append(error)
+
+        for i, answer in zip(indices, answers):
+            results[i] = answer
+
+    return results
+
+
+def _root_key(payload):
+    _require(payload, "f", "a", "b")
+    return payload["f"], payload.get("epsilon", 1e-10)
+
+
+def _roots(group):
+    f, epsilon = _root_key(group[0])
+    a = [payload["a"] for payload in group]
+    b = [payload["b"] for payload in group]
+    roots = bisection_vectorized(f, a, b, epsilon)
+    return [
+        Exception("Interval does not cross 0") if np.isnan(root) else float(root)
+        for root in roots
+    ]
+
+
+def root(payloads):
+    """
+    {"f": formula, "a": ..., "b": ..., "epsilon": 1e-10} -> root
+    """
+    return _grouped(payloads, _root_key, _roots)
+
+
+def _integral_key(payload):
+    _require(payload, "f", "a", "b")
+    n = int(payload.get("n", 10))
+    if not 1 <= n <= MAX_NODES:
+        raise ValueError(f"Number of nodes must be between 1 and {MAX_NODES}")
+    return payload["f"], n
+
+
+def _integrals(group):
+    f, n = _integral_key(group[0])
+    a = np.array([payload["a"] for payload in group], dtype=float)
+    b = np.array([payload["b"] for payload in group], dtype=float)
+    return np.atleast_1d(gauss_legendre(f, a, b, n)).tolist()
+
+
+def integrate(payloads):
+    """
+    {"f": formula, "a": ..., "b": ..., "n": 10} -> Gauss-Legendre integral,
+    n at most MAX_NODES
+    """
+    return _grouped(payloads, _integral_key, _integrals)
+
+
+def _spline_key(payload):
+    _require(payload, "x", "y", "X")
+    return tuple(payload["x"]), tuple(payload["y"])
+
+
+def _splines(group):
+    x, y = _spline_key(group[0])
+    queries = [np.atleast_1d(np.asarray(payload["X"], dtype=float)) for payload in group]
+    # one spline fit shared by every request, the queries are split back
+    values = cerp(list(x), list(y), np.concatenate(queries))
+    parts = np.split(values, np.cumsum([len(q) for q in queries])[:-1])
+    return [
+        part.tolist() if np.ndim(payload["X"]) else float(part[0])
+        for payload, part in zip(group, parts)
+    ]
+
+
+def interpolate(payloads):
+    """
+    {"x": knots, "y": values, "X": query or list of queries} -> cubic spline
+    """
+    return _grouped(payloads, _spline_key, _splines)
+
+
+HANDLERS = {
+    "root": root,
+    "integrate": integrate,
+    "interpolate": interpolate,
+}
@@ -0,0 +1,175 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from service.batcher import MicroBatcher
+from service.methods import HANDLERS
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 422: "Unprocessable Entity"}
+
+
+class Service:
+    """
+    One MicroBatcher per method, callable from the same event loop
+
+        service = Service(max_batch_size=64, max_wait=0.002)
+        x = await service.call("root", {"f": "x^2 - 2", "a": 0, "b": 2})
+
+    Every batcher hands its batches to the same single worker thread,
+    batches then run one at a time as they did on the loop (the
+    instrumentation session is not thread-safe) while the loop stays
+    free to accept requests.
+    """
+
+    def __init__(self, max_batch_size=64, max_wait=0.002, handlers=None):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batchers = {
+            method: MicroBatcher(
+                handler, max_batch_size, max_wait, executor=self.executor
+            )
+            for method, handler in (handlers or HANDLERS).items()
+        }
+
+    async def call(self, method, payload):
+        if method not in self.batchers:
+            raise KeyError(method)
+        return await self.batchers[method].submit(payload)
+
+    def metrics(self):
+        return {method: b.metrics() for method, b in self.batchers.items()}
+
+
+async def _read_request(reader):
+    """
+    Reads one HTTP/1.1 request, returns (verb, path, headers, body) or
+    None once the client has closed the connection
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    verb, path, _ = line.decode("latin-1").split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return verb, path, headers, body
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def _answer(service, verb, path, body):
+    method = path.strip("/")
+    if verb == "GET" and method == "metrics":
+        return 200, service.metrics()
+    if verb != "POST" or method not in service.batchers:
+        return 404, {"error": f"No method {verb} {path}"}
+
+    try:
+        payload = json.loads(body or b"{}")
+    except json.JSONDecodeError as error:
+        return 400, {"error": f"Invalid JSON: {error}"}
+
+    try:
+        return 200, {"result": await service.call(method, payload)}
+    except Exception as error:
+        return 422, {"error": f"{type(error).__name__}: {error}"}
+
+
+def http_handler(service):
+    """
+    Connection callback for asyncio.start_server, a minimal HTTP/1.1
+    stand-in: POST /<method> with a JSON payload, GET /metrics. Every
+    connection is served concurrently and kept alive, so requests from
+    many connections meet in the same micro-batches.
+    """
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+
+                verb, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await _answer(service, verb, path, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host="127.0.0.1", port=8225, max_batch_size=64, max_wait=0.002):
+    service = Service(max_batch_size, max_wait)
+    server = await asyncio.start_server(http_handler(service), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def evaluate():
+    import random
+    import time
+
+    async def load(service, requests):
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(service.call(method, payload) for method, payload in requests),
+            return_exceptions=True,
+        )
+        return results, time.perf_counter() - started
+
+    rng = random.Random(225)
+    requests = []
+    for _ in range(2000):
+        c = rng.uniform(1, 10)
+        requests.append(("root", {"f": "x^3 - 2*x - 5", "a": 2.0, "b": 3.0 + c}))
+        requests.append(("integrate", {"f": "e^x", "a": 0.0, "b": c}))
+    requests.append(("root", {"f": "x^2 + 1", "a": 0, "b": 1}))
+
+    header = "MICRO-BATCHING SERVICE"
+    print(header)
+    print("-" * len(header))
+    for max_batch_size in [1, 16, 256]:
+        service = Service(max_batch_size=max_batch_size, max_wait=0.002)
+        results, elapsed = asyncio.run(load(service, requests))
+        failed = sum(isinstance(result, Exception) for result in results)
+        print(
+            f"max batch {max_batch_size:<4} {len(requests) / elapsed:>10.0f} requests/s,"
+            f" {failed} failed"
+        )
+        for method, metrics in service.metrics().items():
+            if metrics["requests"]:
+                print(
+                    f"  {method:<10} batches {metrics['batches']:<5}"
+                    f" mean size {metrics['mean_batch_size']:<7.1f}"
+                    f" max queue {metrics['max_queue_depth']:<5}"
+                    f" p99 {metrics['latency_p99'] * 1e3:.2f} ms"
+                )
+
+    print("root of x^3 - 2x - 5:", results[0])
+
+
+if __name__ == "__main__":
+    evaluate()
@@ -1,6 +1,8 @@
 import inspect
 import re
 
+from utils.expression import Expression, as_function, compile_expression
+
 
 def print_header(idx, **vals):
     print("-" * 55)
@@ -14,8 +16,12 @@ def print_header(idx, **vals):
             print(f"- {key}: {val}")
 
 
-# can be messy
 def source(fx):
+    # compiled formulas carry their own text
+    if isinstance(fx, Expression):
+        return fx.text
+
+    # can be messy
     text = inspect.getsource(fx).strip()
     match = re.search(r"lambda\s+[^:]+:\s+.*?(?=[,\}])", text)
     if match:
@@ -24,4 +30,10 @@ def source(fx):
     return "NONE"
 
 
-__all__ = ["print_header", "source"]
+__all__ = [
+    "print_header",
+    "source",
+    "Expression",
+    "compile_expression",
+    "as_function",
+]
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.instrumentation import count
+
+try:
+    import fcntl
+except ImportError:  # Windows, eviction then runs without the file lock
+    fcntl = None
+
+# the cache is on when this variable names a directory (or after configure)
+ENV_DIRECTORY = "CM_CACHE_DIR"
+ENV_MAX_BYTES = "CM_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def digest(*parts):
+    """
+    Content hash of the inputs of a computation, arrays are hashed by
+    dtype, shape and bytes so equal arrays give equal keys
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        if isinstance(part, np.ndarray) or isinstance(part, (list, tuple)):
+            array = np.ascontiguousarray(part)
+            h.update(f"{array.dtype.str}{array.shape}".encode())
+            h.update(array.tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+class ArrayCache:
+    """
+    On-disk cache of array bundles, shared by every process pointing at
+    the same directory
+
+    A bundle is a directory of .npy files, one per named array, stored
+    under namespace/key. Loads are memory-mapped copy-on-write, so a
+    hit costs a few file opens and no copying, and callers may still
+    modify what they get back.
+
+    Concurrency:
+    - bundles are written to a private temporary directory and renamed
+      into place, readers see a whole bundle or none
+    - eviction holds an exclusive lock on the cache directory, evicted
+      bundles are renamed away before deletion and arrays already
+      mapped by another process stay valid
+
+    Eviction removes the least recently used bundles (a hit refreshes
+    the bundle's modification time) once the total size exceeds
+    max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, namespace, key):
+        return os.path.join(self.directory, namespace, key)
+
+    def get(self, namespace, key):
+        """
+        The bundle as {name: array}, None on a miss
+        """
+        path = self._path(namespace, key)
+        try:
+            names = [name for name in os.listdir(path) if name.endswith(".npy")]
+            arrays = {
+                name[:-4]: np.load(os.path.join(path, name), mmap_mode="c")
+                for name in names
+            }
+            os.utime(path)
+        except (FileNotFoundError, NotADirectoryError):
+            # absent, or evicted while we were loading it
+            return None
+        return arrays
+
+    def put(self, namespace, key, arrays):
+        path = self._path(namespace, key)
+        size = sum(np.asarray(array).nbytes for array in arrays.values())
+        if size > self.max_bytes or os.path.isdir(path):
+            return
+
+        staging = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), np.asarray(array))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.rename(staging, path)
+        except OSError:
+            # another process stored the same bundle first
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def fetch(self, namespace, key, compute):
+        """
+        The cached bundle, or compute() stored and returned on a miss
+        """
+        arrays = self.get(namespace, key)
+        if arrays is not None:
+            self.hits += 1
+            count("cache_hits")
+            return arrays
+
+        self.misses += 1
+        count("cache_misses")
+        arrays = compute()
+        self.put(namespace, key, arrays)
+        return arrays
+
+    def _bundles(self):
+        for namespace in os.listdir(self.directory):
+            root = os.path.join(self.directory, namespace)
+            if namespace.startswith(".") or not os.path.isdir(root):
+                continue
+            for key in os.listdir(root):
+                path = os.path.join(root, key)
+                try:
+                    files = [os.path.join(path, name) for name in os.listdir(path)]
+                    size = sum(os.path.getsize(file) for file in files)
+                    yield os.path.getmtime(path), size, path
+                except FileNotFoundError:
+                    continue
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _remove(self, path):
+        trash = os.path.join(self.directory, f".trash-{uuid.uuid4().hex}")
+        try:
+            os.rename(path, trash)
+        except FileNotFoundError:
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def evict(self):
+        """
+        Removes least recently used bundles until the cache fits in
+        max_bytes, returns the number removed
+        """
+        with self._locked():
+            bundles = sorted(self._bundles())
+            total = sum(size for _, size, _ in bundles)
+            removed = 0
+            for _, size, path in bundles:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self):
+        with self._locked():
+            for _, _, path in list(self._bundles()):
+                self._remove(path)
+
+    def stats(self):
+        bundles = list(self._bundles())
+        return {
+            "directory": self.directory,
+            "bundles": len(bundles),
+            "bytes": sum(size for _, size, _ in bundles),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache = None
+if os.environ.get(ENV_DIRECTORY):
+    _cache = ArrayCache(
+        os.environ[ENV_DIRECTORY],
+        int(os.environ.get(ENV_MAX_BYTES, DEFAULT_MAX_BYTES)),
+    )
+
+
+def configure(directory, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Turns the cache on for this process (directory=None turns it off)
+    and returns it, the CM_CACHE_DIR environment variable does the same
+    for every process started with it
+    """
+    global _cache
+    _cache = None if directory is None else ArrayCache(directory, max_bytes)
+    return _cache
+
+
+def get_cache():
+    return _cache
+
+
+def cached(namespace, parts, compute):
+    """
+    compute() memoized on disk under the hash of parts, which must hold
+    every input compute depends on. compute returns {name: array}.
+    Without a configured cache this is just compute().
+    """
+    if _cache is None:
+        return compute()
+    return _cache.fetch(namespace, digest(*parts), compute)
+
+
+__all__ = ["ArrayCache", "configure", "get_cache", "cached", "digest"]
@@ -0,0 +1,258 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# name -> NumPy function emitted for it, all of them are ufuncs so they
+# work elementwise on arrays (and on anything implementing __array_ufunc__)
+FUNCTIONS = {
+    "sin": "np.sin",
+    "cos": "np.cos",
+    "tan": "np.tan",
+    "asin": "np.arcsin",
+    "acos": "np.arccos",
+    "atan": "np.arctan",
+    "sinh": "np.sinh",
+    "cosh": "np.cosh",
+    "tanh": "np.tanh",
+    "exp": "np.exp",
+    "log": "np.log",
+    "ln": "np.log",
+    "log10": "np.log10",
+    "sqrt": "np.sqrt",
+    "abs": "np.abs",
+}
+
+# functions without a ufunc of their own, written in terms of the above
+COMPOSITES = {
+    "sec": "1.0 / np.cos({})",
+    "csc": "1.0 / np.sin({})",
+    "cot": "1.0 / np.tan({})",
+}
+
+CONSTANTS = {"e": repr(np.e), "pi": repr(np.pi)}
+
+TOKEN = re.compile(
+    r"\s*(?:(?P<number>\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<operator>\*\*|[-+*/^(),]))"
+)
+
+
+def tokenize(text):
+    """
+    Splits a formula into (kind, value, position) tokens
+    """
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None:
+            position = len(text) - len(text[position:].lstrip())
+            raise ValueError(f"Unexpected character {text[position]!r} at {position}")
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        # ** is accepted as a synonym of ^
+        tokens.append((kind, "^" if value == "**" else value, match.start(kind)))
+        position = match.end()
+
+    tokens.append(("end", "", len(text)))
+    return tokens
+
+
+class Parser:
+    """
+    Recursive descent parser producing a nested tuple AST:
+    ("number", value), ("name", name), ("neg", a), ("call", name, a)
+    and (op, a, b) for the binary operators + - * / ^
+
+    Grammar (lowest to highest precedence):
+    - sum     := product (("+" | "-") product)*
+    - product := unary (("*" | "/") unary)*
+    - unary   := ("-" | "+") unary | power
+    - power   := atom ("^" unary)?       right associative, -x^2 = -(x^2)
+    - atom    := number | name | name "(" sum ")" | "(" sum ")"
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index]
+
+    def take(self, value=None):
+        kind, token, position = self.tokens[self.index]
+        if value is not None and token != value:
+            found = token or "end of formula"
+            raise ValueError(f"Expected {value!r} at {position}, found {found!r}")
+        self.index += 1
+        return kind, token, position
+
+    def parse(self):
+        tree = self.sum()
+        kind, token, position = self.peek()
+        if kind != "end":
+            raise ValueError(f"Unexpected {token!r} at {position}")
+        return tree
+
+    def sum(self):
+        tree = self.product()
+        while self.peek()[1] in ("+", "-"):
+            _, op, _ = self.take()
+            tree = (op, tree, self.product())
+        return tree
+
+    def product(self):
+        tree = self.unary()
+        while self.peek()[1] in ("*", "/"):
+            _, op, _ = self.take()
+            tree = (op, tree, self.unary())
+        return tree
+
+    def unary(self):
+        if self.peek()[1] == "-":
+            self.take()
+            return ("neg", self.unary())
+        if self.peek()[1] == "+":
+            self.take()
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        tree = self.atom()
+        if self.peek()[1] == "^":
+            self.take()
+            tree = ("^", tree, self.unary())
+        return tree
+
+    def atom(self):
+        kind, token, position = self.take()
+        if kind == "number":
+            return ("number", float(token))
+
+        if kind == "name":
+            if self.peek()[1] == "(":
+                if token not in FUNCTIONS and token not in COMPOSITES:
+                    raise ValueError(f"Unknown function {token!r} at {position}")
+                self.take("(")
+                argument = self.sum()
+                self.take(")")
+                return ("call", token, argument)
+            return ("name", token)
+
+        if token == "(":
+            tree = self.sum()
+            self.take(")")
+            return tree
+
+        raise ValueError(f"Unexpected {token or 'end of formula'!r} at {position}")
+
+
+def emit(tree, variables):
+    """
+    Python source for an AST, fully parenthesized so precedence never
+    depends on the target language
+    """
+    kind = tree[0]
+    if kind == "number":
+        return repr(tree[1])
+
+    if kind == "name":
+        name = tree[1]
+        if name in variables:
+            return name
+        if name in CONSTANTS:
+            return CONSTANTS[name]
+        raise ValueError(f"Unknown variable {name!r}, expected one of {variables}")
+
+    if kind == "neg":
+        return f"(-{emit(tree[1], variables)})"
+
+    if kind == "call":
+        argument = emit(tree[2], variables)
+        if tree[1] in COMPOSITES:
+            return f"({COMPOSITES[tree[1]].format(argument)})"
+        return f"{FUNCTIONS[tree[1]]}({argument})"
+
+    left, right = tree[1], tree[2]
+    if kind == "^":
+        # e^u is the exponential, a single ufunc call instead of a power
+        if left == ("name", "e") and "e" not in variables:
+            return f"np.exp({emit(right, variables)})"
+        if right == ("number", 0.5):
+            return f"np.sqrt({emit(left, variables)})"
+        # real powers: Python's ** turns (-8.0) ** (1/3) into a complex
+        # number, np.power gives NaN like the array case does
+        return f"np.power({emit(left, variables)}, {emit(right, variables)})"
+
+    return f"({emit(left, variables)} {kind} {emit(right, variables)})"
+
+
+class Expression:
+    """
+    A formula compiled once into a vectorized NumPy function
+
+    Calling it evaluates the formula elementwise, so a whole array of
+    points costs a single call. The original text is kept for printing.
+    """
+
+    def __init__(self, text, variables, tree, source, function):
+        self.text = text
+        self.variables = variables
+        self.tree = tree
+        self.source = source
+        self._function = function
+
+    def __call__(self, *args):
+        result = self._function(*args)
+        # constant formulas still produce one value per point
+        if np.ndim(result) == 0 and any(np.ndim(arg) for arg in args):
+            shape = np.broadcast_shapes(*(np.shape(arg) for arg in args))
+            result = np.full(shape, result)
+        return result
+
+    def __repr__(self):
+        return f"Expression({self.text!r}, variables={self.variables})"
+
+    def __str__(self):
+        return self.text
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text, variables=("x",)):
+    """
+    Parses a formula such as "x^3 - 2*x - 5" and compiles it into an
+    Expression taking the given variables, in order, as arguments
+
+    - operators: + - * / and ^ (or **) for powers, real valued, so a
+      negative base with a non-integer exponent gives NaN
+    - functions: sin, cos, tan, sec, csc, cot, asin, acos, atan, sinh,
+      cosh, tanh, exp, log (ln), log10, sqrt, abs
+    - constants: e, pi
+
+    The result is cached, so compiling the same formula again is free.
+    """
+    variables = tuple(variables)
+    for name in variables:
+        if not name.isidentifier() or name in FUNCTIONS or name in COMPOSITES:
+            raise ValueError(f"Invalid variable name {name!r}")
+
+    tree = Parser(text).parse()
+    source = f"lambda {', '.join(variables)}: {emit(tree, variables)}"
+    function = eval(compile(source, f"<expression {text!r}>", "eval"), {"np": np})
+    return Expression(text.strip(), variables, tree, source, function)
+
+
+def as_function(f, variables=("x",)):
+    """
+    Accepts either a callable or a formula string, strings are compiled
+    """
+    if isinstance(f, str):
+        return compile_expression(f, tuple(variables))
+    return f
+
+
+__all__ = ["Expression", "compile_expression", "as_function", "tokenize"]
@@ -0,0 +1,224 @@
+import functools
+import json
+import time
+import tracemalloc
+
+# the active Session, None when instrumentation is off
+_session = None
+
+
+class Session:
+    """
+    Collects one record per instrumented call while active
+
+    Each record is a plain dict, ready for json.dumps:
+    - method: qualified method name, e.g. "root_finding.bisection"
+    - start: seconds since the session began
+    - wall_time: seconds spent in the call, nested calls included
+    - counters: {"evaluations": ..., "iterations": ..., "pivots": ...}
+    - peak_bytes: peak allocation during the call (memory=True only)
+    - depth: nesting level, 0 for calls made directly by the user
+    - error: exception type name if the call raised
+
+    Hooks are called as on_start(record), on_end(record) and
+    on_count(record, name, amount).
+    """
+
+    def __init__(self, memory=False, on_start=None, on_end=None, on_count=None):
+        self.memory = memory
+        self.on_start = on_start
+        self.on_end = on_end
+        self.on_count = on_count
+        self.records = []
+        self._stack = []
+        self._origin = None
+        self._previous = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        global _session
+        self._previous = _session
+        self._origin = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        _session = self
+        return self
+
+    def __exit__(self, *exc):
+        global _session
+        _session = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def _open(self, method):
+        record = {
+            "method": method,
+            "start": time.perf_counter() - self._origin,
+            "wall_time": None,
+            "counters": {},
+            "depth": len(self._stack),
+        }
+
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # the parent's peak so far is settled before the peak is reset
+            if self._stack:
+                parent = self._stack[-1]
+                parent_peak = peak - parent["_base"]
+                parent["peak_bytes"] = max(parent["peak_bytes"], parent_peak)
+            tracemalloc.reset_peak()
+            record["peak_bytes"] = 0
+            record["_base"] = current
+
+        self._stack.append(record)
+        self.records.append(record)
+        if self.on_start:
+            self.on_start(record)
+        return record
+
+    def _close(self, record, started, error=None):
+        record["wall_time"] = time.perf_counter() - started
+        if error is not None:
+            record["error"] = type(error).__name__
+
+        self._stack.pop()
+        if self.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            record["peak_bytes"] = max(record["peak_bytes"], peak - record["_base"])
+            base = record.pop("_base")
+            if self._stack:
+                parent = self._stack[-1]
+                child_peak = record["peak_bytes"] + base - parent["_base"]
+                parent["peak_bytes"] = max(parent["peak_bytes"], child_peak)
+            tracemalloc.reset_peak()
+
+        if self.on_end:
+            self.on_end(record)
+
+    def count(self, name, amount=1):
+        if not self._stack:
+            return
+        record = self._stack[-1]
+        counters = record["counters"]
+        counters[name] = counters.get(name, 0) + amount
+        if self.on_count:
+            self.on_count(record, name, amount)
+
+    def summary(self):
+        """
+        Records aggregated per method: calls, total wall time, summed
+        counters and the largest peak allocation
+        """
+        methods = {}
+        for record in self.records:
+            method = record["method"]
+            entry = methods.setdefault(
+                method, {"method": method, "calls": 0, "wall_time": 0.0, "counters": {}}
+            )
+            entry["calls"] += 1
+            entry["wall_time"] += record["wall_time"] or 0.0
+            for name, amount in record["counters"].items():
+                entry["counters"][name] = entry["counters"].get(name, 0) + amount
+            if "peak_bytes" in record:
+                peak = max(entry.get("peak_bytes", 0), record["peak_bytes"])
+                entry["peak_bytes"] = peak
+
+        return list(methods.values())
+
+    def to_jsonl(self, path):
+        """
+        Writes one JSON record per line, the usual format for metrics
+        pipelines
+        """
+        with open(path, "w") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+
+def instrument(memory=False, on_start=None, on_end=None, on_count=None):
+    """
+    Context manager turning instrumentation on for its body
+
+        with instrument() as session:
+            bisection("x^3 - 2*x - 5", 2, 3, 1e-6)
+        session.records, session.summary()
+
+    Parameters:
+    - memory: also track peak allocation with tracemalloc (slower)
+    - on_start, on_end, on_count: optional callback hooks
+    """
+    return Session(memory, on_start, on_end, on_count)
+
+
+def instrumented(method):
+    """
+    Decorator making a function report to the active session
+
+    With no session active the wrapper is a single global check before
+    calling straight through. Recursive calls of the same method are
+    folded into the outermost record.
+    """
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            session = _session
+            if session is None:
+                return function(*args, **kwargs)
+
+            stack = session._stack
+            if stack and stack[-1]["method"] == method:
+                return function(*args, **kwargs)
+
+            record = session._open(method)
+            started = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as error:
+                session._close(record, started, error)
+                raise
+            session._close(record, started)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def count(name, amount=1):
+    """
+    Adds to a counter of the innermost instrumented call, no-op when
+    instrumentation is off
+    """
+    if _session is not None:
+        _session.count(name, amount)
+
+
+def counted(f, name="evaluations"):
+    """
+    Wraps a user function so every call adds to the given counter
+
+    Returns f itself when instrumentation is off, so evaluation counting
+    costs nothing then. Already counted functions aren't wrapped twice,
+    which keeps recursive methods from counting each call repeatedly.
+    """
+    if _session is None or f is None or getattr(f, "_counted", None) == name:
+        return f
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        count(name)
+        return f(*args, **kwargs)
+
+    wrapper._counted = name
+    return wrapper
+
+
+def enabled():
+    return _session is not None
+
+
+__all__ = ["Session", "instrument", "instrumented", "count", "counted", "enabled"]
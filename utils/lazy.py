@@ -0,0 +1,58 @@
+import importlib
+import sys
+import types
+
+
+def lazy_package(name, submodules, exports=None):
+    """
+    PEP 562 module __getattr__ / __dir__ for a package whose submodules
+    are only imported when first accessed
+
+    - submodules: names accessible as package.submodule
+    - exports: {function name: submodule} re-exported at package level,
+      an export wins over a submodule of the same name
+
+    Resolved attributes are stored on the package, so the lookup cost is
+    paid once. Usage in a package __init__.py:
+
+        __getattr__, __dir__ = lazy_package(__name__, [...], {...})
+
+    A function named after its own submodule (root_finding.bisection) is
+    listed in exports only. Importing that submodule anywhere makes the
+    import system bind it on the package, which would hide the function,
+    so the package keeps the function in its place. The submodule stays
+    reachable as sys.modules entry, e.g. from root_finding.bisection
+    import bisection_vectorized.
+    """
+    exports = dict(exports or {})
+    shadowed = {attr for attr, module in exports.items() if attr == module}
+
+    if shadowed:
+
+        class LazyPackage(types.ModuleType):
+            def __setattr__(self, attr, value):
+                if attr in shadowed and isinstance(value, types.ModuleType):
+                    value = getattr(value, attr)
+                super().__setattr__(attr, value)
+
+        sys.modules[name].__class__ = LazyPackage
+
+    def __getattr__(attr):
+        if attr in exports:
+            module = importlib.import_module(f"{name}.{exports[attr]}")
+            value = getattr(module, attr)
+            setattr(sys.modules[name], attr, value)
+            return value
+
+        if attr in submodules:
+            return importlib.import_module(f"{name}.{attr}")
+
+        raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+
+    def __dir__():
+        return sorted(set(submodules) | set(exports))
+
+    return __getattr__, __dir__
+
+
+__all__ = ["lazy_package"]
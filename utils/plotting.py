@@ -0,0 +1,44 @@
+import os
+import sys
+
+
+def _headless():
+    if os.environ.get("MPLBACKEND"):
+        return False
+    if sys.platform.startswith("linux"):
+        return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return False
+
+
+def pyplot():
+    """
+    matplotlib.pyplot, imported on first use only
+
+    Compute modules never import matplotlib themselves, so they load
+    with NumPy alone. Without a display (and without MPLBACKEND) the
+    non-interactive Agg backend is selected before pyplot is imported,
+    so no GUI toolkit is ever loaded on servers.
+    """
+    if "matplotlib.pyplot" not in sys.modules and _headless():
+        import matplotlib
+
+        matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def show():
+    """
+    plt.show() on interactive backends, headless figures are closed
+    instead of warning that they can't be shown
+    """
+    plt = pyplot()
+    if plt.get_backend().lower() == "agg":
+        plt.close("all")
+    else:
+        plt.show()
+
+
+__all__ = ["pyplot", "show"]